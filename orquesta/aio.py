@@ -0,0 +1,113 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import logging
+
+from orquesta import conducting
+
+
+LOG = logging.getLogger(__name__)
+
+
+class AsyncWorkflowConductor(object):
+    # Drive a workflow conductor from an asyncio event loop. The calls to the conductor are run
+    # in the executor so rendering and evaluating expressions do not block the event loop. The
+    # conductor is not thread safe so the calls for the same workflow are run one at a time in
+    # the order they are made. The calls for different workflows run concurrently. The methods
+    # return asyncio futures that can be awaited. The calls are queued when the methods are
+    # called so the caller does not have to wait for a call to complete before making the next.
+
+    def __init__(self, conductor, executor=None, render_executor=None, loop=None):
+        if not isinstance(conductor, conducting.WorkflowConductor):
+            raise ValueError('The value of "conductor" is not type of WorkflowConductor.')
+
+        self.conductor = conductor
+        self.executor = executor
+        self.render_executor = render_executor
+        self._loop = loop
+        self._pending = None
+
+    def _get_loop(self):
+        return self._loop or asyncio.get_event_loop()
+
+    def _submit(self, func, *args, **kwargs):
+        loop = self._get_loop()
+        future = loop.create_future()
+        step = loop.create_future()
+        previous = self._pending
+        self._pending = step
+
+        def _complete(call):
+            # The step is completed even if the caller cancelled the future so the next call
+            # is not run until the conductor is done with this call.
+            step.set_result(None)
+
+            if future.cancelled():
+                return
+
+            if call.cancelled():
+                future.cancel()
+            elif call.exception() is not None:
+                future.set_exception(call.exception())
+            else:
+                future.set_result(call.result())
+
+        def _run(previous_step=None):
+            if future.cancelled():
+                step.set_result(None)
+                return
+
+            # If the call cannot be submitted such as when the executor is shut down, then the
+            # error is set on the future and the step is completed so the next call is run.
+            try:
+                call = loop.run_in_executor(
+                    self.executor,
+                    functools.partial(func, *args, **kwargs)
+                )
+            except Exception as e:
+                step.set_result(None)
+                future.set_exception(e)
+                return
+
+            call.add_done_callback(_complete)
+
+        if previous is None or previous.done():
+            _run()
+        else:
+            previous.add_done_callback(_run)
+
+        return future
+
+    def request_workflow_status(self, status):
+        return self._submit(self.conductor.request_workflow_status, status)
+
+    def get_workflow_status(self):
+        return self._submit(self.conductor.get_workflow_status)
+
+    def get_workflow_output(self):
+        return self._submit(self.conductor.get_workflow_output)
+
+    def get_next_tasks(self):
+        return self._submit(self.conductor.get_next_tasks, executor=self.render_executor)
+
+    def update_task_state(self, task_id, route, event):
+        return self._submit(self.conductor.update_task_state, task_id, route, event)
+
+    def update_task_states(self, task_events):
+        return self._submit(self.conductor.update_task_states, task_events)
+
+    def serialize(self):
+        return self._submit(self.conductor.serialize)
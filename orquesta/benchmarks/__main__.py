@@ -0,0 +1,78 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+
+import orquesta
+from orquesta.benchmarks import conducting
+from orquesta.benchmarks import expressions
+from orquesta.benchmarks import graphing
+from orquesta import graphing as graphing_util
+
+
+SUITES = {
+    'conducting': lambda repeat: conducting.run(sorted(conducting.SERIES.keys()), repeat=repeat),
+    'expressions': lambda repeat: expressions.run(
+        sorted(expressions.EXPRESSIONS.keys()),
+        expressions.DEFAULT_SIZES,
+        repeat=repeat
+    ),
+    'graphing': lambda repeat: graphing.run(
+        [graphing_util.DEFAULT_GRAPH_BACKEND, 'compact'],
+        graphing.DEFAULT_SIZES,
+        repeat=repeat
+    )
+}
+
+
+def main(argv=None):
+    # Run the benchmark suites and output the results as JSON with the details of the
+    # environment so the results can be tracked and compared across commits.
+    parser = argparse.ArgumentParser(description='Run the orquesta benchmark suites.')
+    parser.add_argument('--suite', action='append', dest='suites', choices=sorted(SUITES.keys()))
+    parser.add_argument('--repeat', type=int, default=conducting.DEFAULT_REPEAT)
+    parser.add_argument('--output', help='Write the results to the file instead of stdout.')
+    args = parser.parse_args(argv)
+
+    report = {
+        'version': orquesta.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.utcnow().isoformat(),
+        'results': []
+    }
+
+    for suite in (args.suites or sorted(SUITES.keys())):
+        report['results'].extend(SUITES[suite](args.repeat))
+
+    output = json.dumps(report, indent=4, sort_keys=True)
+
+    if not args.output:
+        print(output)
+        return 0
+
+    with open(args.output, 'w') as f:
+        f.write(output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
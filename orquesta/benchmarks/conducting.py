@@ -0,0 +1,268 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import timeit
+
+from orquesta.composers import native as native_comp
+from orquesta import conducting
+from orquesta import runner
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+
+
+DEFAULT_REPEAT = 3
+
+
+def noop():
+    return None
+
+
+def echo(message=None):
+    return message
+
+
+ACTIONS = {
+    'core.noop': noop,
+    'core.echo': echo
+}
+
+
+def make_chain(size):
+    tasks = {}
+
+    for i in range(1, size):
+        tasks['t%s' % i] = {'action': 'core.noop', 'next': [{'do': 't%s' % (i + 1)}]}
+
+    tasks['t%s' % size] = {'action': 'core.noop'}
+
+    return {'tasks': tasks}, None
+
+
+def make_fan_out(size):
+    # The first task splits into the given number of branches that are not joined.
+    branches = ['t%s' % i for i in range(1, size + 1)]
+    tasks = {'t0': {'action': 'core.noop', 'next': [{'do': branches}]}}
+
+    for i in range(1, size + 1):
+        tasks['t%s' % i] = {'action': 'core.noop'}
+
+    return {'tasks': tasks}, None
+
+
+def make_join(size):
+    # The first task splits into the given number of branches that join at the last task.
+    wf_def, inputs = make_fan_out(size)
+
+    for i in range(1, size + 1):
+        wf_def['tasks']['t%s' % i]['next'] = [{'do': 'join'}]
+
+    wf_def['tasks']['join'] = {'join': 'all', 'action': 'core.noop'}
+
+    return wf_def, inputs
+
+
+def make_nested_splits(size):
+    # Each level has two branches that converge at the next level without a join so the
+    # number of routes and task executions doubles at every level.
+    tasks = {}
+
+    for i in range(0, size):
+        tasks['s%s' % i] = {'action': 'core.noop', 'next': [{'do': ['a%s' % i, 'b%s' % i]}]}
+        tasks['a%s' % i] = {'action': 'core.noop', 'next': [{'do': 's%s' % (i + 1)}]}
+        tasks['b%s' % i] = {'action': 'core.noop', 'next': [{'do': 's%s' % (i + 1)}]}
+
+    tasks['s%s' % size] = {'action': 'core.noop'}
+
+    return {'tasks': tasks}, None
+
+
+def make_cycles(size):
+    # The loop task is run for the given number of iterations before the workflow completes.
+    tasks = {
+        'init': {
+            'next': [{'publish': [{'i': 1}], 'do': 'loop'}]
+        },
+        'loop': {
+            'action': 'core.noop',
+            'next': [
+                {'when': '<% ctx(i) < ctx(n) %>', 'publish': [{'i': '<% ctx(i) + 1 %>'}],
+                 'do': 'loop'},
+                {'when': '<% ctx(i) >= ctx(n) %>', 'do': 'done'}
+            ]
+        },
+        'done': {
+            'action': 'core.noop'
+        }
+    }
+
+    return {'input': ['n'], 'tasks': tasks}, {'n': size}
+
+
+def make_with_items(size):
+    tasks = {
+        't1': {
+            'with': '<% ctx(xs) %>',
+            'action': 'core.echo message=<% item() %>',
+            'next': [{'publish': [{'items': '<% result() %>'}]}]
+        }
+    }
+
+    return {'input': ['xs'], 'tasks': tasks}, {'xs': [str(i) for i in range(0, size)]}
+
+
+def make_payload(size, length=10):
+    # A chain of tasks that pass the payload of the given size in bytes from task to task.
+    tasks = {}
+
+    for i in range(1, length + 1):
+        tasks['t%s' % i] = {
+            'action': 'core.echo message=<% ctx(data) %>',
+            'next': [{'publish': [{'data': '<% result() %>'}]}]
+        }
+
+        if i < length:
+            tasks['t%s' % i]['next'][0]['do'] = 't%s' % (i + 1)
+
+    return {'input': ['data'], 'tasks': tasks}, {'data': 'x' * size}
+
+
+SERIES = {
+    'chain': (make_chain, [10, 100, 500]),
+    'fan_out': (make_fan_out, [10, 100, 500]),
+    'join': (make_join, [10, 100, 500]),
+    'nested_splits': (make_nested_splits, [2, 4, 6]),
+    'cycles': (make_cycles, [10, 100, 500]),
+    'with_items': (make_with_items, [10, 100, 1000]),
+    'payload': (make_payload, [1024, 102400, 1048576])
+}
+
+
+def run_workflow(wf_spec, inputs=None, graph_backend=None):
+    wf_runner = runner.WorkflowRunner(wf_spec, ACTIONS, inputs=inputs, graph_backend=graph_backend)
+    status = wf_runner.run()
+
+    if status != statuses.SUCCEEDED:
+        raise Exception('The workflow completed with status "%s".' % status)
+
+    return wf_runner
+
+
+def run(series, sizes=None, repeat=DEFAULT_REPEAT, graph_backend=None):
+    results = []
+
+    for name in series:
+        make_wf_def, default_sizes = SERIES[name]
+
+        for size in (sizes or default_sizes):
+            wf_def, inputs = make_wf_def(size)
+            wf_spec = native_specs.WorkflowSpec(wf_def)
+            num_tasks = len(wf_def['tasks'])
+
+            def add_result(benchmark, timings, **kwargs):
+                result = {
+                    'benchmark': 'conducting.%s' % benchmark,
+                    'series': name,
+                    'size': size,
+                    'tasks': num_tasks,
+                    'min': min(timings),
+                    'max': max(timings)
+                }
+
+                result.update(kwargs)
+                results.append(result)
+
+            add_result(
+                'spec',
+                timeit.repeat(lambda: native_specs.WorkflowSpec(wf_def), number=1, repeat=repeat)
+            )
+
+            add_result(
+                'compose',
+                timeit.repeat(
+                    lambda: native_comp.WorkflowComposer.compose(wf_spec, graph_backend),
+                    number=1,
+                    repeat=repeat
+                )
+            )
+
+            # Run the workflow end to end with the actions run inline and collect the time
+            # spent in each call to the conductor.
+            runs = [run_workflow(wf_spec, inputs, graph_backend) for _ in range(0, repeat)]
+            stats = [wf_runner.get_stats() for wf_runner in runs]
+            executions = len(runs[0].conductor.workflow_state.sequence)
+
+            add_result('run', [s['elapsed'] for s in stats], executions=executions)
+
+            for call in ['get_next_tasks', 'update_task_state']:
+                add_result(
+                    call,
+                    [s['calls'][call]['time'] for s in stats],
+                    calls=stats[0]['calls'][call]['count'],
+                    executions=executions
+                )
+
+            # Serialize and deserialize the conductor with the state of the completed workflow.
+            conductor = runs[0].conductor
+            data = conductor.serialize()
+
+            add_result(
+                'serialize',
+                timeit.repeat(conductor.serialize, number=1, repeat=repeat),
+                bytes=len(json.dumps(data)),
+                executions=executions
+            )
+
+            add_result(
+                'deserialize',
+                timeit.repeat(
+                    lambda: conducting.WorkflowConductor.deserialize(data),
+                    number=1,
+                    repeat=repeat
+                ),
+                bytes=len(json.dumps(data)),
+                executions=executions
+            )
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the workflow conductor.')
+    parser.add_argument('--series', action='append', choices=sorted(SERIES.keys()))
+    parser.add_argument('--size', action='append', dest='sizes', type=int)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--backend', default=None)
+    parser.add_argument('--json', action='store_true', help='Output the results as JSON.')
+    args = parser.parse_args(argv)
+
+    series = args.series or sorted(SERIES.keys())
+    results = run(series, args.sizes, repeat=args.repeat, graph_backend=args.backend)
+
+    if args.json:
+        print(json.dumps(results, indent=4, sort_keys=True))
+        return 0
+
+    for result in results:
+        print('%(benchmark)-28s %(series)-14s %(size)8d %(min)12.6f %(max)12.6f' % result)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import timeit
+
+from orquesta.expressions import base as expr_base
+
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_REPEAT = 3
+DEFAULT_NUMBER = 10
+
+EXPRESSIONS = {
+    'yaql': {
+        'ctx': '<% ctx(x1) %>',
+        'compare': '<% ctx(x1) < ctx(x2) %>',
+        'collection': '<% ctx(xs).select($ * 2) %>',
+        'template': 'Value of x1 is <% ctx(x1) %> and x2 is <% ctx(x2) %>.'
+    },
+    'jinja': {
+        'ctx': '{{ ctx("x1") }}',
+        'compare': '{{ ctx("x1") < ctx("x2") }}',
+        'collection': '{{ ctx("xs") | map("int") | list }}',
+        'template': 'Value of x1 is {{ ctx("x1") }} and x2 is {{ ctx("x2") }}.'
+    }
+}
+
+
+def make_context(size):
+    # The context has the given number of variables and a list of the given size. There
+    # are at least the variables that are referenced by the expressions.
+    ctx = {'x%s' % i: i for i in range(0, max(size, 3))}
+    ctx['xs'] = list(range(0, size))
+
+    return ctx
+
+
+def run(evaluators, sizes, repeat=DEFAULT_REPEAT, number=DEFAULT_NUMBER):
+    results = []
+
+    for size in sizes:
+        ctx = make_context(size)
+
+        for evaluator in evaluators:
+            for name, expr in sorted(EXPRESSIONS[evaluator].items()):
+                benchmarks = {
+                    'validate': lambda: expr_base.validate(expr),
+                    'evaluate': lambda: expr_base.evaluate(expr, ctx)
+                }
+
+                for benchmark, func in sorted(benchmarks.items()):
+                    timings = timeit.repeat(func, number=number, repeat=repeat)
+
+                    results.append({
+                        'benchmark': 'expressions.%s' % benchmark,
+                        'evaluator': evaluator,
+                        'expression': name,
+                        'size': size,
+                        'number': number,
+                        'min': min(timings) / number,
+                        'max': max(timings) / number
+                    })
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the expression evaluators.')
+    parser.add_argument('--evaluator', action='append', dest='evaluators',
+                        choices=sorted(EXPRESSIONS.keys()))
+    parser.add_argument('--size', action='append', dest='sizes', type=int)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--number', type=int, default=DEFAULT_NUMBER)
+    parser.add_argument('--json', action='store_true', help='Output the results as JSON.')
+    args = parser.parse_args(argv)
+
+    evaluators = args.evaluators or sorted(EXPRESSIONS.keys())
+    sizes = args.sizes or DEFAULT_SIZES
+    results = run(evaluators, sizes, repeat=args.repeat, number=args.number)
+
+    if args.json:
+        print(json.dumps(results, indent=4, sort_keys=True))
+        return 0
+
+    for result in results:
+        print('%(benchmark)-22s %(evaluator)-6s %(expression)-12s %(size)8d '
+              '%(min)12.6f %(max)12.6f' % result)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import timeit
+
+from orquesta import graphing
+
+
+DEFAULT_SIZES = [100, 1000, 5000]
+DEFAULT_REPEAT = 3
+
+
+def add_chain(wf_graph, prefix, size):
+    for i in range(1, size):
+        wf_graph.add_transition('%s%s' % (prefix, i), '%s%s' % (prefix, i + 1))
+
+
+def add_fan_out(wf_graph, prefix, size):
+    # The first task splits into the given number of branches which join at the last task.
+    source, destination = '%s0' % prefix, '%s%s' % (prefix, size + 1)
+
+    for i in range(1, size + 1):
+        wf_graph.add_transition(source, '%s%s' % (prefix, i))
+        wf_graph.add_transition('%s%s' % (prefix, i), destination)
+
+    wf_graph.update_task(destination, barrier='*')
+
+
+def add_loops(wf_graph, prefix, size, length=5):
+    # Each loop transitions back to the start of the loop before continuing to the next loop.
+    for i in range(0, size, length):
+        tasks = ['%s%s' % (prefix, j) for j in range(i, min(i + length, size))]
+
+        for source, destination in zip(tasks, tasks[1:]):
+            wf_graph.add_transition(source, destination)
+
+        wf_graph.add_transition(tasks[-1], tasks[0], criteria=['<% ctx().retry %>'])
+
+        if i + length < size:
+            wf_graph.add_transition(tasks[-1], '%s%s' % (prefix, i + length))
+
+
+def build_graph(graph_cls, size):
+    # Generate a large workflow graph with a mix of sequences, splits, joins, and cycles.
+    wf_graph = graph_cls()
+    add_chain(wf_graph, 'seq', size)
+    add_fan_out(wf_graph, 'split', size)
+    add_loops(wf_graph, 'loop', size)
+    wf_graph.add_transition('seq%s' % size, 'split0')
+    wf_graph.add_transition('split%s' % (size + 1), 'loop0')
+
+    return wf_graph
+
+
+def run(backends, sizes, repeat=DEFAULT_REPEAT):
+    results = []
+
+    for size in sizes:
+        data = build_graph(graphing.WorkflowGraph, size).serialize()
+        tasks = [node['id'] for node in data['nodes']]
+
+        for backend in backends:
+            graph_cls = graphing.get_graph_backend(backend)
+            wf_graph = build_graph(graph_cls, size)
+
+            def walk():
+                for task_id in tasks:
+                    wf_graph.get_next_transitions(task_id)
+                    wf_graph.get_prev_transitions(task_id)
+
+            def cycles():
+                # Reset the cycle index so the cycles are identified on every run.
+                wf_graph._cycle_idx = None
+                wf_graph.get_cycles()
+
+            benchmarks = {
+                'build': lambda: build_graph(graph_cls, size),
+                'serialize': wf_graph.serialize,
+                'deserialize': lambda: graph_cls.deserialize(data),
+                'transitions': walk,
+                'cycles': cycles
+            }
+
+            for name, func in sorted(benchmarks.items()):
+                timings = timeit.repeat(func, number=1, repeat=repeat)
+
+                results.append({
+                    'benchmark': 'graphing.%s' % name,
+                    'backend': backend,
+                    'size': size,
+                    'tasks': len(tasks),
+                    'min': min(timings),
+                    'max': max(timings)
+                })
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the workflow graph backends.')
+    parser.add_argument('--backend', action='append', dest='backends')
+    parser.add_argument('--size', action='append', dest='sizes', type=int)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--json', action='store_true', help='Output the results as JSON.')
+    args = parser.parse_args(argv)
+
+    backends = args.backends or [graphing.DEFAULT_GRAPH_BACKEND, 'compact']
+    results = run(backends, args.sizes or DEFAULT_SIZES, repeat=args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=4, sort_keys=True))
+        return 0
+
+    for result in results:
+        print('%(benchmark)-24s %(backend)-10s %(tasks)8d %(min)12.6f %(max)12.6f' % result)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -32,5 +32,5 @@ class WorkflowComposer(object):
 
     @classmethod
     @abc.abstractmethod
-    def compose(cls, spec):
+    def compose(cls, spec, graph_backend=None):
         raise NotImplementedError()
@@ -26,13 +26,13 @@ class WorkflowComposer(comp_base.WorkflowComposer):
     wf_spec_type = mock_specs.WorkflowSpec
 
     @classmethod
-    def compose(cls, spec):
+    def compose(cls, spec, graph_backend=None):
         if not cls.wf_spec_type:
             raise TypeError('Undefined spec type for composer.')
 
         if not isinstance(spec, cls.wf_spec_type):
             raise TypeError('Unsupported spec type "%s".' % str(type(spec)))
 
-        wf_graph = graphing.WorkflowGraph()
+        wf_graph = graphing.get_graph_backend(graph_backend)()
 
         return wf_graph
@@ -27,22 +27,22 @@ class WorkflowComposer(comp_base.WorkflowComposer):
     wf_spec_type = native_specs.WorkflowSpec
 
     @classmethod
-    def compose(cls, spec):
+    def compose(cls, spec, graph_backend=None):
         if not cls.wf_spec_type:
             raise TypeError('Undefined spec type for composer.')
 
         if not isinstance(spec, cls.wf_spec_type):
             raise TypeError('Unsupported spec type "%s".' % str(type(spec)))
 
-        return cls._compose_wf_graph(spec)
+        return cls._compose_wf_graph(spec, graph_backend=graph_backend)
 
     @classmethod
-    def _compose_wf_graph(cls, wf_spec):
+    def _compose_wf_graph(cls, wf_spec, graph_backend=None):
         if not isinstance(wf_spec, cls.wf_spec_type):
             raise TypeError('Workflow spec is not typeof %s.' % cls.wf_spec_type.__name__)
 
         q = queue.Queue()
-        wf_graph = graphing.WorkflowGraph()
+        wf_graph = graphing.get_graph_backend(graph_backend)()
 
         for task_name, condition, task_transition_item_idx in wf_spec.tasks.get_start_tasks():
             q.put((task_name, []))
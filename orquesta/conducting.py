@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import copy
 import logging
+import pickle
 import six
+import threading
+import uuid
 
 from six.moves import queue
 
@@ -23,13 +27,17 @@ from orquesta import events
 from orquesta import exceptions as exc
 from orquesta.expressions import base as expr_base
 from orquesta import graphing
+from orquesta import instrumentation
 from orquesta import machines
+from orquesta import planning
+from orquesta import results
 from orquesta.specs import base as spec_base
 from orquesta.specs import loader as spec_loader
 from orquesta import statuses
 from orquesta.utils import context as ctx_util
 from orquesta.utils import dictionary as dict_util
 from orquesta.utils import plugin as plugin_util
+from orquesta import values
 
 
 LOG = logging.getLogger(__name__)
@@ -42,10 +50,38 @@ class WorkflowState(object):
         self.contexts = list()
         self.routes = list()
         self.sequence = list()
-        self.staged = list()
         self.status = statuses.UNSET
         self.tasks = dict()
 
+        # Index of task state entries in the sequence by task status. The index is not
+        # serialized and is rebuilt on deserialization. It allows the workflow state to
+        # answer queries on task statuses without scanning the sequence.
+        self._tasks_by_status = collections.defaultdict(set)
+
+        # Staging table keyed by task id and route. The keys of the staged tasks that are
+        # ready are tracked separately. The order of insertion is kept so the list of
+        # staged tasks is serialized in the same format and order as before.
+        self._staged = collections.OrderedDict()
+        self._staged_ready = set()
+        self._staged_seq = 0
+        self._staged_order = dict()
+
+        # Count of the items by status for each staged task with items. The counts are not
+        # serialized and are rebuilt from the items when the staged task is added. They allow
+        # the state machines to assess the items of the task without scanning the items.
+        self._staged_items_status = dict()
+        self._staged_items_cursor = dict()
+
+        # Index of the route ancestry. A new route is added on each split even if an identical
+        # route already exists because each run of the split task in a cycle has its own route.
+        # The parent of each route, which is the closest earlier route that is a subset of the
+        # route, is identified once when the route is added instead of on each lookup.
+        self._route_sets = list()
+        self._route_parents = list()
+
+        # Journal of the changes made to the workflow state since the last checkpoint.
+        self.checkpoint()
+
     def serialize(self):
         return {
             'contexts': copy.deepcopy(self.contexts),
@@ -65,16 +101,368 @@ class WorkflowState(object):
         instance.staged = copy.deepcopy(data.get('staged', dict()))
         instance.status = data.get('status', statuses.UNSET)
         instance.tasks = copy.deepcopy(data.get('tasks', dict()))
+        instance.reindex_tasks()
+        instance.reindex_routes()
+        instance.checkpoint()
 
         return instance
 
+    def checkpoint(self):
+        self._checkpoint = {
+            'contexts': len(self.contexts),
+            'routes': len(self.routes),
+            'sequence': len(self.sequence)
+        }
+
+        self._changed_tasks = set()
+        self._changed_task_pointers = set()
+        self._changed_staged_tasks = set()
+        self._unstaged_tasks = set()
+        self._compacted = set()
+
+    def mark_task_changed(self, task_state_idx):
+        if task_state_idx is not None and task_state_idx < self._checkpoint['sequence']:
+            self._changed_tasks.add(task_state_idx)
+
+    def mark_staged_task_changed(self, task_id, route):
+        if (task_id, route) in self._staged:
+            self._changed_staged_tasks.add((task_id, route))
+
+    def serialize_patch(self):
+        new_task_state_idxs = range(self._checkpoint['sequence'], len(self.sequence))
+        task_state_idxs = sorted(self._changed_tasks.union(new_task_state_idxs))
+
+        patch = {
+            'contexts': copy.deepcopy(self.contexts[self._checkpoint['contexts']:]),
+            'routes': copy.deepcopy(self.routes[self._checkpoint['routes']:]),
+            'sequence': [[i, copy.deepcopy(self.sequence[i])] for i in task_state_idxs],
+            'staged': [
+                copy.deepcopy(entry) for key, entry in six.iteritems(self._staged)
+                if key in self._changed_staged_tasks
+            ],
+            'unstaged': [list(key) for key in sorted(self._unstaged_tasks)],
+            'status': self.status,
+            'tasks': {k: self.tasks[k] for k in self._changed_task_pointers}
+        }
+
+        # If the contexts or the sequence are compacted, the patch includes all of them which
+        # replace the contexts or the sequence in the workflow state that the patch is applied to.
+        if self._compacted:
+            patch['compacted'] = sorted(self._compacted)
+
+        return patch
+
+    def apply_patch(self, patch):
+        if 'contexts' in patch.get('compacted', list()):
+            self.contexts = list()
+
+        if 'sequence' in patch.get('compacted', list()):
+            self.sequence = list()
+
+        self.contexts.extend(copy.deepcopy(patch.get('contexts', list())))
+        # The routes in the patch are added as is so the route indices are the same.
+        for route_details in patch.get('routes', list()):
+            self.routes.append(copy.deepcopy(route_details))
+            self._index_route(len(self.routes) - 1)
+
+        for task_state_idx, task_state_entry in patch.get('sequence', list()):
+            task_state_entry = copy.deepcopy(task_state_entry)
+
+            if task_state_idx == len(self.sequence):
+                self.sequence.append(task_state_entry)
+            elif task_state_idx < len(self.sequence):
+                old_status = self.sequence[task_state_idx].get('status')
+                self._tasks_by_status[old_status].discard(task_state_idx)
+                self.sequence[task_state_idx] = task_state_entry
+            else:
+                raise exc.WorkflowStatePatchError(
+                    'The task state entry at index %s is out of sequence.' % task_state_idx
+                )
+
+            if 'status' in task_state_entry:
+                self._tasks_by_status[task_state_entry['status']].add(task_state_idx)
+
+        # The index of the task state entries by status refers to the positions in the
+        # sequence before the compaction so it is rebuilt from the compacted sequence.
+        if 'sequence' in patch.get('compacted', list()):
+            self.reindex_tasks()
+
+        for task_id, route in patch.get('unstaged', list()):
+            self._unstage((task_id, route))
+
+        for entry in patch.get('staged', list()):
+            key = (entry['id'], entry['route'])
+            entry = copy.deepcopy(entry)
+
+            if key in self._staged:
+                self._staged[key] = entry
+                self._staged_ready.discard(key)
+                self._count_staged_items(key, entry)
+
+                if entry.get('ready') is True:
+                    self._staged_ready.add(key)
+            else:
+                self._stage(entry)
+
+        self.tasks.update(patch.get('tasks', dict()))
+        self.status = patch.get('status', self.status)
+        self.checkpoint()
+
+    def compact_contexts(self):
+        # Remove the contexts that are no longer referenced and merge the layers of the contexts
+        # that are still referenced. The contexts are referenced by the staged tasks and by the
+        # task state entries that are not completed, that are terminal, or that are the latest
+        # entry for the task and route. The contexts of the earlier entries for a task in a cycle
+        # are released. Returns the number of contexts removed.
+        if not self.contexts:
+            return 0
+
+        latest_task_state_idxs = set(self.tasks.values())
+        released_task_state_idxs = []
+        task_state_idxs = []
+
+        for idx, task_state_entry in enumerate(self.sequence):
+            if (idx in latest_task_state_idxs or task_state_entry.get('term', False) or
+                    task_state_entry.get('status') not in statuses.COMPLETED_STATUSES):
+                task_state_idxs.append(idx)
+            elif task_state_entry.get('ctxs') != {'in': []}:
+                released_task_state_idxs.append(idx)
+
+        contexts = [self.contexts[0]]
+        compacted = {(0,): 0}
+        staged_ctxs = {}
+        task_state_ctxs = {}
+
+        for key, entry in six.iteritems(self._staged):
+            staged_ctxs[key] = self._compact_context_idxs(entry['ctxs']['in'], contexts, compacted)
+
+        for idx in task_state_idxs:
+            ctxs = self.sequence[idx].get('ctxs', {})
+
+            task_state_ctxs[idx] = {
+                'in': self._compact_context_idxs(ctxs.get('in', []), contexts, compacted)
+            }
+
+            if 'out' in ctxs:
+                task_state_ctxs[idx]['out'] = {
+                    k: self._compact_context_idxs([v], contexts, compacted)[0]
+                    for k, v in six.iteritems(ctxs['out'])
+                }
+
+        # Leave the workflow state as is if the contexts cannot be reduced.
+        if len(contexts) >= len(self.contexts) and not released_task_state_idxs:
+            return 0
+
+        for key, ctx_idxs in six.iteritems(staged_ctxs):
+            self._staged[key]['ctxs']['in'] = ctx_idxs
+            self.mark_staged_task_changed(*key)
+
+        for idx, ctxs in six.iteritems(task_state_ctxs):
+            self.sequence[idx]['ctxs'] = ctxs
+            self.mark_task_changed(idx)
+
+        for idx in released_task_state_idxs:
+            self.sequence[idx]['ctxs'] = {'in': []}
+            self.mark_task_changed(idx)
+
+        count = len(self.contexts) - len(contexts)
+        self.contexts = contexts
+
+        # The context indices are remapped so the next patch includes all the contexts.
+        self._checkpoint['contexts'] = 0
+        self._compacted.add('contexts')
+
+        return count
+
+    def _compact_context_idxs(self, ctx_idxs, contexts, compacted):
+        # The root context is kept as is. The layers between the root contexts are grouped
+        # and each group is merged into a new context. The new contexts are added once and
+        # shared by the lists of context indices that have the same group of layers.
+        compacted_ctx_idxs = []
+        run = []
+
+        for ctx_idx in list(ctx_idxs) + [None]:
+            if ctx_idx is not None and ctx_idx != 0:
+                run.append(ctx_idx)
+                continue
+
+            layers = [self.contexts[i] for i in run]
+
+            for group in ctx_util.group_layers(layers):
+                key = tuple(run[i] for i in group)
+
+                if key not in compacted:
+                    layer = (
+                        layers[group[0]] if len(group) == 1
+                        else ctx_util.merge_layers([layers[i] for i in group])
+                    )
+
+                    contexts.append(layer)
+                    compacted[key] = len(contexts) - 1
+
+                compacted_ctx_idxs.append(compacted[key])
+
+            if ctx_idx is not None:
+                compacted_ctx_idxs.append(0)
+
+            run = []
+
+        return compacted_ctx_idxs
+
+    def compact_sequence(self, retention=1, archive=None):
+        # Remove the earlier entries of the tasks that are repeated in a cycle and keep the last
+        # entries for each task and route up to the retention. The entries that are not completed
+        # or canceled, the terminal entries, and the entries referenced by the staged tasks are
+        # always kept since the workflow status and outputs are determined from them.
+        # The indices of the entries are remapped and the references to the removed entries are
+        # set to None. The removed entries are passed to the archive if one is given. Returns the
+        # number of entries removed.
+        retention = max(retention, 1)
+        referenced = set()
+        counts = collections.defaultdict(int)
+        task_state_idxs = []
+
+        for entry in six.itervalues(self._staged):
+            referenced.update(entry.get('prev', {}).values())
+
+        for idx in range(len(self.sequence) - 1, -1, -1):
+            task_state_entry = self.sequence[idx]
+            key = (task_state_entry['id'], task_state_entry['route'])
+            counts[key] += 1
+
+            if (counts[key] <= retention or idx in referenced or
+                    task_state_entry.get('term', False) or
+                    task_state_entry.get('status') == statuses.CANCELED or
+                    task_state_entry.get('status') not in statuses.COMPLETED_STATUSES):
+                task_state_idxs.append(idx)
+
+        if len(task_state_idxs) == len(self.sequence):
+            return 0
+
+        task_state_idxs.reverse()
+
+        remapped = {idx: i for i, idx in enumerate(task_state_idxs)}
+        removed = [entry for idx, entry in enumerate(self.sequence) if idx not in remapped]
+        self.sequence = [self.sequence[idx] for idx in task_state_idxs]
+
+        for task_state_entry in self.sequence:
+            prev = task_state_entry.get('prev') or {}
+            task_state_entry['prev'] = {k: remapped.get(v) for k, v in six.iteritems(prev)}
+
+        for key, entry in six.iteritems(self._staged):
+            prev = entry.get('prev') or {}
+            entry['prev'] = {k: remapped.get(v) for k, v in six.iteritems(prev)}
+            self.mark_staged_task_changed(*key)
+
+        self.tasks = {k: remapped[v] for k, v in six.iteritems(self.tasks)}
+        self.reindex_tasks()
+
+        # The sequence is remapped so the next patch includes all the entries and pointers.
+        self._checkpoint['sequence'] = 0
+        self._changed_tasks = set()
+        self._changed_task_pointers.update(self.tasks.keys())
+        self._compacted.add('sequence')
+
+        if archive is not None:
+            archive(removed)
+
+        return len(removed)
+
+    def reindex_tasks(self):
+        self._tasks_by_status = collections.defaultdict(set)
+
+        for idx, task_state_entry in enumerate(self.sequence):
+            if 'status' in task_state_entry:
+                self._tasks_by_status[task_state_entry['status']].add(idx)
+
+    def reindex_routes(self):
+        self._route_sets = list()
+        self._route_parents = list()
+
+        for route in range(0, len(self.routes)):
+            self._index_route(route)
+
+    def _index_route(self, route):
+        route_set = frozenset(self.routes[route])
+        parent = None
+
+        # Start with the next longest route which is the closest earlier route.
+        for prev_route in range(route - 1, -1, -1):
+            if self._route_sets[prev_route].issubset(route_set):
+                parent = prev_route
+                break
+
+        self._route_sets.append(route_set)
+        self._route_parents.append(parent)
+
+    def add_route(self, route_details):
+        self.routes.append(list(route_details))
+        self._index_route(len(self.routes) - 1)
+
+        return len(self.routes) - 1
+
+    def get_parent_route(self, route):
+        if route is None or route <= 0 or route >= len(self._route_parents):
+            return None
+
+        return self._route_parents[route]
+
     def get_task(self, task_id, task_route):
         return self.sequence[
             self.tasks[constants.TASK_STATE_ROUTE_FORMAT % (task_id, str(task_route))]
         ]
 
+    def _get_task_state_entry_idx(self, task_state_entry):
+        task_state_entry_uid = constants.TASK_STATE_ROUTE_FORMAT % (
+            task_state_entry.get('id'),
+            str(task_state_entry.get('route'))
+        )
+
+        task_state_idx = self.tasks.get(task_state_entry_uid)
+
+        # The task pointer refers to the latest entry for the task and route which is the
+        # only entry that is updated. Any other entry is not in the index.
+        if task_state_idx is None or self.sequence[task_state_idx] is not task_state_entry:
+            raise exc.InvalidTaskStateEntry(task_state_entry.get('id'))
+
+        return task_state_idx
+
+    def add_task_state_entry(self, task_state_entry):
+        task_state_entry_uid = constants.TASK_STATE_ROUTE_FORMAT % (
+            task_state_entry['id'],
+            str(task_state_entry['route'])
+        )
+
+        self.sequence.append(task_state_entry)
+        task_state_idx = len(self.sequence) - 1
+        self.tasks[task_state_entry_uid] = task_state_idx
+        self._changed_task_pointers.add(task_state_entry_uid)
+
+        if 'status' in task_state_entry:
+            self._tasks_by_status[task_state_entry['status']].add(task_state_idx)
+
+        return task_state_idx
+
+    def update_task_status(self, task_state_entry, status):
+        task_state_idx = self._get_task_state_entry_idx(task_state_entry)
+
+        if 'status' in task_state_entry:
+            self._tasks_by_status[task_state_entry['status']].discard(task_state_idx)
+
+        task_state_entry['status'] = status
+        self._tasks_by_status[status].add(task_state_idx)
+        self.mark_task_changed(task_state_idx)
+
     def get_tasks_by_status(self, statuses):
-        return [t for t in self.sequence if t['status'] in statuses]
+        task_state_idxs = set()
+
+        for status in statuses:
+            task_state_idxs.update(self._tasks_by_status.get(status, set()))
+
+        return [self.sequence[idx] for idx in sorted(task_state_idxs)]
+
+    def has_tasks_by_status(self, statuses):
+        return any(self._tasks_by_status.get(status) for status in statuses)
 
     def get_terminal_tasks(self):
         return [t for t in self.sequence if t.get('term', False)]
@@ -84,30 +472,86 @@ class WorkflowState(object):
 
     @property
     def has_active_tasks(self):
-        return len(self.get_tasks_by_status(statuses.ACTIVE_STATUSES)) > 0
+        return self.has_tasks_by_status(statuses.ACTIVE_STATUSES)
 
     @property
     def has_pausing_tasks(self):
-        return len(self.get_tasks_by_status([statuses.PAUSING])) > 0
+        return self.has_tasks_by_status([statuses.PAUSING])
 
     @property
     def has_paused_tasks(self):
-        return len(self.get_tasks_by_status([statuses.PAUSED, statuses.PENDING])) > 0
+        return self.has_tasks_by_status([statuses.PAUSED, statuses.PENDING])
 
     @property
     def has_canceling_tasks(self):
-        return len(self.get_tasks_by_status([statuses.CANCELING])) > 0
+        return self.has_tasks_by_status([statuses.CANCELING])
 
     @property
     def has_canceled_tasks(self):
-        return len(self.get_tasks_by_status([statuses.CANCELED])) > 0
+        return self.has_tasks_by_status([statuses.CANCELED])
+
+    @property
+    def staged(self):
+        return list(self._staged.values())
+
+    @staged.setter
+    def staged(self, value):
+        self._staged = collections.OrderedDict()
+        self._staged_ready = set()
+        self._staged_order = dict()
+        self._staged_items_status = dict()
+        self._staged_items_cursor = dict()
+
+        for entry in value or []:
+            self._stage(entry)
+
+    def _stage(self, entry):
+        key = (entry['id'], entry['route'])
+
+        self._staged[key] = entry
+        self._staged_order[key] = self._staged_seq
+        self._staged_seq += 1
+
+        if entry.get('ready') is True:
+            self._staged_ready.add(key)
+
+        self._count_staged_items(key, entry)
+
+        # A newly staged task is journaled as removed and then added back so the
+        # entry is placed at the end of the staging table when the patch is applied.
+        self._changed_staged_tasks.add(key)
+        self._unstaged_tasks.add(key)
+
+    def _unstage(self, key):
+        if key in self._staged:
+            del self._staged[key]
+            del self._staged_order[key]
+            self._staged_ready.discard(key)
+            self._staged_items_status.pop(key, None)
+            self._staged_items_cursor.pop(key, None)
+
+        self._changed_staged_tasks.discard(key)
+        self._unstaged_tasks.add(key)
+
+    def _count_staged_items(self, key, entry):
+        self._staged_items_cursor[key] = 0
+
+        if 'items' not in entry:
+            self._staged_items_status.pop(key, None)
+            return
+
+        self._staged_items_status[key] = collections.Counter(
+            item['status'] for item in entry['items'] or []
+        )
 
     def get_staged_tasks(self):
-        return list(filter(lambda x: x['ready'] is True, self.staged))
+        keys = sorted(self._staged_ready, key=lambda k: self._staged_order[k])
+
+        return [self._staged[k] for k in keys]
 
     @property
     def has_staged_tasks(self):
-        return len(self.get_staged_tasks()) > 0
+        return len(self._staged_ready) > 0
 
     def add_staged_task(self, task_id, route, ctxs=None, prev=None, ready=True):
         if not ctxs:
@@ -123,53 +567,245 @@ class WorkflowState(object):
             'ready': ready
         }
 
-        self.staged.append(entry)
+        self._stage(entry)
 
         return entry
 
     def get_staged_task(self, task_id, route):
-        def query(x):
-            return x['id'] == task_id and x['route'] == route
+        return self._staged.get((task_id, route))
+
+    def set_staged_task_ready(self, task_id, route, ready=True):
+        key = (task_id, route)
+        staged_task = self._staged.get(key)
 
-        staged_tasks = list(filter(query, self.staged))
+        if not staged_task:
+            raise exc.InvalidTaskStateEntry(task_id)
+
+        staged_task['ready'] = ready
+        self._changed_staged_tasks.add(key)
+
+        if ready is True:
+            self._staged_ready.add(key)
+        else:
+            self._staged_ready.discard(key)
+
+    def set_staged_task_items(self, task_id, route, items_count):
+        key = (task_id, route)
+        staged_task = self._staged.get(key)
+
+        if not staged_task:
+            raise exc.InvalidTaskStateEntry(task_id)
+
+        staged_task['items'] = [{'status': statuses.UNSET}] * items_count
+        self._staged_items_status[key] = collections.Counter({statuses.UNSET: items_count})
+        self._staged_items_cursor[key] = 0
+        self._changed_staged_tasks.add(key)
+
+    def update_staged_task_item(self, task_id, route, item_id, status, result=None,
+                                result_ref=None):
+        key = (task_id, route)
+        staged_task = self._staged.get(key)
+
+        if not staged_task:
+            raise exc.InvalidTaskStateEntry(task_id)
+
+        # Replace the item instead of updating it in place since the
+        # items are initialized with references to the same object.
+        items_status = self._staged_items_status[key]
+        items_status[staged_task['items'][item_id]['status']] -= 1
+        staged_task['items'][item_id] = (
+            {'status': status, 'result_ref': result_ref} if result_ref is not None
+            else {'status': status, 'result': result}
+        )
+        items_status[status] += 1
+        self._changed_staged_tasks.add(key)
+
+        if status == statuses.UNSET:
+            self._staged_items_cursor[key] = min(self._staged_items_cursor.get(key, 0), item_id)
+
+    def get_staged_task_items_notrun(self, task_id, route, limit=None):
+        key = (task_id, route)
+        staged_task = self._staged.get(key)
+
+        if not staged_task:
+            raise exc.InvalidTaskStateEntry(task_id)
+
+        items = staged_task.get('items') or []
+        notrun_count = self.get_staged_task_items_status(task_id, route)[statuses.UNSET]
+        limit = notrun_count if limit is None else min(limit, notrun_count)
+        item_ids = []
+
+        # The items before the cursor are already run. Move the cursor
+        # forward to skip the items that are run since the last lookup.
+        item_id = self._staged_items_cursor.get(key, 0)
+
+        while item_id < len(items) and items[item_id]['status'] != statuses.UNSET:
+            item_id += 1
 
-        return staged_tasks[0] if staged_tasks else None
+        self._staged_items_cursor[key] = item_id
+
+        while item_id < len(items) and len(item_ids) < limit:
+            if items[item_id]['status'] == statuses.UNSET:
+                item_ids.append(item_id)
+
+            item_id += 1
+
+        return item_ids
+
+    def get_staged_task_items_status(self, task_id, route):
+        return self._staged_items_status.get((task_id, route), collections.Counter())
 
     def remove_staged_task(self, task_id, route):
         staged_task = self.get_staged_task(task_id, route)
 
         if staged_task:
-            any_items_running = [
-                item for item in staged_task.get('items', [])
-                if item['status'] in statuses.ACTIVE_STATUSES
-            ]
+            items_status = self.get_staged_task_items_status(task_id, route)
+
+            if not any(items_status[status] > 0 for status in statuses.ACTIVE_STATUSES):
+                self._unstage((task_id, route))
+
+
+class WorkflowStateView(collections.Mapping):
+    # A read-only view of the workflow state that is injected into the expression context
+    # as __state. Unlike WorkflowState.serialize, the view does not copy the workflow state
+    # and reads through to the current values. Copying the view returns the view itself so
+    # the copies of the expression context along the way do not copy the workflow state.
+
+    _keys = ['contexts', 'routes', 'sequence', 'staged', 'status', 'tasks']
+
+    def __init__(self, workflow_state):
+        self._workflow_state = workflow_state
 
-            if not any_items_running:
-                self.staged.remove(staged_task)
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+
+        return getattr(self._workflow_state, key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_parent_route(self, route):
+        return self._workflow_state.get_parent_route(route)
+
+    def serialize(self):
+        return self._workflow_state.serialize()
 
 
 class WorkflowConductor(object):
 
-    def __init__(self, spec, context=None, inputs=None):
+    def __init__(self, spec, context=None, inputs=None, log_limit=None, graph_backend=None,
+                 result_store=None, value_store=None, context_limit=None,
+                 sequence_retention=None, sequence_archive=None, instrument=None):
         if not spec or not isinstance(spec, spec_base.Spec):
             raise ValueError('The value of "spec" is not type of Spec.')
 
         self.spec = spec
-        self.catalog = self.spec.get_catalog()
+        self._setup(
+            self.spec.get_catalog(),
+            context=context,
+            inputs=inputs,
+            log_limit=log_limit,
+            graph_backend=graph_backend,
+            result_store=result_store,
+            value_store=value_store,
+            context_limit=context_limit,
+            sequence_retention=sequence_retention,
+            sequence_archive=sequence_archive,
+            instrument=instrument
+        )
+
+    def __reduce__(self):
+        # The conductor is pickled in the serialized form so it can be passed to an executor
+        # such as a process pool. The result and value stores must be picklable as well.
+        for name, store in [('result', self._result_store), ('value', self._value_store)]:
+            _check_picklable(name, store)
+
+        return (
+            _restore_conductor,
+            (self.__class__, self.serialize(), self._result_store, self._value_store)
+        )
+
+    def _setup(self, catalog, context=None, inputs=None, log_limit=None, graph_backend=None,
+               result_store=None, value_store=None, context_limit=None,
+               sequence_retention=None, sequence_archive=None, instrument=None):
+        self.catalog = catalog
         self.spec_module = spec_loader.get_spec_module(self.catalog)
         self.composer = plugin_util.get_module('orquesta.composers', self.catalog)
 
         self._errors = []
         self._graph = None
+        self._graph_backend = graph_backend
         self._inputs = inputs or {}
         self._log = []
+        self._log_idxs = {}
+        self._log_limit = log_limit
         self._outputs = None
         self._parent_ctx = context or {}
+        self._plan = None
+        self._result_store = result_store
+        self._value_store = value_store
+        self._context_limit = context_limit
+        self._context_gc_size = context_limit
+        self._sequence_retention = sequence_retention
+        self._sequence_archive = sequence_archive
+        self._sequence_gc_size = sequence_retention
+        self._instrument = instrument or instrumentation.NULL_INSTRUMENT
         self._workflow_state = None
+        self._checkpoint = {'log': 0, 'errors': 0, 'output': None}
+        self._changed_log_entries = {'log': set(), 'errors': set()}
+        self._task_ctxs = {}
+        self._defer_outputs = False
+        self._deferred_term_tasks = None
+        self._serialized = {}
+
+    def __getattr__(self, name):
+        # This is only called if the attribute is not found. If the conductor is restored
+        # lazily, materialize the part of the serialized conductor on first access.
+        serialized = self.__dict__.get('_serialized') or {}
+
+        if name not in serialized:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'" % (type(self).__name__, name)
+            )
+
+        data = serialized.pop(name)
+
+        if name == 'spec':
+            value = self.spec_module.WorkflowSpec.deserialize(data)
+        elif name == '_workflow_state':
+            value = WorkflowState.deserialize(data)
+            value.conductor = self
+        else:
+            value = copy.deepcopy(data)
+
+        setattr(self, name, value)
+
+        # The checkpoint refers to the serialized output until the output is materialized.
+        if name == '_outputs' and self._checkpoint['output'] is data:
+            self._checkpoint['output'] = value
+
+        return value
+
+    def _materialize(self):
+        # Materialize the parts of a lazily restored conductor that are used to render the
+        # tasks. The parts are materialized on first access which is not thread safe so this
+        # is done before the tasks are rendered concurrently with the same conductor.
+        for name in ['spec', 'plan', '_workflow_state']:
+            getattr(self, name)
 
     def restore(self, graph, log=None, errors=None, state=None,
                 inputs=None, outputs=None, context=None):
-        if not graph or not isinstance(graph, graphing.WorkflowGraph):
+        if not graph or not isinstance(graph, graphing.BaseWorkflowGraph):
             raise ValueError('The value of "graph" is not type of WorkflowGraph.')
 
         if not state or not isinstance(state, WorkflowState):
@@ -185,17 +821,28 @@ class WorkflowConductor(object):
         self._graph = graph
         self._inputs = inputs or {}
         self._log = log or []
+        self._log_idxs = {}
         self._outputs = outputs
         self._parent_ctx = context or {}
+        self._plan = None
+        self._serialized = {}
         self._workflow_state = state
+        self._task_ctxs = {}
 
         # Assign a back reference of the conductor to the workflow state.
         # This back reference is needed to help the workflow state machine
         # identify if there are next tasks.
         self._workflow_state.conductor = self
 
+        # The restored conductor is the base for any changes journaled from here on.
+        self.checkpoint()
+
     def serialize(self):
-        return {
+        with self._instrument.measure(instrumentation.SERIALIZE):
+            return self._serialize()
+
+    def _serialize(self):
+        data = {
             'spec': self.spec.serialize(),
             'graph': self.graph.serialize(),
             'input': self.get_workflow_input(),
@@ -206,12 +853,73 @@ class WorkflowConductor(object):
             'output': self.get_workflow_output()
         }
 
+        if self._log_limit is not None:
+            data['log_limit'] = self._log_limit
+
+        if self._graph_backend is not None:
+            data['graph_backend'] = self._graph_backend
+
+        # The thresholds for the next compaction are kept so a restored conductor does not
+        # compact on every update when the workflow state is already over the limit.
+        if self._context_limit is not None:
+            data['context_limit'] = self._context_limit
+            data['context_gc_size'] = self._context_gc_size
+
+        if self._sequence_retention is not None:
+            data['sequence_retention'] = self._sequence_retention
+            data['sequence_gc_size'] = self._sequence_gc_size
+
+        return data
+
     @classmethod
-    def deserialize(cls, data):
+    def deserialize(cls, data, lazy=False, result_store=None, value_store=None,
+                    sequence_archive=None, instrument=None):
+        instrument = instrument or instrumentation.NULL_INSTRUMENT
+
+        with instrument.measure(instrumentation.DESERIALIZE):
+            return cls._deserialize(
+                data,
+                lazy=lazy,
+                result_store=result_store,
+                value_store=value_store,
+                sequence_archive=sequence_archive,
+                instrument=instrument
+            )
+
+    @classmethod
+    def _deserialize(cls, data, lazy=False, result_store=None, value_store=None,
+                     sequence_archive=None, instrument=None):
+        if lazy:
+            instance = cls.__new__(cls)
+            instance._setup(
+                data['spec']['catalog'],
+                log_limit=data.get('log_limit'),
+                graph_backend=data.get('graph_backend'),
+                result_store=result_store,
+                value_store=value_store,
+                context_limit=data.get('context_limit'),
+                sequence_retention=data.get('sequence_retention'),
+                sequence_archive=sequence_archive,
+                instrument=instrument
+            )
+
+            instance._restore_lazily(data)
+            instance._restore_gc_sizes(data)
+
+            return instance
+
         spec_module = spec_loader.get_spec_module(data['spec']['catalog'])
         spec = spec_module.WorkflowSpec.deserialize(data['spec'])
 
-        graph = graphing.WorkflowGraph.deserialize(data['graph'])
+        # Use the cached plan if it is compiled from the same graph.
+        plan = planning.get_plan(
+            spec,
+            graph_data=data['graph'],
+            spec_data=data['spec'],
+            graph_backend=data.get('graph_backend')
+        )
+
+        graph = plan.graph
         inputs = copy.deepcopy(data['input'])
         context = copy.deepcopy(data['context'])
         state = WorkflowState.deserialize(data['state'])
@@ -219,18 +927,156 @@ class WorkflowConductor(object):
         errors = copy.deepcopy(data['errors'])
         outputs = copy.deepcopy(data['output'])
 
-        instance = cls(spec)
+        instance = cls(
+            spec,
+            log_limit=data.get('log_limit'),
+            graph_backend=data.get('graph_backend'),
+            result_store=result_store,
+            value_store=value_store,
+            context_limit=data.get('context_limit'),
+            sequence_retention=data.get('sequence_retention'),
+            sequence_archive=sequence_archive,
+            instrument=instrument
+        )
+
         instance.restore(graph, log, errors, state, inputs, outputs, context)
+        instance._restore_gc_sizes(data)
+        instance._plan = plan
 
         return instance
 
+    def _restore_gc_sizes(self, data):
+        # The thresholds default to the limits if the conductor is serialized before they
+        # are included in the serialized data.
+        self._context_gc_size = data.get('context_gc_size', self._context_limit)
+        self._sequence_gc_size = data.get('sequence_gc_size', self._sequence_retention)
+
+    def _restore_lazily(self, data):
+        # Keep a reference to the serialized parts of the conductor. Each part is materialized
+        # on first access so that an operation such as a status check does not have to pay for
+        # restoring the whole conductor. The attributes are removed here so they are looked
+        # up from the serialized data (see __getattr__).
+        self._serialized = {
+            'spec': data['spec'],
+            'graph': data['graph'],
+            '_inputs': data['input'] or {},
+            '_parent_ctx': data['context'] or {},
+            '_workflow_state': data['state'],
+            '_log': data.get('log') or [],
+            '_errors': data['errors'] or [],
+            '_outputs': data['output']
+        }
+
+        for name in self._serialized.keys():
+            self.__dict__.pop(name, None)
+
+        self._checkpoint = {
+            'log': len(self._serialized['_log']),
+            'errors': len(self._serialized['_errors']),
+            'output': self._serialized['_outputs']
+        }
+
+    def checkpoint(self):
+        self._checkpoint = {
+            'log': len(self.log),
+            'errors': len(self.errors),
+            'output': self._outputs
+        }
+
+        self._changed_log_entries = {'log': set(), 'errors': set()}
+        self.workflow_state.checkpoint()
+
+    def serialize_patch(self):
+        # Serialize the changes made since the last checkpoint and then set a new checkpoint.
+        patch = {
+            'state': self.workflow_state.serialize_patch(),
+            'log': copy.deepcopy(self.log[self._checkpoint['log']:]),
+            'errors': copy.deepcopy(self.errors[self._checkpoint['errors']:])
+        }
+
+        if self._outputs is not self._checkpoint['output']:
+            patch['output'] = self.get_workflow_output()
+
+        # Include the thresholds for the next compaction which are changed by the compaction.
+        if 'contexts' in patch['state'].get('compacted', []):
+            patch['context_gc_size'] = self._context_gc_size
+
+        if 'sequence' in patch['state'].get('compacted', []):
+            patch['sequence_gc_size'] = self._sequence_gc_size
+
+        # Include the existing log entries that are updated with duplicate counts.
+        updates = {
+            log_name: [[i, copy.deepcopy(self._get_log(log_name)[i])] for i in sorted(idxs)]
+            for log_name, idxs in six.iteritems(self._changed_log_entries) if idxs
+        }
+
+        if updates:
+            patch['updates'] = updates
+
+        self.checkpoint()
+
+        return patch
+
+    def apply_patch(self, patch):
+        self.workflow_state.apply_patch(patch.get('state', {}))
+
+        # The context indices are remapped if the contexts are compacted.
+        if 'contexts' in patch.get('state', {}).get('compacted', []):
+            self._task_ctxs = {}
+
+        if 'context_gc_size' in patch:
+            self._context_gc_size = patch['context_gc_size']
+
+        if 'sequence_gc_size' in patch:
+            self._sequence_gc_size = patch['sequence_gc_size']
+
+        self._log.extend(copy.deepcopy(patch.get('log', [])))
+        self._errors.extend(copy.deepcopy(patch.get('errors', [])))
+
+        for log_name, entries in six.iteritems(patch.get('updates', {})):
+            log = self._get_log(log_name)
+
+            for i, entry in entries:
+                log[i] = copy.deepcopy(entry)
+
+        # The updated entries have a different count but the same fingerprint.
+        # Therefore there is no need to reindex the entries here.
+
+        if 'output' in patch:
+            self._outputs = copy.deepcopy(patch['output'])
+
+        self.checkpoint()
+
     @property
     def graph(self):
         if not self._graph:
-            self._graph = self.composer.compose(self.spec)
+            self._graph = self.plan.graph
 
         return self._graph
 
+    @property
+    def plan(self):
+        if not self._plan and 'graph' in self._serialized:
+            # The spec is passed as a callable so it is only materialized if the cached
+            # plan cannot be used and the plan needs to be compiled.
+            self._plan = planning.get_plan(
+                lambda: self.spec,
+                graph_data=self._serialized.pop('graph'),
+                spec_data=self._serialized.get('spec'),
+                graph_backend=self._graph_backend
+            )
+
+        if not self._plan:
+            with self._instrument.measure(instrumentation.COMPOSE):
+                self._plan = planning.get_plan(
+                    self.spec,
+                    composer=self.composer,
+                    graph=self._graph,
+                    graph_backend=self._graph_backend
+                )
+
+        return self._plan
+
     @property
     def workflow_state(self):
         if not self._workflow_state:
@@ -239,14 +1085,15 @@ class WorkflowConductor(object):
             # Set any given context as the initial context.
             init_ctx = self.get_workflow_parent_context()
 
-            # Render workflow inputs and merge into the initial context.
-            workflow_input = self.get_workflow_input()
-            rendered_inputs, input_errors = self.spec.render_input(workflow_input, init_ctx)
-            init_ctx = dict_util.merge_dicts(init_ctx, rendered_inputs, True)
+            with self._instrument.measure(instrumentation.RENDER_WORKFLOW_INPUT):
+                # Render workflow inputs and merge into the initial context.
+                workflow_input = self.get_workflow_input()
+                rendered_inputs, input_errors = self.spec.render_input(workflow_input, init_ctx)
+                init_ctx = dict_util.merge_dicts(init_ctx, rendered_inputs, True)
 
-            # Render workflow variables and merge into the initial context.
-            rendered_vars, var_errors = self.spec.render_vars(init_ctx)
-            init_ctx = dict_util.merge_dicts(init_ctx, rendered_vars, True)
+                # Render workflow variables and merge into the initial context.
+                rendered_vars, var_errors = self.spec.render_vars(init_ctx)
+                init_ctx = dict_util.merge_dicts(init_ctx, rendered_vars, True)
 
             # Fail workflow if there are errors.
             errors = input_errors + var_errors
@@ -258,10 +1105,11 @@ class WorkflowConductor(object):
             # Proceed if there is no issue with rendering of inputs and vars.
             if self.get_workflow_status() not in statuses.ABENDED_STATUSES:
                 # Set the initial workflow context.
+                init_ctx = values.externalize(init_ctx, self._value_store)
                 self._workflow_state.contexts.append(init_ctx)
 
                 # Set the initial execution route.
-                self._workflow_state.routes.append([])
+                self._workflow_state.add_route([])
 
                 # Identify the starting tasks and set the pointer to the initial context entry.
                 for task_node in self.graph.roots:
@@ -290,8 +1138,15 @@ class WorkflowConductor(object):
         if entry_type not in ['info', 'warn', 'error']:
             raise exc.WorkflowLogEntryError('The log entry type "%s" is not valid.' % entry_type)
 
+        # If rendering the workflow outputs is deferred while processing a batch of events, then
+        # render the outputs before the entry so the entries are in the same order as the
+        # entries from processing the events one at a time.
+        if self._deferred_term_tasks is not None:
+            self._render_deferred_workflow_outputs()
+
         # Identify the appropriate log and then log the entry.
-        log = self.errors if entry_type == 'error' else self.log
+        log_name = 'errors' if entry_type == 'error' else 'log'
+        log = self._get_log(log_name)
 
         # Create the log entry.
         entry = {'type': entry_type, 'message': message}
@@ -301,17 +1156,69 @@ class WorkflowConductor(object):
         dict_util.set_dict_value(entry, 'result', result, insert_null=False)
         dict_util.set_dict_value(entry, 'data', data, insert_null=False)
 
-        # Ignore if this is a duplicate.
-        if len(list(filter(lambda x: x == entry, log))) > 0:
+        # Ignore if this is a duplicate. If the log is limited, count the duplicate instead.
+        duplicate_idx = self._get_log_entry_idx(log_name, entry)
+
+        if duplicate_idx is not None:
+            if self._log_limit is not None:
+                self._count_log_entry(log_name, duplicate_idx)
+
             return
 
+        # If the log is at the limit, discard the entry and count the discarded entries
+        # in a summary entry at the end of the log.
+        if self._log_limit is not None and len(log) >= self._log_limit:
+            if len(log) == self._log_limit:
+                message = 'The log reached the limit of %s entries.' % self._log_limit
+                entry = {'type': 'error' if entry_type == 'error' else 'warn', 'message': message}
+            else:
+                self._count_log_entry(log_name, len(log) - 1)
+                return
+
         # Append the log entry.
         log.append(entry)
 
+    def _get_log(self, log_name):
+        return self._errors if log_name == 'errors' else self._log
+
+    def _get_log_entry_idx(self, log_name, entry):
+        log = self._get_log(log_name)
+        log_idx = self._log_idxs.get(log_name)
+
+        # Rebuild the index if the log is truncated elsewhere.
+        if not log_idx or log_idx['size'] > len(log):
+            log_idx = {'size': 0, 'entries': collections.defaultdict(list)}
+            self._log_idxs[log_name] = log_idx
+
+        # Index the entries that are added since the last lookup. This includes the entry added
+        # on the last call and entries added elsewhere such as from restore and patches.
+        for i in range(log_idx['size'], len(log)):
+            fingerprint = dict_util.get_dict_fingerprint(log[i], exclude=['count'])
+            log_idx['entries'][fingerprint].append(i)
+
+        log_idx['size'] = len(log)
+
+        # Compare the entries with the same fingerprint to rule out collision.
+        fingerprint = dict_util.get_dict_fingerprint(entry, exclude=['count'])
+
+        for i in log_idx['entries'].get(fingerprint, []):
+            if {k: v for k, v in six.iteritems(log[i]) if k != 'count'} == entry:
+                return i
+
+        return None
+
+    def _count_log_entry(self, log_name, idx):
+        log_entry = self._get_log(log_name)[idx]
+        log_entry['count'] = log_entry.get('count', 1) + 1
+
+        # Record the change if the entry is already in the last checkpoint.
+        if idx < self._checkpoint[log_name]:
+            self._changed_log_entries[log_name].add(idx)
+
     def log_error(self, e, task_id=None, route=None, task_transition_id=None):
         self.log_entry(
             'error',
-            '%s: %s' % (type(e).__name__, str(e)),
+            _format_error(e),
             task_id=task_id,
             route=route,
             task_transition_id=task_transition_id
@@ -333,6 +1240,10 @@ class WorkflowConductor(object):
         return copy.deepcopy(self._inputs)
 
     def get_workflow_status(self):
+        # Read the status from the serialized workflow state if it is not materialized yet.
+        if '_workflow_state' in self._serialized:
+            return self._serialized['_workflow_state']['status']
+
         return self.workflow_state.status
 
     def _set_workflow_status(self, value):
@@ -362,6 +1273,22 @@ class WorkflowConductor(object):
         if status != current_status and current_status == updated_status:
             raise exc.InvalidWorkflowStatusTransition(current_status, wf_ex_event.name)
 
+    def _get_state_context(self):
+        state_ctx = {'__state': WorkflowStateView(self.workflow_state)}
+
+        # Include the value store so the references in the context can be resolved.
+        if self._value_store is not None:
+            state_ctx['__value_store'] = self._value_store
+
+        return state_ctx
+
+    def _get_state_snapshot_context(self):
+        # The view of the workflow state is only used to render the task. The task returned
+        # to the caller has a snapshot of the workflow state instead since the task may be
+        # persisted or sent elsewhere and the view changes as the later events are applied.
+        # The value store is not included since it is not serializable.
+        return {'__state': self.workflow_state.serialize()}
+
     def get_workflow_initial_context(self):
         return copy.deepcopy(self.workflow_state.contexts[0])
 
@@ -369,9 +1296,10 @@ class WorkflowConductor(object):
         if self.get_workflow_status() not in statuses.COMPLETED_STATUSES:
             raise exc.WorkflowContextError('Workflow is not in completed status.')
 
-        wf_term_ctx = {}
+        return self._get_workflow_terminal_context(self.workflow_state.get_terminal_tasks())
 
-        term_tasks = self.workflow_state.get_terminal_tasks()
+    def _get_workflow_terminal_context(self, term_tasks):
+        wf_term_ctx = {}
 
         if not term_tasks:
             return wf_term_ctx
@@ -379,53 +1307,71 @@ class WorkflowConductor(object):
         first_term_task = term_tasks[0:1][0]
         other_term_tasks = term_tasks[1:]
 
-        wf_term_ctx = self.get_task_context(first_term_task['ctxs']['in'])
+        wf_term_ctx_idxs = copy.deepcopy(first_term_task['ctxs']['in'])
 
         for task in other_term_tasks:
             # Remove the initial context since the first task processed above already
             # inclulded that and we only want to apply the differences.
             in_ctx_idxs = copy.deepcopy(task['ctxs']['in'])
             in_ctx_idxs.remove(0)
+            wf_term_ctx_idxs.extend(in_ctx_idxs)
 
-            wf_term_ctx = dict_util.merge_dicts(
-                wf_term_ctx,
-                self.get_task_context(in_ctx_idxs),
-                overwrite=True
-            )
-
-        return wf_term_ctx
+        return self.get_task_context(wf_term_ctx_idxs)
 
     def _render_workflow_outputs(self):
         wf_status = self.get_workflow_status()
 
         # Render workflow outputs if workflow is completed.
-        if wf_status in statuses.COMPLETED_STATUSES and not self._outputs:
-            workflow_ctx = self.get_workflow_terminal_context()
-            state_ctx = {'__state': self.workflow_state.serialize()}
+        if wf_status not in statuses.COMPLETED_STATUSES or self._outputs:
+            return
+
+        # If processing a batch of events, defer rendering until the end of the batch but
+        # keep the terminal tasks at the time the workflow is completed so the outputs are
+        # the same as the outputs from processing the events one at a time.
+        if self._defer_outputs:
+            if self._deferred_term_tasks is None:
+                self._deferred_term_tasks = self.workflow_state.get_terminal_tasks()
+            return
+
+        self._render_workflow_terminal_outputs(self.workflow_state.get_terminal_tasks())
+
+    def _render_deferred_workflow_outputs(self):
+        term_tasks = self._deferred_term_tasks
+        self._deferred_term_tasks = None
+
+        if term_tasks is not None and not self._outputs:
+            self._render_workflow_terminal_outputs(term_tasks)
+
+    def _render_workflow_terminal_outputs(self, term_tasks):
+        wf_status = self.get_workflow_status()
+
+        with self._instrument.measure(instrumentation.RENDER_WORKFLOW_OUTPUT):
+            workflow_ctx = self._get_workflow_terminal_context(term_tasks)
+            state_ctx = self._get_state_context()
             workflow_ctx = dict_util.merge_dicts(workflow_ctx, state_ctx, True)
             outputs, errors = self.spec.render_output(workflow_ctx)
 
-            # Persist outputs if it is not empty.
-            if outputs:
-                self._outputs = outputs
+        # Persist outputs if it is not empty.
+        if outputs:
+            self._outputs = outputs
 
-            # Log errors if any returned and mark workflow as failed.
-            if errors:
-                self.log_errors(errors)
+        # Log errors if any returned and mark workflow as failed.
+        if errors:
+            self.log_errors(errors)
 
-                if wf_status not in [statuses.EXPIRED, statuses.ABANDONED, statuses.CANCELED]:
-                    self.request_workflow_status(statuses.FAILED)
+            if wf_status not in [statuses.EXPIRED, statuses.ABANDONED, statuses.CANCELED]:
+                self.request_workflow_status(statuses.FAILED)
 
     def get_workflow_output(self):
         return copy.deepcopy(self._outputs) if self._outputs else None
 
     def _inbound_criteria_satisfied(self, task_id, route):
-        inbounds = self.graph.get_prev_transitions(task_id)
+        inbounds = self.plan.get_prev_transitions(task_id)
         inbounds_satisfied = []
         barrier = 1
 
-        if self.graph.has_barrier(task_id):
-            barrier = self.graph.get_barrier(task_id)
+        if self.plan.has_barrier(task_id):
+            barrier = self.plan.get_barrier(task_id)
             barrier = len(inbounds) if barrier == '*' else barrier
 
         for prev_transition in inbounds:
@@ -443,27 +1389,58 @@ class WorkflowConductor(object):
 
         return (len(inbounds_satisfied) >= barrier)
 
-    def get_task(self, task_id, route):
+    def get_task(self, task_id, route, items_window=False):
+        task = self._get_task(task_id, route, items_window=items_window)
+        task['ctx'].update(self._get_state_snapshot_context())
+
+        return task
+
+    def _get_task(self, task_id, route, items_window=False):
+        with self._instrument.measure(instrumentation.GET_TASK, task_id, route):
+            return self._render_task(task_id, route, items_window=items_window)
+
+    def _render_task(self, task_id, route, items_window=False):
         try:
-            task_ctx = self.get_task_initial_context(task_id, route)
+            task_ctx = self._get_task_initial_context(task_id, route)
         except ValueError:
-            task_ctx = self.get_workflow_initial_context()
+            task_ctx = self._get_task_context([0])
 
-        state_ctx = {'__state': self.workflow_state.serialize()}
+        state_ctx = self._get_state_context()
         current_task = {'id': task_id, 'route': route}
         task_ctx = ctx_util.set_current_task(task_ctx, current_task)
         task_ctx = dict_util.merge_dicts(task_ctx, state_ctx, True)
         task_spec = self.spec.tasks.get_task(task_id).copy()
-        task_spec, action_specs = task_spec.render(task_ctx)
 
+        # The workflow state view and the value store are only used to render the task
+        # and are removed from the context of the task that is returned.
         task = {
             'id': task_id,
             'route': route,
-            'ctx': task_ctx,
-            'spec': task_spec,
-            'actions': action_specs
+            'ctx': {k: v for k, v in six.iteritems(task_ctx.to_dict()) if k not in state_ctx},
+            'spec': task_spec
         }
 
+        if not task_spec.has_items():
+            task['spec'], task['actions'] = task_spec.render(task_ctx)
+        else:
+            # Add items and related meta data to the task details.
+            items = task_spec.get_items(task_ctx)
+            concurrency = getattr(task_spec.get_items_spec(), 'concurrency', None)
+            task['items_count'] = len(items)
+            task['concurrency'] = expr_base.evaluate(concurrency, task_ctx)
+
+            # If requested, only render the actions for the items that can be run under the
+            # concurrency policy. Otherwise, render the actions for all the items in the list.
+            item_ids = (
+                self._get_task_items_window(task) if items_window
+                else range(0, len(items))
+            )
+
+            task['actions'] = [
+                task_spec.render_item(task_ctx, item_id, items[item_id])
+                for item_id in item_ids
+            ]
+
         # If there is a task delay specified, evaluate the delay value.
         if getattr(task_spec, 'delay', None):
             task_delay = task_spec.delay
@@ -476,44 +1453,35 @@ class WorkflowConductor(object):
 
             task['delay'] = task_delay
 
-        # Add items and related meta data to the task details.
-        if task_spec.has_items():
-            items_spec = getattr(task_spec, 'with')
-            concurrency = getattr(items_spec, 'concurrency', None)
-            task['items_count'] = len(action_specs)
-            task['concurrency'] = expr_base.evaluate(concurrency, task_ctx)
-
         return task
 
-    def _evaluate_task_actions(self, task):
+    def _get_task_items_window(self, task):
         task_id = task['id']
         task_route = task['route']
 
-        # Return task if it is not with items.
-        if not task['spec'].has_items():
-            return task
-
         # Fetch the task entry from staging.
         staged_task = self.workflow_state.get_staged_task(task_id, task_route)
 
         # Prepare the staging task to track items execution status.
         if 'items' not in staged_task or not staged_task['items']:
-            staged_task['items'] = [{'status': statuses.UNSET}] * task['items_count']
+            self.workflow_state.set_staged_task_items(task_id, task_route, task['items_count'])
 
-        # Trim the list of actions in the task per concurrency policy.
-        all_items = list(zip(task['actions'], staged_task['items']))
-        notrun_items = list(filter(lambda x: x[1]['status'] == statuses.UNSET, all_items))
-        active_items = list(filter(lambda x: x[1]['status'] in statuses.ACTIVE_STATUSES, all_items))
+        # Identify the number of items that can be run per concurrency policy.
+        items_status = self.workflow_state.get_staged_task_items_status(task_id, task_route)
+        availability = items_status[statuses.UNSET]
 
         if task['concurrency'] is not None:
-            availability = task['concurrency'] - len(active_items)
-            candidates = list(zip(*notrun_items[:availability]))
-            task['actions'] = list(candidates[0]) if candidates and availability > 0 else []
-        else:
-            candidates = list(zip(*notrun_items))
-            task['actions'] = list(candidates[0]) if candidates else []
+            active = sum(items_status[status] for status in statuses.ACTIVE_STATUSES)
+            availability = min(availability, task['concurrency'] - active)
 
-        return task
+        if availability <= 0:
+            return []
+
+        return self.workflow_state.get_staged_task_items_notrun(
+            task_id,
+            task_route,
+            limit=availability
+        )
 
     def has_next_tasks(self, task_id=None, route=None):
         if not task_id:
@@ -525,7 +1493,7 @@ class WorkflowConductor(object):
                     task_state_entry.get('status') not in statuses.COMPLETED_STATUSES):
                 return []
 
-            outbounds = self.graph.get_next_transitions(task_id)
+            outbounds = self.plan.get_next_transitions(task_id)
 
             for next_seq in outbounds:
                 next_task_id, seq_key = next_seq[1], next_seq[2]
@@ -546,7 +1514,26 @@ class WorkflowConductor(object):
 
         return False
 
-    def get_next_tasks(self):
+    def _get_rendered_task(self, future):
+        next_task, error = future.result()
+
+        if error is not None:
+            return None, error
+
+        # Prepare the staged task to track the items execution status if this is not done
+        # in the conductor that rendered the task.
+        staged_task = self.workflow_state.get_staged_task(next_task['id'], next_task['route'])
+
+        if 'items_count' in next_task and not staged_task.get('items'):
+            self.workflow_state.set_staged_task_items(
+                next_task['id'],
+                next_task['route'],
+                next_task['items_count']
+            )
+
+        return next_task, None
+
+    def get_next_tasks(self, executor=None):
         fail_on_task_rendering = False
         staged_tasks = self.workflow_state.get_staged_tasks()
         remediation_tasks = []
@@ -560,14 +1547,52 @@ class WorkflowConductor(object):
         if self.get_workflow_status() not in statuses.RUNNING_STATUSES and not remediation_tasks:
             return next_tasks
 
+        staged_tasks = remediation_tasks or staged_tasks
+
+        # If an executor is given, then render the staged tasks concurrently. The rendered tasks
+        # are processed below in the same order as the staged tasks so the next tasks and the
+        # errors are the same as when the tasks are rendered one after another.
+        # Any error from the executor itself is raised as is.
+        rendered_tasks = None
+
+        # The tasks share one snapshot of the conductor so the conductor is pickled at most
+        # once for the batch if the executor is a process pool.
+        if executor is not None:
+            self._materialize()
+            snapshot = _ConductorSnapshot(self)
+
+            futures = [
+                executor.submit(_render_task, snapshot, staged_task['id'], staged_task['route'])
+                for staged_task in staged_tasks
+            ]
+
+            rendered_tasks = [self._get_rendered_task(future) for future in futures]
+
         # Return the list of tasks that are staged and readied. If there is exception on
         # task rendering, then log the error and continue. This allows user to know about
         # all task rendering errors for this task transition instead of getting rendering
         # error one at a time during runtime.
-        for staged_task in remediation_tasks or staged_tasks:
+        for i, staged_task in enumerate(staged_tasks):
             try:
-                next_task = self.get_task(staged_task['id'], staged_task['route'])
-                next_task = self._evaluate_task_actions(next_task)
+                if rendered_tasks is None:
+                    next_task = self._get_task(
+                        staged_task['id'],
+                        staged_task['route'],
+                        items_window=True
+                    )
+                else:
+                    next_task, error = rendered_tasks[i]
+
+                    if error is not None:
+                        fail_on_task_rendering = True
+                        self.log_entry(
+                            'error',
+                            error,
+                            task_id=staged_task['id'],
+                            route=staged_task['route']
+                        )
+
+                        continue
 
                 if 'actions' in next_task and len(next_task['actions']) > 0:
                     next_tasks.append(next_task)
@@ -583,6 +1608,14 @@ class WorkflowConductor(object):
             self.request_workflow_status(statuses.FAILED)
             return []
 
+        # The next tasks share one snapshot of the workflow state which is taken once the
+        # tasks are rendered so it includes the items tracked for the tasks with items.
+        if next_tasks:
+            state_ctx = self._get_state_snapshot_context()
+
+            for next_task in next_tasks:
+                next_task['ctx'].update(state_ctx)
+
         return sorted(next_tasks, key=lambda x: (x['id'], x['route']))
 
     def _get_task_state_idx(self, task_id, route):
@@ -599,7 +1632,7 @@ class WorkflowConductor(object):
         return self.workflow_state.sequence[task_state_seq_idx]
 
     def add_task_state(self, task_id, route, in_ctx_idxs=None, prev=None):
-        if not self.graph.has_task(task_id):
+        if not self.plan.has_task(task_id):
             raise exc.InvalidTask(task_id)
 
         if not in_ctx_idxs:
@@ -615,13 +1648,49 @@ class WorkflowConductor(object):
             'next': {}
         }
 
-        task_state_entry_id = constants.TASK_STATE_ROUTE_FORMAT % (task_id, str(route))
-        self.workflow_state.sequence.append(task_state_entry)
-        self.workflow_state.tasks[task_state_entry_id] = len(self.workflow_state.sequence) - 1
+        self.workflow_state.add_task_state_entry(task_state_entry)
 
         return task_state_entry
 
+    def _update_task_item(self, staged_task, event):
+        item_id = event.context['item_id']
+        old_item = staged_task['items'][item_id]
+        result_ref = None
+
+        # If there is a result store, then keep the result of the item in
+        # the result store and only keep the reference in the staged task.
+        if self._result_store is not None and event.result is not None:
+            result_ref = self._result_store.put(event.result)
+
+        self.workflow_state.update_staged_task_item(
+            staged_task['id'],
+            staged_task['route'],
+            item_id,
+            event.status,
+            result=event.result,
+            result_ref=result_ref
+        )
+
+        # Remove the result of the item that is replaced from the result store.
+        if self._result_store is not None and 'result_ref' in old_item:
+            self._result_store.delete(old_item['result_ref'])
+
     def update_task_state(self, task_id, route, event):
+        task_state_entry = self._update_task_state(task_id, route, event)
+
+        # Compact the workflow state once the event and any engine events that follow are
+        # processed so the indices of the task state entries and contexts are not in use.
+        if (self._context_limit is not None and
+                len(self.workflow_state.contexts) > self._context_gc_size):
+            self.compact_contexts()
+
+        if (self._sequence_retention is not None and
+                len(self.workflow_state.sequence) > self._sequence_gc_size):
+            self.compact_sequence()
+
+        return task_state_entry
+
+    def _update_task_state(self, task_id, route, event):
         engine_event_queue = queue.Queue()
 
         # Throw exception if not expected event type.
@@ -629,7 +1698,7 @@ class WorkflowConductor(object):
             raise TypeError('Event is not type of ExecutionEvent.')
 
         # Throw exception if task does not exist in the workflow graph.
-        if not self.graph.has_task(task_id):
+        if not self.plan.has_task(task_id):
             raise exc.InvalidTask(task_id)
 
         # Try to get the task metadata from staging or task state.
@@ -653,7 +1722,7 @@ class WorkflowConductor(object):
         task_state_idx = self._get_task_state_idx(task_id, route)
 
         # If task is already completed and in cycle, then create new task state entry.
-        if (self.graph.in_cycle(task_id) and
+        if (self.plan.in_cycle(task_id) and
                 task_state_entry.get('status') in statuses.COMPLETED_STATUSES):
             task_state_entry = self.add_task_state(
                 task_id,
@@ -669,31 +1738,33 @@ class WorkflowConductor(object):
         if event.status and staged_task and 'items' not in staged_task:
             self.workflow_state.remove_staged_task(task_id, route)
 
-        # If action execution is for a task item, then store the execution status for the item.
-        if (staged_task and event.status and event.context and
-                'item_id' in event.context and event.context['item_id'] is not None):
-            item_result = {'status': event.status, 'result': event.result}
-            staged_task['items'][event.context['item_id']] = item_result
+        with self._instrument.measure(instrumentation.PROCESS_TASK_EVENT, task_id, route):
+            # If action execution is for a task item, then store the execution status of item.
+            if (staged_task and event.status and event.context and
+                    'item_id' in event.context and event.context['item_id'] is not None):
+                self._update_task_item(staged_task, event)
+
+            # Log the error if it is a failed execution event.
+            if event.status == statuses.FAILED:
+                message = 'Execution failed. See result for details.'
+                self.log_entry('error', message, task_id=task_id, result=event.result)
 
-        # Log the error if it is a failed execution event.
-        if event.status == statuses.FAILED:
-            message = 'Execution failed. See result for details.'
-            self.log_entry('error', message, task_id=task_id, result=event.result)
+            # Process the action execution event using the
+            # task state machine and update the task status.
+            old_task_status = task_state_entry.get('status', statuses.UNSET)
+            machines.TaskStateMachine.process_event(self.workflow_state, task_state_entry, event)
+            new_task_status = task_state_entry.get('status', statuses.UNSET)
 
-        # Process the action execution event using the
-        # task state machine and update the task status.
-        old_task_status = task_state_entry.get('status', statuses.UNSET)
-        machines.TaskStateMachine.process_event(self.workflow_state, task_state_entry, event)
-        new_task_status = task_state_entry.get('status', statuses.UNSET)
+        task_result = None
 
         # Get task result and set current context if task is completed.
         if new_task_status in statuses.COMPLETED_STATUSES:
             # Get task details required for updating outgoing context.
             task_spec = self.spec.tasks.get_task(task_id)
 
-            # Get task result.
+            # Get task result. The results of the items are retrieved on evaluation.
             task_result = (
-                [item.get('result') for item in staged_task.get('items', [])]
+                results.ItemResults(staged_task.get('items', []), self._result_store)
                 if staged_task and task_spec.has_items() else event.result
             )
 
@@ -702,12 +1773,12 @@ class WorkflowConductor(object):
 
             # Set current task in the context.
             in_ctx_idxs = task_state_entry['ctxs']['in']
-            in_ctx_val = self.get_task_context(in_ctx_idxs)
+            in_ctx_val = self._get_task_context(in_ctx_idxs)
             current_task = {'id': task_id, 'route': route, 'result': task_result}
             current_ctx = ctx_util.set_current_task(in_ctx_val, current_task)
 
             # Setup context for evaluating expressions in task transition criteria.
-            state_ctx = {'__state': self.workflow_state.serialize()}
+            state_ctx = self._get_state_context()
             current_ctx = dict_util.merge_dicts(current_ctx, state_ctx, True)
 
         # Evaluate task transitions if task is completed and status change is not processed.
@@ -716,7 +1787,7 @@ class WorkflowConductor(object):
             staged_next_tasks = []
 
             # Identify task transitions for the current completed task.
-            task_transitions = self.graph.get_next_transitions(task_id)
+            task_transitions = self.plan.get_next_transitions(task_id)
 
             # Mark task as terminal when there is no transitions.
             if not task_transitions:
@@ -732,8 +1803,11 @@ class WorkflowConductor(object):
                 # Evaluate the criteria for task transition. If there is a failure while
                 # evaluating expression(s), fail the workflow.
                 try:
-                    criteria = task_transition[3].get('criteria') or []
-                    evaluated_criteria = [expr_base.evaluate(c, current_ctx) for c in criteria]
+                    with self._instrument.measure(
+                            instrumentation.EVALUATE_TRANSITION, task_id, route):
+                        criteria = task_transition[3].get('criteria') or []
+                        evaluated_criteria = [expr_base.evaluate(c, current_ctx) for c in criteria]
+
                     task_state_entry['next'][task_transition_id] = all(evaluated_criteria)
                 except Exception as e:
                     self.log_error(e, task_id, route, task_transition_id)
@@ -747,11 +1821,13 @@ class WorkflowConductor(object):
                     new_ctx_idx = None
 
                     # Get and process new context for the task transition.
-                    out_ctx, new_ctx, errors = task_spec.finalize_context(
-                        next_task_id,
-                        task_transition,
-                        copy.deepcopy(current_ctx)
-                    )
+                    with self._instrument.measure(
+                            instrumentation.FINALIZE_CONTEXT, task_id, route):
+                        out_ctx, new_ctx, errors = task_spec.finalize_context(
+                            next_task_id,
+                            task_transition,
+                            copy.copy(current_ctx)
+                        )
 
                     if errors:
                         self.log_errors(errors, task_id, route, task_transition_id)
@@ -761,6 +1837,7 @@ class WorkflowConductor(object):
                     out_ctx_idxs = copy.deepcopy(task_state_entry['ctxs']['in'])
 
                     if new_ctx:
+                        new_ctx = values.externalize(new_ctx, self._value_store)
                         self.workflow_state.contexts.append(new_ctx)
                         new_ctx_idx = len(self.workflow_state.contexts) - 1
 
@@ -808,9 +1885,10 @@ class WorkflowConductor(object):
 
                     # Check if inbound criteria are met. Must use the original route
                     # to identify the inbound task transitions.
-                    staged_next_task['ready'] = self._inbound_criteria_satisfied(
+                    self.workflow_state.set_staged_task_ready(
                         next_task_id,
-                        route
+                        next_task_route,
+                        ready=self._inbound_criteria_satisfied(next_task_id, route)
                     )
 
                     # Put the next task in the engine event queue if it is an engine command.
@@ -840,23 +1918,61 @@ class WorkflowConductor(object):
                 for staged_next_task in staged_next_tasks:
                     staged_next_task['run_on_fail'] = True
 
+                    self.workflow_state.mark_staged_task_changed(
+                        staged_next_task['id'],
+                        staged_next_task['route']
+                    )
+
+        # Remove the results of the items from the result store once the task is unstaged.
+        if (isinstance(task_result, results.ItemResults) and self._result_store is not None and
+                not self.workflow_state.get_staged_task(task_id, route)):
+            for result_ref in task_result.get_refs():
+                self._result_store.delete(result_ref)
+
+        # Record the changes made to the task state entry.
+        self.workflow_state.mark_task_changed(task_state_idx)
+
         # Process the task event using the workflow state machine and update the workflow status.
         task_ex_event = events.TaskExecutionEvent(task_id, route, task_state_entry['status'])
-        machines.WorkflowStateMachine.process_event(self.workflow_state, task_ex_event)
+
+        with self._instrument.measure(instrumentation.PROCESS_WORKFLOW_EVENT, task_id, route):
+            machines.WorkflowStateMachine.process_event(self.workflow_state, task_ex_event)
 
         # Process any engine commands in the queue.
         while not engine_event_queue.empty():
             next_task_id, next_task_route = engine_event_queue.get()
             engine_event = events.ENGINE_EVENT_MAP[next_task_id]
-            self.update_task_state(next_task_id, next_task_route, engine_event())
+            self._update_task_state(next_task_id, next_task_route, engine_event())
 
         # Render workflow output if workflow is completed.
         if self.get_workflow_status() in statuses.COMPLETED_STATUSES:
             task_state_entry['term'] = True
+            self.workflow_state.mark_task_changed(task_state_idx)
             self._render_workflow_outputs()
 
         return task_state_entry
 
+    def update_task_states(self, task_events):
+        task_state_entries = []
+
+        # The events are processed in order thru the task and workflow state machines. Any
+        # evaluation for the workflow as a whole such as rendering the workflow outputs is
+        # deferred until all the events in the batch are processed.
+        self._defer_outputs = True
+
+        try:
+            for task_id, route, event in task_events:
+                task_state_entries.append(self.update_task_state(task_id, route, event))
+        except Exception:
+            self._defer_outputs = False
+            self._deferred_term_tasks = None
+            raise
+
+        self._defer_outputs = False
+        self._render_deferred_workflow_outputs()
+
+        return task_state_entries
+
     def _evaluate_route(self, task_transition, prev_route):
         task_id = task_transition[1]
 
@@ -865,46 +1981,78 @@ class WorkflowConductor(object):
             (task_transition[0], str(task_transition[2]))
         )
 
-        is_split_task = self.spec.tasks.is_split_task(task_id)
-        is_in_cycle = self.graph.in_cycle(task_id)
+        is_split_task = self.plan.is_split_task(task_id)
+        is_in_cycle = self.plan.in_cycle(task_id)
 
         if not is_split_task or is_in_cycle:
             return prev_route
 
         old_route_details = self.workflow_state.routes[prev_route]
-        new_route_details = copy.deepcopy(old_route_details)
 
-        if prev_task_transition_id not in old_route_details:
-            new_route_details.append(prev_task_transition_id)
-
-        if old_route_details == new_route_details:
+        if prev_task_transition_id in old_route_details:
             return prev_route
 
-        self.workflow_state.routes.append(new_route_details)
+        return self.workflow_state.add_route(old_route_details + [prev_task_transition_id])
+
+    def _get_task_context(self, ctx_idxs):
+        # The contexts in the workflow state are not modified once added. So the layered
+        # context for the list of context indices is reused. A copy is returned so changes
+        # made by the caller are not shared.
+        ctx_key = tuple(ctx_idxs)
 
-        return len(self.workflow_state.routes) - 1
+        if ctx_key not in self._task_ctxs:
+            layers = [self.workflow_state.contexts[ctx_idx] for ctx_idx in ctx_idxs]
+            self._task_ctxs[ctx_key] = ctx_util.LayeredContext(layers)
+
+        return self._task_ctxs[ctx_key].copy()
 
     def get_task_context(self, ctx_idxs):
-        ctx = {}
+        return self._get_task_context(ctx_idxs).to_dict()
 
-        for ctx_idx in ctx_idxs:
-            ctx = dict_util.merge_dicts(ctx, self.workflow_state.contexts[ctx_idx], overwrite=True)
+    def compact_contexts(self):
+        count = self.workflow_state.compact_contexts()
 
-        return ctx
+        # The cached task contexts are keyed by the context indices before compaction.
+        self._task_ctxs = {}
 
-    def get_task_initial_context(self, task_id, route):
+        # If the contexts that are still referenced are over the limit, wait until the
+        # number of contexts doubles so the compaction does not run on every update.
+        if self._context_limit is not None:
+            self._context_gc_size = max(self._context_limit, len(self.workflow_state.contexts) * 2)
+
+        return count
+
+    def compact_sequence(self):
+        count = self.workflow_state.compact_sequence(
+            retention=self._sequence_retention or 1,
+            archive=self._sequence_archive
+        )
+
+        # Similar to the contexts, wait until the sequence doubles for the next compaction.
+        if self._sequence_retention is not None:
+            self._sequence_gc_size = max(
+                self._sequence_retention,
+                len(self.workflow_state.sequence) * 2
+            )
+
+        return count
+
+    def _get_task_initial_context(self, task_id, route):
         staged_task = self.workflow_state.get_staged_task(task_id, route)
 
         if staged_task:
-            return self.get_task_context(staged_task['ctxs']['in'])
+            return self._get_task_context(staged_task['ctxs']['in'])
 
         task_state_entry = self.get_task_state_entry(task_id, route)
 
         if task_state_entry:
-            return self.get_task_context(task_state_entry['ctxs']['in'])
+            return self._get_task_context(task_state_entry['ctxs']['in'])
 
         raise ValueError('Unable to determine context for task "%s".' % task_id)
 
+    def get_task_initial_context(self, task_id, route):
+        return self._get_task_initial_context(task_id, route).to_dict()
+
     def get_task_transition_contexts(self, task_id, route):
         contexts = {}
 
@@ -913,7 +2061,7 @@ class WorkflowConductor(object):
         if not task_state_entry:
             raise exc.InvalidTaskStateEntry(task_id)
 
-        for t in self.graph.get_next_transitions(task_id):
+        for t in self.plan.get_next_transitions(task_id):
             task_transition_id = constants.TASK_STATE_TRANSITION_FORMAT % (t[1], str(t[2]))
 
             if (task_transition_id in task_state_entry['next'] and
@@ -921,3 +2069,76 @@ class WorkflowConductor(object):
                 contexts[task_transition_id] = self.get_task_initial_context(t[1], route)
 
         return contexts
+
+
+def _format_error(e):
+    return '%s: %s' % (type(e).__name__, str(e))
+
+
+def _call_in_executor(func, args=None, kwargs=None):
+    # Call the function in an executor and return the result and the error. The error is
+    # returned as a message instead of raised since the exception may not be picklable.
+    try:
+        return func(*(args or ()), **(kwargs or {})), None
+    except Exception as e:
+        return None, _format_error(e)
+
+
+def _check_picklable(name, store):
+    if store is None:
+        return
+
+    try:
+        pickle.dumps(store, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        raise exc.WorkflowConductorPickleError(
+            'The %s store "%s" cannot be pickled. Use a store that can be pickled to pass '
+            'the conductor to an executor such as a process pool. %s' %
+            (name, type(store).__name__, _format_error(e))
+        )
+
+
+def _restore_conductor(cls, data, result_store=None, value_store=None):
+    return cls.deserialize(data, lazy=True, result_store=result_store, value_store=value_store)
+
+
+# The conductor restored from the last snapshot in this process so the tasks of the same
+# batch that are rendered by the same worker of a process pool restore the conductor once.
+_restored_snapshot = {}
+
+
+def _restore_snapshot(token, data):
+    if token not in _restored_snapshot:
+        _restored_snapshot.clear()
+        _restored_snapshot[token] = pickle.loads(data)
+
+    return _ConductorSnapshot(_restored_snapshot[token], token=token)
+
+
+class _ConductorSnapshot(object):
+    # The conductor for the tasks that are rendered in a batch by get_next_tasks. If the
+    # executor runs in the same process such as a thread pool, then the tasks are rendered
+    # by the conductor itself. Otherwise, the conductor is pickled on the first pickling of
+    # the snapshot and the pickled data is reused for the rest of the tasks in the batch.
+
+    def __init__(self, conductor, token=None):
+        self.conductor = conductor
+        self._token = token or uuid.uuid4().hex
+        self._data = None
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        with self._lock:
+            if self._data is None:
+                self._data = pickle.dumps(self.conductor, pickle.HIGHEST_PROTOCOL)
+
+        return (_restore_snapshot, (self._token, self._data))
+
+
+def _render_task(snapshot, task_id, route):
+    # Render the next task on behalf of get_next_tasks in an executor.
+    return _call_in_executor(
+        snapshot.conductor._get_task,
+        args=(task_id, route),
+        kwargs={'items_window': True}
+    )
@@ -125,3 +125,23 @@ class WorkflowContextError(Exception):
 
 class WorkflowLogEntryError(Exception):
     pass
+
+
+class WorkflowStatePatchError(Exception):
+    pass
+
+
+class WorkflowConductorPickleError(Exception):
+    pass
+
+
+class ResultNotFound(Exception):
+
+    def __init__(self, ref):
+        Exception.__init__(self, 'Result "%s" is not found in the result store.' % ref)
+
+
+class ValueNotFound(Exception):
+
+    def __init__(self, ref):
+        Exception.__init__(self, 'Value "%s" is not found in the value store.' % ref)
@@ -16,6 +16,7 @@ import json
 import six
 
 from orquesta import exceptions as exc
+from orquesta import values
 
 
 def json_(s):
@@ -40,13 +41,20 @@ def zip_(*args, **kwargs):
 
 
 def ctx_(context, key=None):
+    # The references to the values in the value store are resolved on access.
+    ctx_vars = context['__vars']
+    value_store = ctx_vars.get('__value_store') if ctx_vars is not None else None
+
     if key:
-        if key not in context['__vars']:
+        if key not in ctx_vars:
             raise exc.VariableUndefinedError(key)
 
-        if key in context['__vars'] and key.startswith('__'):
+        if key in ctx_vars and key.startswith('__'):
             raise exc.VariableInaccessibleError(key)
 
-        return context['__vars'][key]
+        return values.resolve(ctx_vars[key], value_store)
     else:
-        return {k: v for k, v in six.iteritems(context['__vars']) if not k.startswith('__')}
+        return {
+            k: values.resolve(v, value_store)
+            for k, v in six.iteritems(ctx_vars) if not k.startswith('__')
+        }
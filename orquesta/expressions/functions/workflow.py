@@ -14,6 +14,7 @@
 
 from orquesta import constants
 from orquesta import exceptions as exc
+from orquesta import results
 from orquesta import statuses
 
 
@@ -32,6 +33,23 @@ def _get_current_task(context):
     return current_task
 
 
+def _get_parent_route(workflow_state, route):
+    # Use the route index of the workflow state if available.
+    if hasattr(workflow_state, 'get_parent_route'):
+        return workflow_state.get_parent_route(route)
+
+    current_route_details = workflow_state['routes'][route]
+
+    # Reverse the list because we want to start with the next longest route.
+    for idx, prev_route_details in enumerate(reversed(workflow_state['routes'][:route])):
+        if len(set(prev_route_details) - set(current_route_details)) == 0:
+            # The index is from a reversed list so need to calculate
+            # the index of the item in the list before the reverse.
+            return route - idx - 1
+
+    return None
+
+
 def task_status_(context, task_id, route=None):
     if not context:
         return statuses.UNSET
@@ -55,15 +73,10 @@ def task_status_(context, task_id, route=None):
     # If unable to identify the task flow entry and if there are other routes, then
     # use an earlier route before the split to find the specific task.
     if task_state_entry_idx is None:
-        if route > 0:
-            current_route_details = workflow_state['routes'][route]
-            # Reverse the list because we want to start with the next longest route.
-            for idx, prev_route_details in enumerate(reversed(workflow_state['routes'][:route])):
-                if len(set(prev_route_details) - set(current_route_details)) == 0:
-                    # The index is from a reversed list so need to calculate
-                    # the index of the item in the list before the reverse.
-                    prev_route = route - idx - 1
-                    return task_status_(context, task_id, route=prev_route)
+        prev_route = _get_parent_route(workflow_state, route) if route > 0 else None
+
+        if prev_route is not None:
+            return task_status_(context, task_id, route=prev_route)
 
         return statuses.UNSET
 
@@ -103,7 +116,7 @@ def completed_(context):
 def result_(context):
     current_task = _get_current_task(context)
 
-    return current_task.get('result')
+    return results.resolve(current_task.get('result'))
 
 
 def item_(context, key=None):
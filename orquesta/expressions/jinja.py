@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import functools
 import inspect
 import logging
@@ -83,7 +84,7 @@ class JinjaEvaluator(expr_base.Evaluator):
     def contextualize(cls, data):
         ctx = {'__vars': data}
 
-        if isinstance(data, dict):
+        if isinstance(data, collections.Mapping):
             ctx['__state'] = ctx['__vars'].get('__state')
             ctx['__current_task'] = ctx['__vars'].get('__current_task')
             ctx['__current_item'] = ctx['__vars'].get('__current_item')
@@ -193,7 +194,7 @@ class JinjaEvaluator(expr_base.Evaluator):
         if not isinstance(text, six.string_types):
             raise ValueError('Text to be evaluated is not typeof string.')
 
-        if data and not isinstance(data, dict):
+        if data and not isinstance(data, collections.Mapping):
             raise ValueError('Provided data is not typeof dict.')
 
         # Remove raw blocks from the expression.
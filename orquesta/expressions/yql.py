@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import inspect
 import logging
 import re
 import six
+import threading
 
 import yaql
 import yaql.language.exceptions as yaql_exc
@@ -23,12 +25,17 @@ import yaql.language.exceptions as yaql_exc
 from orquesta import exceptions as exc
 from orquesta.expressions import base as expr_base
 from orquesta.expressions.functions import base as func_base
+from orquesta.utils import cache as cache_util
 from orquesta.utils import expression as expr_util
 from orquesta.utils import strings as str_util
 
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_EXPRESSION_CACHE_SIZE = 1024
+
+_EXPRESSION_CACHE = None
+
 
 def register_functions(ctx):
     catalog = func_base.load()
@@ -39,6 +46,23 @@ def register_functions(ctx):
     return catalog
 
 
+class YaqlExpressionCache(cache_util.LRUCache):
+    # The parsed expressions keyed by the expression text. The parsed expression does not
+    # depend on the context so it is reused for every evaluation.
+
+    def __init__(self, size=DEFAULT_EXPRESSION_CACHE_SIZE):
+        super(YaqlExpressionCache, self).__init__(size)
+
+
+def get_expression_cache():
+    global _EXPRESSION_CACHE
+
+    if _EXPRESSION_CACHE is None:
+        _EXPRESSION_CACHE = YaqlExpressionCache()
+
+    return _EXPRESSION_CACHE
+
+
 class YaqlGrammarException(exc.ExpressionGrammarException):
     pass
 
@@ -65,6 +89,7 @@ class YAQLEvaluator(expr_base.Evaluator):
     _regex_var_extracts = ['%s\.?' % _regex_ctx_extract_1, '%s\.?' % _regex_ctx_extract_2]
 
     _engine = yaql.language.factory.YaqlFactory().create()
+    _engine_lock = threading.Lock()
     _root_ctx = yaql.create_context()
     _custom_functions = register_functions(_root_ctx)
 
@@ -78,6 +103,24 @@ class YAQLEvaluator(expr_base.Evaluator):
 
         return ctx
 
+    @classmethod
+    def parse(cls, expr):
+        cache = get_expression_cache()
+        parsed = cache.get(expr)
+
+        if parsed is not None:
+            return parsed
+
+        # The parser of the engine is not thread safe. The parsed expression
+        # can be evaluated concurrently so only the parsing is serialized.
+        # An expression that fails to parse is not cached.
+        with cls._engine_lock:
+            parsed = cls._engine(expr)
+
+        cache.put(expr, parsed)
+
+        return parsed
+
     @classmethod
     def get_statement_regex(cls):
         return cls._regex_pattern
@@ -101,7 +144,7 @@ class YAQLEvaluator(expr_base.Evaluator):
 
         for expr in cls._regex_parser.findall(text):
             try:
-                cls._engine(cls.strip_delimiter(expr))
+                cls.parse(cls.strip_delimiter(expr))
             except (yaql_exc.YaqlException, ValueError, TypeError) as e:
                 errors.append(expr_util.format_error(cls._type, expr, e))
 
@@ -112,7 +155,7 @@ class YAQLEvaluator(expr_base.Evaluator):
         if not isinstance(text, six.string_types):
             raise ValueError('Text to be evaluated is not typeof string.')
 
-        if data and not isinstance(data, dict):
+        if data and not isinstance(data, collections.Mapping):
             raise ValueError('Provided data is not typeof dict.')
 
         output = str_util.unicode(text)
@@ -122,7 +165,7 @@ class YAQLEvaluator(expr_base.Evaluator):
         try:
             for expr in exprs:
                 stripped = cls.strip_delimiter(expr)
-                result = cls._engine(stripped).evaluate(context=ctx)
+                result = cls.parse(stripped).evaluate(context=ctx)
 
                 if inspect.isgenerator(result):
                     result = list(result)
@@ -16,28 +16,227 @@ import abc
 import copy
 import logging
 
-import networkx as nx
-from networkx.readwrite import json_graph
-
 import six
 
 from orquesta import exceptions as exc
 from orquesta.utils import dictionary as dict_util
+from orquesta.utils import plugin as plugin_util
 
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_GRAPH_BACKEND = 'networkx'
+
+_GRAPH_BACKENDS = {}
+_GRAPH_BACKEND_NAMESPACE = 'orquesta.graphs'
+
+
+def get_graph_backend(name=None):
+    name = name or DEFAULT_GRAPH_BACKEND
+
+    if name not in _GRAPH_BACKENDS:
+        _GRAPH_BACKENDS[name] = plugin_util.get_module(_GRAPH_BACKEND_NAMESPACE, name)
+
+    return _GRAPH_BACKENDS[name]
+
 
 @six.add_metaclass(abc.ABCMeta)
-class WorkflowGraph(object):
+class BaseWorkflowGraph(object):
+
+    def __init__(self):
+        # The cycles are identified from the strongly connected components of the graph and
+        # indexed by task. The index is built on first lookup and reset if the graph changes.
+        self._cycle_idx = None
+
+    @abc.abstractmethod
+    def serialize(self):
+        raise NotImplementedError()
+
+    @classmethod
+    @abc.abstractmethod
+    def deserialize(cls, data):
+        raise NotImplementedError()
+
+    @abc.abstractproperty
+    def roots(self):
+        raise NotImplementedError()
+
+    @abc.abstractproperty
+    def leaves(self):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def has_tasks(self):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def has_task(self, task_id):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_task(self, task_id):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_task_attributes(self, attribute):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def add_task(self, task_id, **kwargs):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def update_task(self, task_id, **kwargs):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _get_transitions(self, source, destination, key=None, **kwargs):
+        raise NotImplementedError()
+
+    def has_transition(self, source, destination, **kwargs):
+        return self._get_transitions(source, destination, **kwargs)
+
+    def get_transition(self, source, destination, key=None, **kwargs):
+        edges = self._get_transitions(source, destination, key=key, **kwargs)
+
+        if len(edges) <= 0:
+            raise exc.InvalidTaskTransition(source, destination)
+
+        if len(edges) > 1:
+            raise exc.AmbiguousTaskTransition(source, destination)
+
+        return edges[0]
+
+    @abc.abstractmethod
+    def get_transition_attributes(self, attribute):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def add_transition(self, source, destination, **kwargs):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def update_transition(self, source, destination, key, **kwargs):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_next_transitions(self, task_id):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_prev_transitions(self, task_id):
+        raise NotImplementedError()
+
+    def set_barrier(self, task_id, value='*'):
+        self.update_task(task_id, barrier=value)
+
+    def get_barrier(self, task_id):
+        return self.get_task(task_id).get('barrier')
+
+    def has_barrier(self, task_id):
+        b = self.get_barrier(task_id)
+
+        return (b is not None and b != '')
+
+    @abc.abstractmethod
+    def _get_strongly_connected_components(self):
+        # Returns the list of tasks for each strongly connected component of the graph.
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _find_cycle(self, task_ids):
+        # Returns the transitions (source, destination, key) of a cycle among the tasks.
+        raise NotImplementedError()
+
+    def _get_cycle_index(self):
+        if self._cycle_idx is not None:
+            return self._cycle_idx
+
+        cycles = []
+        tasks = {}
+
+        # A strongly connected component is a cycle if it has more than one task or if
+        # the task in the component transitions to itself. Overlapping cycles in the
+        # graph are reported as a single cycle with all the member tasks.
+        for component in self._get_strongly_connected_components():
+            task_id = component[0]
+
+            if len(component) < 2 and not self._get_transitions(task_id, task_id):
+                continue
+
+            cycle_tasks = sorted(component)
+            cycles.append({'tasks': cycle_tasks, 'route': self._find_cycle(cycle_tasks)})
+
+        cycles = sorted(cycles, key=lambda x: x['tasks'])
+
+        for cycle_idx, cycle in enumerate(cycles):
+            for task_id in cycle['tasks']:
+                tasks[task_id] = cycle_idx
+
+        closed = [self._is_cycle_closed(cycle['tasks']) for cycle in cycles]
+
+        self._cycle_idx = {'cycles': cycles, 'tasks': tasks, 'closed': closed}
+
+        return self._cycle_idx
+
+    def _is_cycle_closed(self, task_ids):
+        # A cycle is closed, for a lack of better term, if there is no task
+        # transition to any task that is not a member of the cycle.
+        for task_id in task_ids:
+            for transition in self.get_next_transitions(task_id):
+                if transition[1] not in task_ids:
+                    return False
+
+        return True
+
+    def get_cycles(self):
+        return copy.deepcopy(self._get_cycle_index()['cycles'])
+
+    def in_cycle(self, task_id):
+        cycle_idx = self._get_cycle_index()
+
+        if task_id not in cycle_idx['tasks']:
+            return []
+
+        return [list(cycle_idx['cycles'][cycle_idx['tasks'][task_id]]['tasks'])]
+
+    def is_cycle_closed(self, cycle):
+        cycle_idx = self._get_cycle_index()
+        task_ids = cycle['tasks']
+
+        # Look up the cycle by the first member task if it is the same cycle in the index.
+        if task_ids and task_ids[0] in cycle_idx['tasks']:
+            i = cycle_idx['tasks'][task_ids[0]]
+
+            if cycle_idx['cycles'][i]['tasks'] == sorted(task_ids):
+                return cycle_idx['closed'][i]
+
+        return self._is_cycle_closed(task_ids)
+
+
+class WorkflowGraph(BaseWorkflowGraph):
 
     def __init__(self, graph=None):
+        super(WorkflowGraph, self).__init__()
+
         # self._graph is the graph model for the workflow. The tracking of workflow and task
         # progress and state is separate from the graph model. There are use cases where tasks
-        # may be cycled and states overwritten.
-        self._graph = graph if graph else nx.MultiDiGraph()
+        # may be cycled and states overwritten. The networkx module is imported on first use
+        # so it is not loaded if another graph backend is selected.
+        if not graph:
+            import networkx as nx
+            graph = nx.MultiDiGraph()
+
+        self._graph = graph
+
+        # The outbound and inbound transitions are sorted and indexed by task on first lookup.
+        # The entries for the tasks are reset when transitions are added or updated.
+        self._next_transitions = {}
+        self._prev_transitions = {}
 
     def serialize(self):
+        from networkx.readwrite import json_graph
+
         data = json_graph.adjacency_data(self._graph)
 
         data['adjacency'] = [
@@ -49,6 +248,8 @@ class WorkflowGraph(object):
 
     @classmethod
     def deserialize(cls, data):
+        from networkx.readwrite import json_graph
+
         g = json_graph.adjacency_graph(copy.deepcopy(data), directed=True, multigraph=True)
         return cls(graph=g)
 
@@ -88,13 +289,14 @@ class WorkflowGraph(object):
     def get_task_attributes(self, attribute):
         return dict_util.merge_dicts(
             {n: None for n in self._graph.nodes()},
-            nx.get_node_attributes(self._graph, attribute),
+            {n: d[attribute] for n, d in self._graph.nodes(data=True) if attribute in d},
             overwrite=True
         )
 
     def add_task(self, task_id, **kwargs):
         if not self.has_task(task_id):
             self._graph.add_node(task_id, **kwargs)
+            self._cycle_idx = None
         else:
             self.update_task(task_id, **kwargs)
 
@@ -105,44 +307,27 @@ class WorkflowGraph(object):
         for key, value in six.iteritems(kwargs):
             self._graph.node[task_id][key] = value
 
-    def has_transition(self, source, destination, **kwargs):
-        edges = filter(
-            lambda e: e[0] == source and e[1] == destination,
-            self._graph.edges(data=True, keys=True)
-        )
+    def _get_transitions(self, source, destination, key=None, **kwargs):
+        # The adjacency of the graph is indexed by source and then destination
+        # so the transitions between the tasks are looked up directly.
+        edge_data = self._graph.get_edge_data(source, destination, default={})
 
-        for attr, value in six.iteritems(kwargs):
-            edges = filter(lambda e: e[3].get(attr, None) == value, list(edges))
-
-        return list(edges)
-
-    def get_transition(self, source, destination, key=None, **kwargs):
         if key is not None:
-            edges = filter(
-                lambda e: e[0] == source and e[1] == destination and e[2] == key,
-                self._graph.edges(data=True, keys=True)
-            )
-        else:
-            edges = filter(
-                lambda e: e[0] == source and e[1] == destination,
-                self._graph.edges(data=True, keys=True)
-            )
-
-            for attr, value in six.iteritems(kwargs):
-                edges = filter(lambda e: e[3].get(attr, None) == value, list(edges))
+            return [(source, destination, key, edge_data[key])] if key in edge_data else []
 
-        edges = list(edges)
+        edges = [(source, destination, k, d) for k, d in six.iteritems(edge_data)]
 
-        if len(edges) <= 0:
-            raise exc.InvalidTaskTransition(source, destination)
-
-        if len(edges) > 1:
-            raise exc.AmbiguousTaskTransition(source, destination)
+        for attr, value in six.iteritems(kwargs):
+            edges = [e for e in edges if e[3].get(attr, None) == value]
 
-        return edges[0]
+        return edges
 
     def get_transition_attributes(self, attribute):
-        return nx.get_edge_attributes(self._graph, attribute)
+        return {
+            (u, v, k): d[attribute]
+            for u, v, k, d in self._graph.edges(data=True, keys=True)
+            if attribute in d
+        }
 
     def add_transition(self, source, destination, **kwargs):
         if not self.has_task(source):
@@ -159,6 +344,9 @@ class WorkflowGraph(object):
                 attrs[attr] = value
 
         self._graph.add_edge(source, destination, **attrs)
+        self._cycle_idx = None
+        self._next_transitions.pop(source, None)
+        self._prev_transitions.pop(destination, None)
 
     def update_transition(self, source, destination, key, **kwargs):
         seq = self.get_transition(source, destination, key=key)
@@ -166,44 +354,33 @@ class WorkflowGraph(object):
         for attr, value in six.iteritems(kwargs):
             self._graph[source][destination][seq[2]][attr] = value
 
-    def get_next_transitions(self, task_id):
-        return sorted(
-            [e for e in self._graph.out_edges([task_id], data=True, keys=True)],
-            key=lambda x: x[1]
-        )
+        self._next_transitions.pop(source, None)
+        self._prev_transitions.pop(destination, None)
 
-    def get_prev_transitions(self, task_id):
-        return sorted(
-            [e for e in self._graph.in_edges([task_id], data=True, keys=True)],
-            key=lambda x: x[1]
-        )
-
-    def set_barrier(self, task_id, value='*'):
-        self.update_task(task_id, barrier=value)
+    def get_next_transitions(self, task_id):
+        if task_id not in self._next_transitions:
+            self._next_transitions[task_id] = sorted(
+                [e for e in self._graph.out_edges([task_id], data=True, keys=True)],
+                key=lambda x: x[1]
+            )
 
-    def get_barrier(self, task_id):
-        return self.get_task(task_id).get('barrier')
+        return list(self._next_transitions[task_id])
 
-    def has_barrier(self, task_id):
-        b = self.get_barrier(task_id)
+    def get_prev_transitions(self, task_id):
+        if task_id not in self._prev_transitions:
+            self._prev_transitions[task_id] = sorted(
+                [e for e in self._graph.in_edges([task_id], data=True, keys=True)],
+                key=lambda x: x[1]
+            )
 
-        return (b is not None and b != '')
+        return list(self._prev_transitions[task_id])
 
-    def get_cycles(self):
-        return [
-            {'tasks': sorted(c), 'route': nx.find_cycle(self._graph, c)}
-            for c in nx.simple_cycles(self._graph)
-        ]
+    def _get_strongly_connected_components(self):
+        import networkx as nx
 
-    def in_cycle(self, task_id):
-        return [c for c in nx.simple_cycles(self._graph) if task_id in c]
+        return [list(component) for component in nx.strongly_connected_components(self._graph)]
 
-    def is_cycle_closed(self, cycle):
-        # A cycle is closed, for a lack of better term, if there is no task
-        # transition to any task that is not a member of the cycle.
-        for task_id in cycle['tasks']:
-            for transition in self.get_next_transitions(task_id):
-                if transition[1] not in cycle['tasks']:
-                    return False
+    def _find_cycle(self, task_ids):
+        import networkx as nx
 
-        return True
+        return nx.find_cycle(self._graph.subgraph(task_ids))
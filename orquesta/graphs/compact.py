@@ -0,0 +1,408 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import array
+import copy
+import logging
+
+import six
+
+from orquesta import exceptions as exc
+from orquesta import graphing
+
+
+LOG = logging.getLogger(__name__)
+
+
+class CompactWorkflowGraph(graphing.BaseWorkflowGraph):
+
+    def __init__(self):
+        super(CompactWorkflowGraph, self).__init__()
+
+        # Tasks are identified internally by the order they are added to the graph.
+        self._graph_attrs = {}
+        self._tasks = []
+        self._task_idxs = {}
+        self._task_attrs = []
+
+        # The transitions are stored in a table where each column is an array indexed by the
+        # order the transitions are added to the graph. The pairs index the transitions for
+        # each source and destination. The order of the pairs is tracked so the inbound
+        # transitions are returned in the same order as the networkx graph.
+        self._edge_srcs = array.array('l')
+        self._edge_dsts = array.array('l')
+        self._edge_keys = array.array('l')
+        self._edge_pairs = array.array('l')
+        self._edge_attrs = []
+        self._pairs = {}
+        self._pair_seqs = {}
+
+        # The adjacency is compressed into offsets and transitions by task (CSR) and built
+        # on first lookup after the graph changes.
+        self._adjacency = None
+
+    def serialize(self):
+        # Serialize the graph into the same format as the adjacency data from networkx.
+        adjacency = self._get_adjacency()
+        nodes = []
+        outbounds = []
+
+        for task_idx, task_id in enumerate(self._tasks):
+            node = dict(self._task_attrs[task_idx])
+            node['id'] = task_id
+            nodes.append(node)
+
+            edges = []
+
+            for edge_idx in self._get_outbound_edges(adjacency, task_idx):
+                edge = dict(self._edge_attrs[edge_idx])
+                edge['id'] = self._tasks[self._edge_dsts[edge_idx]]
+                edge['key'] = self._edge_keys[edge_idx]
+                edges.append(edge)
+
+            outbounds.append(edges)
+
+        return {
+            'directed': True,
+            'multigraph': True,
+            'graph': list(self._graph_attrs.items()),
+            'nodes': nodes,
+            'adjacency': outbounds
+        }
+
+    @classmethod
+    def deserialize(cls, data):
+        data = copy.deepcopy(data)
+        wf_graph = cls()
+        wf_graph._graph_attrs = dict(data.get('graph', []))
+        task_ids = []
+
+        for node in data['nodes']:
+            task_id = node.pop('id')
+            task_ids.append(task_id)
+            wf_graph.add_task(task_id, **node)
+
+        for task_id, edges in zip(task_ids, data['adjacency']):
+            for edge in edges:
+                next_task_id = edge.pop('id')
+                key = edge.pop('key', None)
+                wf_graph._add_edge(task_id, next_task_id, key=key, attrs=edge)
+
+        return wf_graph
+
+    def _get_adjacency(self):
+        if self._adjacency is not None:
+            return self._adjacency
+
+        num_tasks = len(self._tasks)
+        num_edges = len(self._edge_srcs)
+
+        out_offsets = array.array('l', [0] * (num_tasks + 1))
+        in_offsets = array.array('l', [0] * (num_tasks + 1))
+
+        for edge_idx in range(0, num_edges):
+            out_offsets[self._edge_srcs[edge_idx] + 1] += 1
+            in_offsets[self._edge_dsts[edge_idx] + 1] += 1
+
+        for task_idx in range(0, num_tasks):
+            out_offsets[task_idx + 1] += out_offsets[task_idx]
+            in_offsets[task_idx + 1] += in_offsets[task_idx]
+
+        out_edges = array.array('l', [0] * num_edges)
+        in_edges = array.array('l', [0] * num_edges)
+        out_positions = array.array('l', out_offsets[:-1])
+        in_positions = array.array('l', in_offsets[:-1])
+
+        for edge_idx in range(0, num_edges):
+            src, dst = self._edge_srcs[edge_idx], self._edge_dsts[edge_idx]
+            out_edges[out_positions[src]] = edge_idx
+            out_positions[src] += 1
+            in_edges[in_positions[dst]] = edge_idx
+            in_positions[dst] += 1
+
+        # Sort the outbound transitions by the next task and the inbound transitions by the
+        # order the previous task is first connected to the task.
+        def out_sort_key(edge_idx):
+            return (self._tasks[self._edge_dsts[edge_idx]], self._edge_keys[edge_idx])
+
+        def in_sort_key(edge_idx):
+            return (self._edge_pairs[edge_idx], self._edge_keys[edge_idx])
+
+        for task_idx in range(0, num_tasks):
+            start, end = out_offsets[task_idx], out_offsets[task_idx + 1]
+            out_edges[start:end] = array.array('l', sorted(out_edges[start:end], key=out_sort_key))
+            start, end = in_offsets[task_idx], in_offsets[task_idx + 1]
+            in_edges[start:end] = array.array('l', sorted(in_edges[start:end], key=in_sort_key))
+
+        self._adjacency = {
+            'out_offsets': out_offsets,
+            'out_edges': out_edges,
+            'in_offsets': in_offsets,
+            'in_edges': in_edges
+        }
+
+        return self._adjacency
+
+    @staticmethod
+    def _get_outbound_edges(adjacency, task_idx):
+        start = adjacency['out_offsets'][task_idx]
+        end = adjacency['out_offsets'][task_idx + 1]
+
+        return adjacency['out_edges'][start:end]
+
+    @staticmethod
+    def _get_inbound_edges(adjacency, task_idx):
+        start = adjacency['in_offsets'][task_idx]
+        end = adjacency['in_offsets'][task_idx + 1]
+
+        return adjacency['in_edges'][start:end]
+
+    def _get_edge(self, edge_idx):
+        return (
+            self._tasks[self._edge_srcs[edge_idx]],
+            self._tasks[self._edge_dsts[edge_idx]],
+            self._edge_keys[edge_idx],
+            self._edge_attrs[edge_idx]
+        )
+
+    def _get_root_nodes(self, offsets_key):
+        adjacency = self._get_adjacency()
+        offsets = adjacency[offsets_key]
+
+        nodes = [
+            {'id': task_id, 'name': self._task_attrs[task_idx].get('name', task_id)}
+            for task_idx, task_id in enumerate(self._tasks)
+            if offsets[task_idx] == offsets[task_idx + 1]
+        ]
+
+        return sorted(nodes, key=lambda x: x['id'])
+
+    @property
+    def roots(self):
+        return self._get_root_nodes('in_offsets')
+
+    @property
+    def leaves(self):
+        return self._get_root_nodes('out_offsets')
+
+    def has_tasks(self):
+        return len(self._tasks) > 0
+
+    def has_task(self, task_id):
+        return task_id in self._task_idxs
+
+    def get_task(self, task_id):
+        if not self.has_task(task_id):
+            raise exc.InvalidTask(task_id)
+
+        task = {'id': task_id}
+        task.update(copy.deepcopy(self._task_attrs[self._task_idxs[task_id]]))
+
+        return task
+
+    def get_task_attributes(self, attribute):
+        return {
+            task_id: self._task_attrs[task_idx].get(attribute)
+            for task_idx, task_id in enumerate(self._tasks)
+        }
+
+    def add_task(self, task_id, **kwargs):
+        if not self.has_task(task_id):
+            self._task_idxs[task_id] = len(self._tasks)
+            self._tasks.append(task_id)
+            self._task_attrs.append(dict(kwargs))
+            self._adjacency = None
+            self._cycle_idx = None
+        else:
+            self.update_task(task_id, **kwargs)
+
+    def update_task(self, task_id, **kwargs):
+        if not self.has_task(task_id):
+            raise exc.InvalidTask(task_id)
+
+        self._task_attrs[self._task_idxs[task_id]].update(kwargs)
+
+    def _get_transitions(self, source, destination, key=None, **kwargs):
+        if not self.has_task(source) or not self.has_task(destination):
+            return []
+
+        pair = (self._task_idxs[source], self._task_idxs[destination])
+        edges = [self._get_edge(edge_idx) for edge_idx in self._pairs.get(pair, [])]
+
+        if key is not None:
+            return [e for e in edges if e[2] == key]
+
+        for attr, value in six.iteritems(kwargs):
+            edges = [e for e in edges if e[3].get(attr, None) == value]
+
+        return edges
+
+    def get_transition_attributes(self, attribute):
+        return {
+            self._get_edge(edge_idx)[0:3]: attrs[attribute]
+            for edge_idx, attrs in enumerate(self._edge_attrs)
+            if attribute in attrs
+        }
+
+    def _add_edge(self, source, destination, key=None, attrs=None):
+        if not self.has_task(source):
+            self.add_task(source)
+
+        if not self.has_task(destination):
+            self.add_task(destination)
+
+        pair = (self._task_idxs[source], self._task_idxs[destination])
+
+        if pair not in self._pairs:
+            self._pairs[pair] = []
+            self._pair_seqs[pair] = len(self._pair_seqs)
+
+        edge_idxs = self._pairs[pair]
+
+        # Update the attributes of the existing edge like networkx if the key is already used.
+        for edge_idx in edge_idxs:
+            if key is not None and self._edge_keys[edge_idx] == key:
+                self._edge_attrs[edge_idx].update(attrs or {})
+                return
+
+        # Assign the next available key like networkx if the key is not given.
+        if key is None:
+            keys = [self._edge_keys[edge_idx] for edge_idx in edge_idxs]
+            key = len(keys)
+
+            while key in keys:
+                key += 1
+
+        edge_idxs.append(len(self._edge_srcs))
+        self._edge_srcs.append(pair[0])
+        self._edge_dsts.append(pair[1])
+        self._edge_keys.append(key)
+        self._edge_pairs.append(self._pair_seqs[pair])
+        self._edge_attrs.append(attrs or {})
+        self._adjacency = None
+        self._cycle_idx = None
+
+    def add_transition(self, source, destination, **kwargs):
+        # Add attributes only if value is not None.
+        attrs = {}
+
+        for attr, value in six.iteritems(kwargs):
+            if attr is not None:
+                attrs[attr] = value
+
+        key = attrs.pop('key', None)
+        self._add_edge(source, destination, key=key, attrs=attrs)
+
+    def update_transition(self, source, destination, key, **kwargs):
+        seq = self.get_transition(source, destination, key=key)
+        seq[3].update(kwargs)
+
+    def get_next_transitions(self, task_id):
+        if not self.has_task(task_id):
+            return []
+
+        adjacency = self._get_adjacency()
+        edge_idxs = self._get_outbound_edges(adjacency, self._task_idxs[task_id])
+
+        return [self._get_edge(edge_idx) for edge_idx in edge_idxs]
+
+    def get_prev_transitions(self, task_id):
+        if not self.has_task(task_id):
+            return []
+
+        adjacency = self._get_adjacency()
+        edge_idxs = self._get_inbound_edges(adjacency, self._task_idxs[task_id])
+
+        return [self._get_edge(edge_idx) for edge_idx in edge_idxs]
+
+    def _get_strongly_connected_components(self):
+        # Identify the strongly connected components using an iterative version of the
+        # Tarjan's algorithm over the compressed adjacency.
+        adjacency = self._get_adjacency()
+        num_tasks = len(self._tasks)
+        index = array.array('l', [-1] * num_tasks)
+        lowlink = array.array('l', [0] * num_tasks)
+        on_stack = array.array('b', [0] * num_tasks)
+        stack = []
+        components = []
+        counter = 0
+
+        for root in range(0, num_tasks):
+            if index[root] >= 0:
+                continue
+
+            work = [(root, adjacency['out_offsets'][root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+
+            while work:
+                task_idx, pos = work[-1]
+
+                if pos < adjacency['out_offsets'][task_idx + 1]:
+                    work[-1] = (task_idx, pos + 1)
+                    next_task_idx = self._edge_dsts[adjacency['out_edges'][pos]]
+
+                    if index[next_task_idx] < 0:
+                        index[next_task_idx] = lowlink[next_task_idx] = counter
+                        counter += 1
+                        stack.append(next_task_idx)
+                        on_stack[next_task_idx] = 1
+                        work.append((next_task_idx, adjacency['out_offsets'][next_task_idx]))
+                    elif on_stack[next_task_idx]:
+                        lowlink[task_idx] = min(lowlink[task_idx], index[next_task_idx])
+
+                    continue
+
+                work.pop()
+
+                if work:
+                    parent_idx = work[-1][0]
+                    lowlink[parent_idx] = min(lowlink[parent_idx], lowlink[task_idx])
+
+                if lowlink[task_idx] == index[task_idx]:
+                    component = []
+
+                    while True:
+                        member_idx = stack.pop()
+                        on_stack[member_idx] = 0
+                        component.append(member_idx)
+
+                        if member_idx == task_idx:
+                            break
+
+                    components.append([self._tasks[i] for i in component])
+
+        return components
+
+    def _find_cycle(self, task_ids):
+        # Walk the transitions within the tasks from the first task until a
+        # task is revisited and return the transitions that make up the cycle.
+        adjacency = self._get_adjacency()
+        members = set(self._task_idxs[task_id] for task_id in task_ids)
+        task_idx = self._task_idxs[min(task_ids)]
+        visited = {}
+        route = []
+
+        while task_idx not in visited:
+            visited[task_idx] = len(route)
+
+            for edge_idx in self._get_outbound_edges(adjacency, task_idx):
+                if self._edge_dsts[edge_idx] in members:
+                    route.append(self._get_edge(edge_idx)[0:3])
+                    task_idx = self._edge_dsts[edge_idx]
+                    break
+
+        return route[visited[task_idx]:]
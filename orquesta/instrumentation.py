@@ -0,0 +1,150 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import logging
+import threading
+import time
+
+from orquesta import constants
+
+
+LOG = logging.getLogger(__name__)
+
+COMPOSE = 'compose'
+RENDER_WORKFLOW_INPUT = 'render_workflow_input'
+GET_TASK = 'get_task'
+PROCESS_TASK_EVENT = 'process_task_event'
+EVALUATE_TRANSITION = 'evaluate_transition'
+FINALIZE_CONTEXT = 'finalize_context'
+PROCESS_WORKFLOW_EVENT = 'process_workflow_event'
+RENDER_WORKFLOW_OUTPUT = 'render_workflow_output'
+SERIALIZE = 'serialize'
+DESERIALIZE = 'deserialize'
+
+PHASES = [
+    COMPOSE,
+    RENDER_WORKFLOW_INPUT,
+    GET_TASK,
+    PROCESS_TASK_EVENT,
+    EVALUATE_TRANSITION,
+    FINALIZE_CONTEXT,
+    PROCESS_WORKFLOW_EVENT,
+    RENDER_WORKFLOW_OUTPUT,
+    SERIALIZE,
+    DESERIALIZE
+]
+
+
+class _NullMeasurement(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_MEASUREMENT = _NullMeasurement()
+
+
+class Instrument(object):
+    # The conductor measures each phase of the workflow with the instrument. The measure
+    # method returns a context manager that wraps the phase. This default does nothing and
+    # returns the same context manager every time so there is no cost other than the call.
+
+    def measure(self, phase, task_id=None, route=None):
+        return _NULL_MEASUREMENT
+
+
+NULL_INSTRUMENT = Instrument()
+
+
+class _Measurement(object):
+
+    def __init__(self, instrument, phase, task_id=None, route=None):
+        self.instrument = instrument
+        self.phase = phase
+        self.task_id = task_id
+        self.route = route
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.time() - self.start
+        self.instrument.record(self.phase, duration, task_id=self.task_id, route=self.route)
+
+        return False
+
+
+def _add_timing(timings, phase, duration):
+    if phase not in timings:
+        timings[phase] = {'count': 0, 'time': 0.0, 'min': duration, 'max': duration}
+
+    timing = timings[phase]
+    timing['count'] += 1
+    timing['time'] += duration
+    timing['min'] = min(timing['min'], duration)
+    timing['max'] = max(timing['max'], duration)
+
+
+class PhaseTimer(Instrument):
+    # Aggregate the count and time of each phase for the workflow as a whole and for each
+    # task. The phases of a task are keyed by the task id and route of the task. The timer
+    # can be shared by conductors and used from multiple threads. Override the record
+    # method to send the timings somewhere else such as to a metrics system.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._tasks = {}
+
+    def measure(self, phase, task_id=None, route=None):
+        return _Measurement(self, phase, task_id=task_id, route=route)
+
+    def record(self, phase, duration, task_id=None, route=None):
+        with self._lock:
+            _add_timing(self._phases, phase, duration)
+
+            if task_id is not None:
+                task_key = constants.TASK_STATE_ROUTE_FORMAT % (task_id, str(route))
+                _add_timing(self._tasks.setdefault(task_key, {}), phase, duration)
+
+    def get_phase_stats(self):
+        with self._lock:
+            return copy.deepcopy(self._phases)
+
+    def get_task_stats(self, task_id=None, route=None):
+        with self._lock:
+            if task_id is None:
+                return copy.deepcopy(self._tasks)
+
+            task_key = constants.TASK_STATE_ROUTE_FORMAT % (task_id, str(route or 0))
+
+            return copy.deepcopy(self._tasks.get(task_key, {}))
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'phases': copy.deepcopy(self._phases),
+                'tasks': copy.deepcopy(self._tasks)
+            }
+
+    def reset(self):
+        with self._lock:
+            self._phases = {}
+            self._tasks = {}
@@ -14,6 +14,7 @@
 
 import copy
 import logging
+import six
 
 from orquesta import events
 from orquesta import exceptions as exc
@@ -442,8 +443,23 @@ TASK_STATE_MACHINE_DATA = {
 }
 
 
+def _has_items_status(items_status, include=None, exclude=None):
+    return any(
+        count > 0 for status, count in six.iteritems(items_status)
+        if (include is None or status in include) and (exclude is None or status not in exclude)
+    )
+
+
 class TaskStateMachine(object):
 
+    @classmethod
+    def _set_task_status(cls, workflow_state, task_state, status):
+        # Let the workflow state keep its index of task statuses up to date.
+        if workflow_state is not None:
+            workflow_state.update_task_status(task_state, status)
+        else:
+            task_state['status'] = status
+
     @classmethod
     def is_transition_valid(cls, old_status, new_status):
         if old_status is None:
@@ -483,18 +499,18 @@ class TaskStateMachine(object):
 
         if (ac_ex_event.status in requirements and
                 ac_ex_event.context and 'item_id' in ac_ex_event.context):
-            # Make a copy of the items and remove current item under evaluation.
+            # Copy the count of items by status and remove current item under evaluation.
             staged_task = workflow_state.get_staged_task(task_id, task_route)
-            items = copy.deepcopy(staged_task['items'])
-            del items[ac_ex_event.context['item_id']]
-            items_status = [item['status'] for item in items]
+            items_status = workflow_state.get_staged_task_items_status(task_id, task_route)
+            items_status = copy.copy(items_status)
+            items_status[staged_task['items'][ac_ex_event.context['item_id']]['status']] -= 1
 
             # Assess various situations.
-            active = list(filter(lambda x: x in statuses.ACTIVE_STATUSES, items_status))
-            incomplete = list(filter(lambda x: x not in statuses.COMPLETED_STATUSES, items_status))
-            paused = list(filter(lambda x: x in [statuses.PENDING, statuses.PAUSED], items_status))
-            canceled = list(filter(lambda x: x == statuses.CANCELED, items_status))
-            failed = list(filter(lambda x: x in statuses.ABENDED_STATUSES, items_status))
+            active = _has_items_status(items_status, statuses.ACTIVE_STATUSES)
+            incomplete = _has_items_status(items_status, exclude=statuses.COMPLETED_STATUSES)
+            paused = _has_items_status(items_status, [statuses.PENDING, statuses.PAUSED])
+            canceled = _has_items_status(items_status, [statuses.CANCELED])
+            failed = _has_items_status(items_status, statuses.ABENDED_STATUSES)
 
             # Attach info on whether task is still active or dormant.
             action_event += '_task_active' if active else '_task_dormant'
@@ -550,7 +566,7 @@ class TaskStateMachine(object):
         new_task_status = TASK_STATE_MACHINE_DATA[current_task_status][event_name]
 
         # Assign new status to the task flow entry.
-        task_state['status'] = new_task_status
+        cls._set_task_status(workflow_state, task_state, new_task_status)
 
     @classmethod
     def add_context_to_workflow_event(cls, workflow_state, task_id, task_route, wf_ex_event):
@@ -559,9 +575,9 @@ class TaskStateMachine(object):
         staged_task = workflow_state.get_staged_task(task_id, task_route)
 
         if wf_ex_event.status in requirements and staged_task and 'items' in staged_task:
-            items_status = [item['status'] for item in staged_task['items']]
-            active = list(filter(lambda x: x in statuses.ACTIVE_STATUSES, items_status))
-            incomplete = list(filter(lambda x: x not in statuses.COMPLETED_STATUSES, items_status))
+            items_status = workflow_state.get_staged_task_items_status(task_id, task_route)
+            active = _has_items_status(items_status, statuses.ACTIVE_STATUSES)
+            incomplete = _has_items_status(items_status, exclude=statuses.COMPLETED_STATUSES)
             workflow_event += '_task_active' if active else '_task_dormant'
             workflow_event += '_items_incomplete' if incomplete else '_items_completed'
 
@@ -600,7 +616,7 @@ class TaskStateMachine(object):
         new_task_status = TASK_STATE_MACHINE_DATA[current_task_status][event_name]
 
         # Assign new status to the task flow entry.
-        task_state['status'] = new_task_status
+        cls._set_task_status(workflow_state, task_state, new_task_status)
 
     @classmethod
     def process_event(cls, workflow_state, task_state, event):
@@ -0,0 +1,158 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+
+from orquesta import graphing
+from orquesta.utils import cache as cache_util
+
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PLAN_CACHE_SIZE = 128
+
+_PLAN_CACHE = None
+
+
+def get_digest(data):
+    data = json.dumps(data, sort_keys=True, default=str)
+
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class WorkflowPlan(object):
+
+    def __init__(self, spec, graph):
+        # The plan is the composed graph with the lookups that are used repeatedly by the
+        # conductor computed ahead of time. The plan is shared by conductors for the same
+        # workflow definition and so it must be treated as read only.
+        self.graph = graph
+        self.graph_digest = get_digest(graph.serialize())
+
+        self._spec = spec
+        self._next_transitions = {}
+        self._prev_transitions = {}
+        self._barriers = graph.get_task_attributes('barrier')
+        self._splits = {}
+        self._cycles = {}
+
+        for task_id in self._barriers.keys():
+            self._next_transitions[task_id] = graph.get_next_transitions(task_id)
+            self._prev_transitions[task_id] = graph.get_prev_transitions(task_id)
+            self._cycles[task_id] = len(graph.in_cycle(task_id)) > 0
+
+            # The split flag is determined from the spec.
+            self._splits[task_id] = spec.tasks.is_split_task(task_id)
+
+    def has_task(self, task_id):
+        return task_id in self._next_transitions
+
+    def get_next_transitions(self, task_id):
+        if task_id not in self._next_transitions:
+            return self.graph.get_next_transitions(task_id)
+
+        return self._next_transitions[task_id]
+
+    def get_prev_transitions(self, task_id):
+        if task_id not in self._prev_transitions:
+            return self.graph.get_prev_transitions(task_id)
+
+        return self._prev_transitions[task_id]
+
+    def get_barrier(self, task_id):
+        if task_id not in self._barriers:
+            return self.graph.get_barrier(task_id)
+
+        return self._barriers[task_id]
+
+    def has_barrier(self, task_id):
+        b = self.get_barrier(task_id)
+
+        return (b is not None and b != '')
+
+    def is_split_task(self, task_id):
+        if task_id not in self._splits:
+            return self._spec.tasks.is_split_task(task_id)
+
+        return self._splits[task_id]
+
+    def in_cycle(self, task_id):
+        if task_id not in self._cycles:
+            return len(self.graph.in_cycle(task_id)) > 0
+
+        return self._cycles[task_id]
+
+
+class WorkflowPlanCache(cache_util.LRUCache):
+
+    def __init__(self, size=DEFAULT_PLAN_CACHE_SIZE):
+        super(WorkflowPlanCache, self).__init__(size)
+
+    def get(self, key, graph_digest=None):
+        # If a graph digest is given, the cached plan must be compiled from the same graph.
+        return super(WorkflowPlanCache, self).get(
+            key,
+            match=lambda plan: graph_digest is None or plan.graph_digest == graph_digest
+        )
+
+
+def get_plan_cache():
+    global _PLAN_CACHE
+
+    if _PLAN_CACHE is None:
+        _PLAN_CACHE = WorkflowPlanCache()
+
+    return _PLAN_CACHE
+
+
+def get_plan(spec, composer=None, graph=None, graph_data=None, spec_data=None,
+             graph_backend=None):
+    # Get the compiled plan for the workflow spec from the cache. If a graph or serialized graph
+    # is given, such as when a conductor is restored, the cached plan is only used if the graph
+    # is the same. Otherwise, the plan is compiled from the given graph or composed from the spec.
+    # The spec can be given as a callable along with the serialized spec so the spec is only
+    # instantiated if the plan needs to be compiled.
+    cache = get_plan_cache()
+
+    if spec_data is None:
+        spec = spec() if callable(spec) else spec
+        spec_data = spec.serialize()
+
+    graph_backend = graph_backend or graphing.DEFAULT_GRAPH_BACKEND
+    key = (graph_backend, get_digest(spec_data))
+
+    if graph is not None and graph_data is None:
+        graph_data = graph.serialize()
+
+    graph_digest = get_digest(graph_data) if graph_data is not None else None
+    plan = cache.get(key, graph_digest=graph_digest)
+
+    if plan is not None:
+        return plan
+
+    if callable(spec):
+        spec = spec()
+
+    if graph is None and graph_data is not None:
+        graph = graphing.get_graph_backend(graph_backend).deserialize(graph_data)
+
+    if graph is None:
+        graph = composer.compose(spec, graph_backend=graph_backend)
+
+    plan = WorkflowPlan(spec, graph)
+    cache.put(key, plan)
+
+    return plan
@@ -0,0 +1,144 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import copy
+import json
+import logging
+import os
+import six
+import threading
+import uuid
+
+from orquesta import exceptions as exc
+from orquesta.utils import files as file_util
+
+
+LOG = logging.getLogger(__name__)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class ResultStore(object):
+    # A store for the results of task items that are kept out of the workflow state. The
+    # staged task only keeps the reference returned by put and the result is retrieved
+    # by the reference when the result of the task is evaluated.
+
+    @staticmethod
+    def make_ref():
+        return uuid.uuid4().hex
+
+    @abc.abstractmethod
+    def put(self, value):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get(self, ref):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def delete(self, ref):
+        raise NotImplementedError()
+
+
+class MemoryResultStore(ResultStore):
+
+    def __init__(self):
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def put(self, value):
+        ref = self.make_ref()
+
+        with self._lock:
+            self._results[ref] = copy.deepcopy(value)
+
+        return ref
+
+    def get(self, ref):
+        with self._lock:
+            if ref not in self._results:
+                raise exc.ResultNotFound(ref)
+
+            return copy.deepcopy(self._results[ref])
+
+    def delete(self, ref):
+        with self._lock:
+            self._results.pop(ref, None)
+
+
+class FileSystemResultStore(ResultStore):
+
+    def __init__(self, path):
+        self.path = path
+        file_util.make_dirs(self.path)
+
+    def __len__(self):
+        return len([f for f in os.listdir(self.path) if f.endswith('.json')])
+
+    def _get_file_path(self, ref):
+        return os.path.join(self.path, '%s.json' % ref)
+
+    def put(self, value):
+        ref = self.make_ref()
+        file_util.write(self._get_file_path(ref), json.dumps(value))
+
+        return ref
+
+    def get(self, ref):
+        data = file_util.read(self._get_file_path(ref))
+
+        if data is None:
+            raise exc.ResultNotFound(ref)
+
+        return json.loads(data)
+
+    def delete(self, ref):
+        file_util.remove(self._get_file_path(ref))
+
+
+class ItemResults(object):
+    # The list of item results for a task with items. The results that are kept in the
+    # result store are only retrieved when the list is resolved, which is when the result
+    # of the task is evaluated. Copies of the expression context share the same instance.
+
+    def __init__(self, items, result_store=None):
+        self._items = list(items)
+        self._result_store = result_store
+        self._results = None
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_refs(self):
+        return [item['result_ref'] for item in self._items if 'result_ref' in item]
+
+    def resolve(self):
+        if self._results is None:
+            self._results = [
+                self._result_store.get(item['result_ref']) if 'result_ref' in item
+                else item.get('result')
+                for item in self._items
+            ]
+
+        return self._results
+
+
+def resolve(value):
+    return value.resolve() if isinstance(value, ItemResults) else value
@@ -0,0 +1,212 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import statuses
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _execute_action(func, action_input, delay=None):
+    # Run the action on behalf of the runner in an executor. The error is the result
+    # of the action if the action fails.
+    if delay:
+        time.sleep(delay)
+
+    start = time.time()
+    result, error = conducting._call_in_executor(func, kwargs=action_input)
+
+    if error is not None:
+        return statuses.FAILED, {'error': error}, time.time() - start
+
+    return statuses.SUCCEEDED, result, time.time() - start
+
+
+class _CompletedAction(object):
+    # Stand in for the future of an action that is run without an executor.
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
+class WorkflowRunner(object):
+    # Run a workflow end to end locally. The actions are python callables looked up by the
+    # action name of the task and called with the rendered input as keyword arguments. The
+    # actions are run in the given executor, which can be a thread or process pool from
+    # concurrent.futures. The actions must be defined at the module level to be run in a
+    # process pool. If no executor is given, the actions are run in the calling thread.
+    # The conductor is only used from the calling thread. The runner keeps stats on the
+    # run so the overhead of the conductor can be measured separately from the actions.
+
+    def __init__(self, spec, actions, executor=None, inputs=None, context=None,
+                 render_executor=None, **kwargs):
+        if executor is not None and futures is None:
+            raise ImportError('The concurrent.futures module is required to use an executor.')
+
+        self.spec = spec
+        self.actions = actions or {}
+        self.executor = executor
+        self.render_executor = render_executor
+        self.conductor = conducting.WorkflowConductor(
+            spec,
+            inputs=inputs,
+            context=context,
+            **kwargs
+        )
+
+        self.stats = {
+            'tasks': 0,
+            'actions': 0,
+            'elapsed': 0.0,
+            'action_time': 0.0,
+            'conductor_time': 0.0,
+            'calls': {}
+        }
+
+    def _call(self, func, *args, **kwargs):
+        start = time.time()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.time() - start
+            call_stats = self.stats['calls'].setdefault(func.__name__, {'count': 0, 'time': 0.0})
+            call_stats['count'] += 1
+            call_stats['time'] += duration
+            self.stats['conductor_time'] += duration
+
+    def _update_task_state(self, task_id, route, status, result=None, item_id=None):
+        context = {'item_id': item_id} if item_id is not None else None
+        ac_ex_event = events.ActionExecutionEvent(status, result=result, context=context)
+        self._call(self.conductor.update_task_state, task_id, route, ac_ex_event)
+
+    def _submit(self, func, action_input, delay=None):
+        if self.executor is None:
+            return _CompletedAction(_execute_action(func, action_input, delay=delay))
+
+        return self.executor.submit(_execute_action, func, action_input, delay)
+
+    def _run_task(self, task, pending):
+        task_id = task['id']
+        route = task['route']
+        delay = task.get('delay')
+
+        self.stats['tasks'] += 1
+
+        # A task with an empty list of items is completed without running any action.
+        if 'items_count' in task and task['items_count'] == 0:
+            self._update_task_state(task_id, route, statuses.RUNNING)
+            self._update_task_state(task_id, route, statuses.SUCCEEDED, [])
+            return
+
+        for action in task['actions']:
+            item_id = action.get('item_id')
+
+            self._update_task_state(task_id, route, statuses.RUNNING, item_id=item_id)
+
+            # A task with no action is completed without running any action.
+            if action['action'] is None:
+                self._update_task_state(task_id, route, statuses.SUCCEEDED, item_id=item_id)
+                continue
+
+            func = self.actions.get(action['action'])
+
+            if func is None:
+                result = {'error': 'The action "%s" is not found.' % action['action']}
+                self._update_task_state(task_id, route, statuses.FAILED, result, item_id)
+                continue
+
+            future = self._submit(func, action['input'], delay=delay)
+            pending[future] = (task_id, route, item_id)
+
+    def _complete_action(self, future, task_id, route, item_id):
+        status, result, duration = future.result()
+
+        self.stats['actions'] += 1
+        self.stats['action_time'] += duration
+
+        self._update_task_state(task_id, route, status, result, item_id)
+
+    def _wait(self, pending):
+        if self.executor is None:
+            return list(pending.keys())
+
+        done, _ = futures.wait(list(pending.keys()), return_when=futures.FIRST_COMPLETED)
+
+        return done
+
+    def run(self):
+        start = time.time()
+        pending = {}
+
+        try:
+            self._call(self.conductor.request_workflow_status, statuses.RUNNING)
+
+            # Run the next tasks and feed the results of the actions to the conductor as the
+            # actions complete until there is no more task to run and no action running.
+            while True:
+                next_tasks = self._call(
+                    self.conductor.get_next_tasks,
+                    executor=self.render_executor
+                )
+
+                for task in next_tasks:
+                    self._run_task(task, pending)
+
+                if not pending:
+                    if not next_tasks:
+                        break
+
+                    continue
+
+                for future in self._wait(pending):
+                    task_id, route, item_id = pending.pop(future)
+                    self._complete_action(future, task_id, route, item_id)
+        finally:
+            self.stats['elapsed'] += time.time() - start
+
+        return self.conductor.get_workflow_status()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['calls'] = {k: dict(v) for k, v in self.stats['calls'].items()}
+        elapsed = stats['elapsed']
+        actions = stats['actions']
+
+        stats['throughput'] = actions / elapsed if elapsed > 0 else 0.0
+        stats['conductor_time_per_action'] = stats['conductor_time'] / actions if actions else 0.0
+
+        return stats
+
+
+def run(spec, actions, executor=None, inputs=None, **kwargs):
+    runner = WorkflowRunner(spec, actions, executor=executor, inputs=inputs, **kwargs)
+    status = runner.run()
+
+    LOG.info('Workflow completed with status "%s": %s', status, runner.get_stats())
+
+    return runner
@@ -23,7 +23,7 @@ from orquesta.expressions import base as expr_base
 from orquesta.specs.mistral.v2 import base as mistral_spec_base
 from orquesta.specs.mistral.v2 import policies as policy_models
 from orquesta.specs import types as spec_types
-from orquesta.utils import dictionary as dict_util
+from orquesta.utils import context as ctx_util
 
 
 LOG = logging.getLogger(__name__)
@@ -142,6 +142,9 @@ class TaskSpec(mistral_spec_base.Spec):
     def has_join(self):
         return hasattr(self, 'join') and self.join
 
+    def get_items(self, in_ctx):
+        raise NotImplementedError('Task with items is not implemented.')
+
     def render(self, in_ctx):
         action_specs = []
 
@@ -176,7 +179,7 @@ class TaskSpec(mistral_spec_base.Spec):
         except exc.ExpressionEvaluationException as e:
             errors.append(str(e))
 
-        out_ctx = dict_util.merge_dicts(in_ctx, new_ctx, overwrite=True)
+        out_ctx = ctx_util.LayeredContext([in_ctx, new_ctx]).to_dict()
 
         for key in list(out_ctx.keys()):
             if key.startswith('__'):
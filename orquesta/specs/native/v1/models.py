@@ -24,7 +24,6 @@ from orquesta.expressions import base as expr_base
 from orquesta.specs.native.v1 import base as native_v1_specs
 from orquesta.specs import types as spec_types
 from orquesta.utils import context as ctx_util
-from orquesta.utils import dictionary as dict_util
 from orquesta.utils import parameters as args_util
 
 
@@ -171,6 +170,48 @@ class TaskSpec(native_v1_specs.Spec):
     def has_join(self):
         return hasattr(self, 'join') and self.join
 
+    def get_items(self, in_ctx):
+        items_spec = self.get_items_spec()
+
+        items_expr = (
+            items_spec.items.strip() if ' in ' not in items_spec.items
+            else items_spec.items[items_spec.items.index(' in ') + 4:].strip()
+        )
+
+        items = expr_base.evaluate(items_expr, in_ctx)
+
+        if not isinstance(items, list):
+            raise TypeError('The value of "%s" is not type of list.' % items_expr)
+
+        item_keys = (
+            None if ' in ' not in items_spec.items
+            else items_spec.items[:items_spec.items.index(' in ')].replace(' ', '').split(',')
+        )
+
+        if not item_keys:
+            return items
+
+        keyed_items = []
+
+        for item in items:
+            if isinstance(item, tuple) or isinstance(item, list):
+                item = dict(zip(item_keys, list(item)))
+            elif len(item_keys) == 1:
+                item = {item_keys[0]: item}
+
+            keyed_items.append(item)
+
+        return keyed_items
+
+    def render_item(self, in_ctx, item_id, item):
+        item_ctx_value = ctx_util.set_current_item(in_ctx, item)
+
+        return {
+            'action': expr_base.evaluate(self.action, item_ctx_value),
+            'input': expr_base.evaluate(getattr(self, 'input', {}), item_ctx_value),
+            'item_id': item_id
+        }
+
     def render(self, in_ctx):
         action_specs = []
 
@@ -182,43 +223,13 @@ class TaskSpec(native_v1_specs.Spec):
 
             action_specs.append(action_spec)
         else:
-            items_spec = self.get_items_spec()
-
-            items_expr = (
-                items_spec.items.strip() if ' in ' not in items_spec.items
-                else items_spec.items[items_spec.items.index(' in ') + 4:].strip()
-            )
-
-            items = expr_base.evaluate(items_expr, in_ctx)
-
-            if not isinstance(items, list):
-                raise TypeError('The value of "%s" is not type of list.' % items_expr)
-
-            item_keys = (
-                None if ' in ' not in items_spec.items
-                else items_spec.items[:items_spec.items.index(' in ')].replace(' ', '').split(',')
-            )
-
-            for idict_util, item in enumerate(items):
-                if item_keys and (isinstance(item, tuple) or isinstance(item, list)):
-                    item = dict(zip(item_keys, list(item)))
-                elif item_keys and len(item_keys) == 1:
-                    item = {item_keys[0]: item}
-
-                item_ctx_value = ctx_util.set_current_item(in_ctx, item)
-
-                action_spec = {
-                    'action': expr_base.evaluate(self.action, item_ctx_value),
-                    'input': expr_base.evaluate(getattr(self, 'input', {}), item_ctx_value),
-                    'item_id': idict_util
-                }
-
-                action_specs.append(action_spec)
+            for item_id, item in enumerate(self.get_items(in_ctx)):
+                action_specs.append(self.render_item(in_ctx, item_id, item))
 
         return self, action_specs
 
     def finalize_context(self, next_task_name, task_transition_meta, in_ctx):
-        rolling_ctx = copy.deepcopy(in_ctx)
+        rolling_ctx = copy.copy(in_ctx)
         new_ctx = {}
         errors = []
 
@@ -238,7 +249,7 @@ class TaskSpec(native_v1_specs.Spec):
                 except exc.ExpressionEvaluationException as e:
                     errors.append(e)
 
-        out_ctx = dict_util.merge_dicts(in_ctx, new_ctx, overwrite=True)
+        out_ctx = ctx_util.LayeredContext([in_ctx, new_ctx]).to_dict()
 
         for key in list(out_ctx.keys()):
             if key.startswith('__'):
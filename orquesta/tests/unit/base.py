@@ -14,6 +14,7 @@
 
 import abc
 import copy
+import json
 import six
 from six.moves import queue
 import unittest
@@ -226,7 +227,8 @@ class WorkflowConductorTest(WorkflowComposerTest):
     def assert_conducting_sequences(self, wf_name, expected_task_seq, expected_routes=None,
                                     inputs=None, mock_statuses=None, mock_results=None,
                                     expected_workflow_status=None, expected_output=None,
-                                    expected_term_tasks=None):
+                                    expected_term_tasks=None, graph_backend=None, executor=None,
+                                    batch_events=False, persist_patches=False):
 
         if not expected_routes:
             expected_routes = [[]]
@@ -236,9 +238,32 @@ class WorkflowConductorTest(WorkflowComposerTest):
 
         wf_def = self.get_wf_def(wf_name)
         wf_spec = self.spec_module.instantiate(wf_def)
-        conductor = conducting.WorkflowConductor(wf_spec, inputs=inputs)
+        conductor = conducting.WorkflowConductor(
+            wf_spec,
+            inputs=inputs,
+            graph_backend=graph_backend
+        )
+
         conductor.request_workflow_status(statuses.RUNNING)
 
+        # If the changes are persisted as patches, then the full document is persisted once
+        # and the patches are applied to the persisted conductor.
+        persisted = None
+
+        if persist_patches:
+            persisted = conducting.WorkflowConductor.deserialize(conductor.serialize())
+            conductor.checkpoint()
+
+        def persist(conductor):
+            if not persist_patches:
+                return conductor.serialize()
+
+            # Mock persistence of the patch by round tripping it thru JSON.
+            persisted.apply_patch(json.loads(json.dumps(conductor.serialize_patch())))
+            self.assertDictEqual(persisted.serialize(), conductor.serialize())
+
+            return persisted.serialize()
+
         run_q = queue.Queue()
         status_q = queue.Queue()
         result_q = queue.Queue()
@@ -252,40 +277,53 @@ class WorkflowConductorTest(WorkflowComposerTest):
                 result_q.put(item)
 
         # Get start tasks and being conducting workflow.
-        for task in conductor.get_next_tasks():
+        for task in conductor.get_next_tasks(executor=executor):
             run_q.put(task)
 
         # Serialize workflow conductor to mock async execution.
-        wf_conducting_state = conductor.serialize()
+        wf_conducting_state = persist(conductor)
 
         # Process until there are not more tasks in queue.
         while not run_q.empty():
             # Deserialize workflow conductor to mock async execution.
             conductor = conducting.WorkflowConductor.deserialize(wf_conducting_state)
 
+            task_events = []
+
             # Process all the tasks in the run queue.
             while not run_q.empty():
                 current_task = run_q.get()
                 current_task_id = current_task['id']
                 current_task_route = current_task['route']
 
-                # Set task status to running.
-                ac_ex_event = events.ActionExecutionEvent(statuses.RUNNING)
-                conductor.update_task_state(current_task_id, current_task_route, ac_ex_event)
-
                 # Mock completion of the task.
                 status = status_q.get() if not status_q.empty() else statuses.SUCCEEDED
                 result = result_q.get() if not result_q.empty() else None
 
-                ac_ex_event = events.ActionExecutionEvent(status, result=result)
-                conductor.update_task_state(current_task_id, current_task_route, ac_ex_event)
+                # Set task status to running and then to completion for each item of the task.
+                for action in current_task.get('actions') or [{}]:
+                    ctx = {'item_id': action['item_id']} if 'item_id' in action else None
+
+                    for ac_ex_event in [
+                        events.ActionExecutionEvent(statuses.RUNNING, context=ctx),
+                        events.ActionExecutionEvent(status, result=result, context=ctx)
+                    ]:
+                        task_events.append((current_task_id, current_task_route, ac_ex_event))
+
+            # Process the events one at a time or all at once in a batch.
+            if batch_events:
+                task_state_entries = conductor.update_task_states(task_events)
+                self.assertEqual(len(task_state_entries), len(task_events))
+            else:
+                for task_id, route, ac_ex_event in task_events:
+                    conductor.update_task_state(task_id, route, ac_ex_event)
 
             # Identify the next set of tasks.
-            for next_task in conductor.get_next_tasks():
+            for next_task in conductor.get_next_tasks(executor=executor):
                 run_q.put(next_task)
 
             # Serialize workflow execution graph to mock async execution.
-            wf_conducting_state = conductor.serialize()
+            wf_conducting_state = persist(conductor)
 
         actual_task_seq = [
             (entry['id'], entry['route'])
@@ -318,6 +356,8 @@ class WorkflowConductorTest(WorkflowComposerTest):
             actual_term_tasks = [(task['id'], task['route']) for task in term_tasks]
             self.assertListEqual(actual_term_tasks, expected_term_tasks)
 
+        return conductor
+
     def assert_workflow_status(self, wf_name, mock_flow, expected_wf_statuses, conductor=None):
         if not conductor:
             wf_def = self.get_wf_def(wf_name)
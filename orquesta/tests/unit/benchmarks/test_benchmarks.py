@@ -0,0 +1,91 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from orquesta.benchmarks import __main__ as benchmarks
+from orquesta.benchmarks import conducting
+from orquesta.benchmarks import expressions
+from orquesta.benchmarks import graphing
+from orquesta.specs import native as native_specs
+
+
+class BenchmarkSuiteTest(unittest.TestCase):
+
+    def test_conducting_series(self):
+        for name, (make_wf_def, _) in sorted(conducting.SERIES.items()):
+            wf_def, inputs = make_wf_def(3)
+            wf_spec = native_specs.WorkflowSpec(wf_def)
+            self.assertDictEqual(wf_spec.inspect(), {}, name)
+
+            # The run raises an exception if the workflow does not succeed.
+            conducting.run_workflow(wf_spec, inputs)
+
+    def test_conducting_results(self):
+        results = conducting.run(['chain', 'join'], sizes=[2, 3], repeat=1)
+
+        benchmarks = [
+            'conducting.compose',
+            'conducting.deserialize',
+            'conducting.get_next_tasks',
+            'conducting.run',
+            'conducting.serialize',
+            'conducting.spec',
+            'conducting.update_task_state'
+        ]
+
+        self.assertEqual(len(results), 2 * 2 * len(benchmarks))
+        self.assertListEqual(sorted(set(r['benchmark'] for r in results)), benchmarks)
+
+        for result in results:
+            self.assertIn(result['series'], ['chain', 'join'])
+            self.assertIn(result['size'], [2, 3])
+            self.assertGreaterEqual(result['max'], result['min'])
+            json.dumps(result)
+
+    def test_expressions_results(self):
+        results = expressions.run(['jinja', 'yaql'], [2], repeat=1, number=1)
+
+        self.assertEqual(len(results), 2 * 4 * 2)
+
+        for result in results:
+            self.assertIn(result['benchmark'], ['expressions.evaluate', 'expressions.validate'])
+            self.assertGreaterEqual(result['max'], result['min'])
+
+    def test_main_output(self):
+        path = tempfile.mkdtemp()
+
+        try:
+            output = os.path.join(path, 'results.json')
+            suites = {'graphing': lambda repeat: graphing.run(['compact'], [5], repeat)}
+
+            with mock.patch.dict(benchmarks.SUITES, suites):
+                self.assertEqual(benchmarks.main(['--suite', 'graphing', '--output', output]), 0)
+
+            with open(output, 'r') as f:
+                report = json.load(f)
+        finally:
+            shutil.rmtree(path)
+
+        self.assertIn('version', report)
+        self.assertIn('python', report)
+        self.assertGreater(len(report['results']), 0)
+
+        for result in report['results']:
+            self.assertTrue(result['benchmark'].startswith('graphing.'))
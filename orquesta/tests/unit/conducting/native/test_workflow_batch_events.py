@@ -0,0 +1,184 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import exceptions as exc
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit.conducting.native import base
+
+
+class WorkflowConductorBatchEventsTest(base.OrchestraWorkflowConductorTest):
+
+    def test_sequential(self):
+        self.assert_conducting_sequences(
+            'sequential',
+            ['task1', 'task2', 'task3', 'noop'],
+            inputs={'name': 'Stanley'},
+            mock_results=['Stanley', 'foobar', 'Stanley, foobar'],
+            expected_output={'greeting': 'Stanley, foobar'},
+            batch_events=True
+        )
+
+    def test_splits(self):
+        expected_routes = [
+            [],
+            ['task1__t0'],
+            ['task2__t0'],
+            ['task3__t0'],
+            ['task2__t0', 'task7__t0'],
+            ['task3__t0', 'task7__t0']
+        ]
+
+        expected_task_seq = [
+            ('task1', 0),
+            ('task2', 0),
+            ('task3', 0),
+            ('task8', 1),
+            ('task4', 2),
+            ('task4', 3),
+            ('task5', 2),
+            ('task5', 3),
+            ('task6', 2),
+            ('task6', 3),
+            ('task7', 2),
+            ('task7', 3),
+            ('task8', 4),
+            ('task8', 5)
+        ]
+
+        self.assert_conducting_sequences(
+            'splits',
+            expected_task_seq,
+            expected_routes=expected_routes,
+            batch_events=True
+        )
+
+    def test_join(self):
+        self.assert_conducting_sequences(
+            'join',
+            ['task1', 'task2', 'task4', 'task3', 'task5', 'task6', 'task7'],
+            batch_events=True
+        )
+
+    def test_error_handling(self):
+        self.assert_conducting_sequences(
+            'error-handling',
+            ['task1', 'task3'],
+            mock_statuses=[statuses.FAILED],
+            batch_events=True
+        )
+
+    def test_error_log_fail(self):
+        self.assert_conducting_sequences(
+            'error-log-fail',
+            ['task1', 'log', 'fail'],
+            mock_statuses=[statuses.FAILED],
+            expected_workflow_status=statuses.FAILED,
+            batch_events=True
+        )
+
+    def test_with_items_concurrency(self):
+        self.assert_conducting_sequences(
+            'with-items-concurrency',
+            ['task1'],
+            inputs={'members': ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew']},
+            batch_events=True
+        )
+
+    def test_empty_batch(self):
+        wf_def = self.get_wf_def('sequential')
+        wf_spec = self.spec_module.instantiate(wf_def)
+        conductor = conducting.WorkflowConductor(wf_spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        expected = conductor.serialize()
+
+        self.assertListEqual(conductor.update_task_states([]), [])
+        self.assertDictEqual(conductor.serialize(), expected)
+
+    def _prep_output_error_conductors(self):
+        wf_def = """
+        version: 1.0
+
+        output:
+          - x: <% result().foobar %>
+
+        tasks:
+          task1:
+            action: core.noop
+          task2:
+            action: core.noop
+        """
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+        conductors = []
+
+        for i in range(0, 2):
+            conductor = conducting.WorkflowConductor(wf_spec)
+            conductor.request_workflow_status(statuses.RUNNING)
+            self.assertEqual(len(conductor.get_next_tasks()), 2)
+            conductors.append(conductor)
+
+        return conductors
+
+    def test_output_render_errors(self):
+        conductor, batch_conductor = self._prep_output_error_conductors()
+
+        # The workflow is completed by the completion of task2 and then another error is
+        # logged by the late event for task2 in the same batch.
+        task_events = [
+            ('task1', 0, events.ActionExecutionEvent(statuses.RUNNING)),
+            ('task2', 0, events.ActionExecutionEvent(statuses.RUNNING)),
+            ('task1', 0, events.ActionExecutionEvent(statuses.SUCCEEDED)),
+            ('task2', 0, events.ActionExecutionEvent(statuses.SUCCEEDED)),
+            ('task2', 0, events.ActionExecutionEvent(statuses.FAILED))
+        ]
+
+        for task_id, route, event in task_events:
+            conductor.update_task_state(task_id, route, event)
+
+        batch_conductor.update_task_states(task_events)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.FAILED)
+        self.assertEqual(len(conductor.errors), 2)
+        self.assertIn('result().foobar', conductor.errors[0]['message'])
+        self.assertListEqual(batch_conductor.errors, conductor.errors)
+        self.assertListEqual(batch_conductor.log, conductor.log)
+        self.assertDictEqual(batch_conductor.serialize(), conductor.serialize())
+
+    def test_event_error_not_replaced(self):
+        conductor = self._prep_output_error_conductors()[0]
+
+        task_events = [
+            ('task1', 0, events.ActionExecutionEvent(statuses.RUNNING)),
+            ('task2', 0, events.ActionExecutionEvent(statuses.RUNNING)),
+            ('task1', 0, events.ActionExecutionEvent(statuses.SUCCEEDED)),
+            ('task2', 0, events.ActionExecutionEvent(statuses.SUCCEEDED)),
+            ('task3', 0, events.ActionExecutionEvent(statuses.RUNNING))
+        ]
+
+        # The outputs are not rendered at the end of the batch if an event cannot be
+        # processed so the error from processing the event is raised.
+        with mock.patch.object(
+                conducting.WorkflowConductor,
+                '_render_workflow_terminal_outputs',
+                mock.MagicMock(side_effect=ValueError('foobar'))):
+            self.assertRaises(exc.InvalidTask, conductor.update_task_states, task_events)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertFalse(conductor._defer_outputs)
+        self.assertIsNone(conductor._deferred_term_tasks)
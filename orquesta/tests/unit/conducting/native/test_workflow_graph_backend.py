@@ -0,0 +1,114 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta import conducting
+from orquesta.graphs import compact
+from orquesta import statuses
+from orquesta.tests.unit.conducting.native import base
+
+
+class WorkflowConductorGraphBackendTest(base.OrchestraWorkflowConductorTest):
+
+    def assert_conducting_with_graph_backend(self, wf_name, expected_task_seq, **kwargs):
+        conductor = self.assert_conducting_sequences(
+            wf_name,
+            expected_task_seq,
+            graph_backend='compact',
+            **kwargs
+        )
+
+        # Ensure the graph backend is restored and the graph is the same as the default.
+        wf_spec = self.spec_module.instantiate(self.get_wf_def(wf_name))
+        default_conductor = conducting.WorkflowConductor(wf_spec, inputs=kwargs.get('inputs'))
+
+        self.assertEqual(conductor.serialize()['graph_backend'], 'compact')
+        self.assertIsInstance(conductor.graph, compact.CompactWorkflowGraph)
+        self.assert_graph_equal(conductor.graph, default_conductor.graph.serialize())
+
+    def test_sequential(self):
+        self.assert_conducting_with_graph_backend(
+            'sequential',
+            ['task1', 'task2', 'task3', 'noop'],
+            inputs={'name': 'Stanley'}
+        )
+
+    def test_splits(self):
+        expected_routes = [
+            [],
+            ['task1__t0'],
+            ['task2__t0'],
+            ['task3__t0'],
+            ['task2__t0', 'task7__t0'],
+            ['task3__t0', 'task7__t0']
+        ]
+
+        expected_task_seq = [
+            ('task1', 0),
+            ('task2', 0),
+            ('task3', 0),
+            ('task8', 1),
+            ('task4', 2),
+            ('task4', 3),
+            ('task5', 2),
+            ('task5', 3),
+            ('task6', 2),
+            ('task6', 3),
+            ('task7', 2),
+            ('task7', 3),
+            ('task8', 4),
+            ('task8', 5)
+        ]
+
+        self.assert_conducting_with_graph_backend(
+            'splits',
+            expected_task_seq,
+            expected_routes=expected_routes
+        )
+
+    def test_join(self):
+        self.assert_conducting_with_graph_backend(
+            'join',
+            ['task1', 'task2', 'task4', 'task3', 'task5', 'task6', 'task7']
+        )
+
+    def test_cycle(self):
+        self.assert_conducting_with_graph_backend(
+            'cycle',
+            ['prep'] + ['task1', 'task2', 'task3'] * 3
+        )
+
+    def test_error_handling(self):
+        self.assert_conducting_with_graph_backend(
+            'error-handling',
+            ['task1', 'task3'],
+            mock_statuses=[statuses.FAILED]
+        )
+
+    def test_lazy_deserialization(self):
+        wf_def = self.get_wf_def('sequential')
+        wf_spec = self.spec_module.instantiate(wf_def)
+        conductor = conducting.WorkflowConductor(wf_spec, graph_backend='compact')
+        conductor.request_workflow_status(statuses.RUNNING)
+        data = conductor.serialize()
+
+        conductor = conducting.WorkflowConductor.deserialize(data, lazy=True)
+        self.assertIsInstance(conductor.graph, compact.CompactWorkflowGraph)
+        self.assertDictEqual(conductor.serialize(), data)
+
+    def test_default_graph_backend_not_serialized(self):
+        wf_def = self.get_wf_def('sequential')
+        wf_spec = self.spec_module.instantiate(wf_def)
+        conductor = conducting.WorkflowConductor(wf_spec)
+
+        self.assertNotIn('graph_backend', conductor.serialize())
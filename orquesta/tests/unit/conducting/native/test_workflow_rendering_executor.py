@@ -0,0 +1,260 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent import futures
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import exceptions as exc
+from orquesta import instrumentation
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit.conducting.native import base
+from orquesta import values
+
+
+class WorkflowConductorRenderingExecutorTest(base.OrchestraWorkflowConductorTest):
+
+    @classmethod
+    def setUpClass(cls):
+        super(WorkflowConductorRenderingExecutorTest, cls).setUpClass()
+        cls.thread_pool = futures.ThreadPoolExecutor(max_workers=4)
+        cls.process_pool = futures.ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.thread_pool.shutdown()
+        cls.process_pool.shutdown()
+        super(WorkflowConductorRenderingExecutorTest, cls).tearDownClass()
+
+    def format_next_tasks(self, next_tasks):
+        formatted = []
+
+        for task in next_tasks:
+            task = dict(task)
+            self.assertIsInstance(task['ctx']['__state'], dict)
+            task['ctx'] = {k: v for k, v in task['ctx'].items() if k != '__state'}
+            task['spec'] = task['spec'].serialize()
+            formatted.append(task)
+
+        return formatted
+
+    def assert_rendering(self, wf_name, expected_task_seq, **kwargs):
+        for executor in [self.thread_pool, self.process_pool]:
+            self.assert_conducting_sequences(
+                wf_name,
+                expected_task_seq,
+                executor=executor,
+                **kwargs
+            )
+
+    def test_splits(self):
+        expected_routes = [
+            [],
+            ['task1__t0'],
+            ['task2__t0'],
+            ['task3__t0'],
+            ['task2__t0', 'task7__t0'],
+            ['task3__t0', 'task7__t0']
+        ]
+
+        expected_task_seq = [
+            ('task1', 0),
+            ('task2', 0),
+            ('task3', 0),
+            ('task8', 1),
+            ('task4', 2),
+            ('task4', 3),
+            ('task5', 2),
+            ('task5', 3),
+            ('task6', 2),
+            ('task6', 3),
+            ('task7', 2),
+            ('task7', 3),
+            ('task8', 4),
+            ('task8', 5)
+        ]
+
+        self.assert_rendering('splits', expected_task_seq, expected_routes=expected_routes)
+
+    def test_join(self):
+        self.assert_rendering(
+            'join',
+            ['task1', 'task2', 'task4', 'task3', 'task5', 'task6', 'task7']
+        )
+
+    def test_error_handling(self):
+        self.assert_rendering(
+            'error-handling',
+            ['task1', 'task3'],
+            mock_statuses=[statuses.FAILED]
+        )
+
+    def test_with_items_concurrency(self):
+        self.assert_rendering(
+            'with-items-concurrency',
+            ['task1'],
+            inputs={'members': ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew']}
+        )
+
+    def test_rendering_errors(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - do: task2, task3, task4
+          task2:
+            action: core.echo message=<% abs(4).value %>
+          task3:
+            action: core.noop
+          task4:
+            action: core.echo message=<% {}.foobar %>
+        """
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+
+        for executor in [self.thread_pool, self.process_pool]:
+            # The first conductor renders the next tasks one after another and the
+            # second conductor renders the next tasks concurrently with the executor.
+            conductors = [
+                conducting.WorkflowConductor(wf_spec),
+                conducting.WorkflowConductor(wf_spec)
+            ]
+
+            for conductor in conductors:
+                conductor.request_workflow_status(statuses.RUNNING)
+                self.assertListEqual([t['id'] for t in conductor.get_next_tasks()], ['task1'])
+
+                for s in [statuses.RUNNING, statuses.SUCCEEDED]:
+                    conductor.update_task_state('task1', 0, events.ActionExecutionEvent(s))
+
+            self.assertListEqual(
+                self.format_next_tasks(conductors[1].get_next_tasks(executor=executor)),
+                self.format_next_tasks(conductors[0].get_next_tasks())
+            )
+
+            self.assertEqual(conductors[0].get_workflow_status(), statuses.FAILED)
+            self.assertEqual(conductors[1].get_workflow_status(), statuses.FAILED)
+            self.assertDictEqual(conductors[1].serialize(), conductors[0].serialize())
+
+    def test_conductor_pickled_once_per_batch(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - do: task2, task3, task4, task5
+          task2:
+            action: core.noop
+          task3:
+            action: core.noop
+          task4:
+            action: core.noop
+          task5:
+            action: core.noop
+        """
+
+        timer = instrumentation.PhaseTimer()
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(wf_spec, instrument=timer)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        next_tasks = conductor.get_next_tasks(executor=self.process_pool)
+        self.assertListEqual([t['id'] for t in next_tasks], ['task1'])
+
+        for s in [statuses.RUNNING, statuses.SUCCEEDED]:
+            conductor.update_task_state('task1', 0, events.ActionExecutionEvent(s))
+
+        next_tasks = conductor.get_next_tasks(executor=self.process_pool)
+        self.assertListEqual([t['id'] for t in next_tasks], ['task2', 'task3', 'task4', 'task5'])
+
+        # The conductor is serialized once for each batch instead of once for each task.
+        self.assertEqual(timer.get_phase_stats()[instrumentation.SERIALIZE]['count'], 2)
+
+        # The tasks are rendered by the conductor itself if the executor is a thread pool.
+        next_tasks = conductor.get_next_tasks(executor=self.thread_pool)
+        self.assertListEqual([t['id'] for t in next_tasks], ['task2', 'task3', 'task4', 'task5'])
+        self.assertEqual(timer.get_phase_stats()[instrumentation.SERIALIZE]['count'], 2)
+
+    def test_value_store_not_picklable(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+        """
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+        value_store = values.SQLiteValueStore(':memory:')
+
+        conductor = conducting.WorkflowConductor(wf_spec, value_store=value_store)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        with self.assertRaises(exc.WorkflowConductorPickleError) as raised:
+            conductor.get_next_tasks(executor=self.process_pool)
+
+        expected = 'The value store "SQLiteValueStore" cannot be pickled.'
+        self.assertIn(expected, str(raised.exception))
+
+        # The value store does not have to be pickled if the executor is a thread pool.
+        next_tasks = conductor.get_next_tasks(executor=self.thread_pool)
+        self.assertListEqual([t['id'] for t in next_tasks], ['task1'])
+
+    def test_rendering_lazily_restored_conductor(self):
+        task_names = ['task%s' % i for i in range(2, 41)]
+
+        wf_def = """
+        version: 1.0
+
+        input:
+          - x: 123
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - do: %s
+        """ % ', '.join(task_names)
+
+        for task_name in task_names:
+            wf_def += """
+          %s:
+            action: core.echo message=<%% ctx(x) %%>
+            """ % task_name
+
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(wf_spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        for s in [statuses.RUNNING, statuses.SUCCEEDED]:
+            conductor.update_task_state('task1', 0, events.ActionExecutionEvent(s))
+
+        data = conductor.serialize()
+        expected_next_tasks = self.format_next_tasks(conductor.get_next_tasks())
+        self.assertListEqual([t['id'] for t in expected_next_tasks], sorted(task_names))
+
+        # The parts of the lazily restored conductor are materialized before the tasks are
+        # rendered concurrently by the threads that share the conductor.
+        for i in range(0, 20):
+            restored = conducting.WorkflowConductor.deserialize(data, lazy=True)
+            next_tasks = restored.get_next_tasks(executor=self.thread_pool)
+
+            self.assertListEqual(self.format_next_tasks(next_tasks), expected_next_tasks)
+            self.assertEqual(restored.get_workflow_status(), statuses.RUNNING)
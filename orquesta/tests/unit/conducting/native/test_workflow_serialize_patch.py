@@ -0,0 +1,142 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta import conducting
+from orquesta import exceptions as exc
+from orquesta import statuses
+from orquesta.tests.unit.conducting.native import base
+
+
+class WorkflowConductorSerializePatchTest(base.OrchestraWorkflowConductorTest):
+
+    def assert_conducting_with_patches(self, wf_name, expected_task_seq, **kwargs):
+        conductor = self.assert_conducting_sequences(
+            wf_name,
+            expected_task_seq,
+            persist_patches=True,
+            **kwargs
+        )
+
+        # Ensure there are no changes left that are not persisted.
+        patch = conductor.serialize_patch()
+        self.assertListEqual(patch['state']['sequence'], [])
+        self.assertListEqual(patch['log'], [])
+
+    def test_sequential(self):
+        self.assert_conducting_with_patches(
+            'sequential',
+            ['task1', 'task2', 'task3', 'noop'],
+            inputs={'name': 'Stanley'}
+        )
+
+    def test_splits(self):
+        expected_routes = [
+            [],
+            ['task1__t0'],
+            ['task2__t0'],
+            ['task3__t0'],
+            ['task2__t0', 'task7__t0'],
+            ['task3__t0', 'task7__t0']
+        ]
+
+        expected_task_seq = [
+            ('task1', 0),
+            ('task2', 0),
+            ('task3', 0),
+            ('task8', 1),
+            ('task4', 2),
+            ('task4', 3),
+            ('task5', 2),
+            ('task5', 3),
+            ('task6', 2),
+            ('task6', 3),
+            ('task7', 2),
+            ('task7', 3),
+            ('task8', 4),
+            ('task8', 5)
+        ]
+
+        self.assert_conducting_with_patches(
+            'splits',
+            expected_task_seq,
+            expected_routes=expected_routes
+        )
+
+    def test_join(self):
+        self.assert_conducting_with_patches(
+            'join',
+            ['task1', 'task2', 'task4', 'task3', 'task5', 'task6', 'task7']
+        )
+
+    def test_cycle(self):
+        self.assert_conducting_with_patches(
+            'cycle',
+            ['prep'] + ['task1', 'task2', 'task3'] * 3
+        )
+
+    def test_error_handling(self):
+        self.assert_conducting_with_patches(
+            'error-handling',
+            ['task1', 'task3'],
+            mock_statuses=[statuses.FAILED]
+        )
+
+    def test_error_log_fail(self):
+        self.assert_conducting_with_patches(
+            'error-log-fail',
+            ['task1', 'log', 'fail'],
+            mock_statuses=[statuses.FAILED],
+            expected_workflow_status=statuses.FAILED
+        )
+
+    def test_with_items_concurrency(self):
+        self.assert_conducting_with_patches(
+            'with-items-concurrency',
+            ['task1'],
+            inputs={'members': ['Lakshmi', 'Lindsay', 'Tomaz', 'Matt', 'Drew']}
+        )
+
+    def test_empty_patch(self):
+        wf_def = self.get_wf_def('sequential')
+        wf_spec = self.spec_module.instantiate(wf_def)
+        conductor = conducting.WorkflowConductor(wf_spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+
+        expected_patch = {
+            'state': {
+                'contexts': [],
+                'routes': [],
+                'sequence': [],
+                'staged': [],
+                'unstaged': [],
+                'status': statuses.RUNNING,
+                'tasks': {}
+            },
+            'log': [],
+            'errors': []
+        }
+
+        self.assertDictEqual(conductor.serialize_patch(), expected_patch)
+
+    def test_apply_patch_out_of_sequence(self):
+        wf_def = self.get_wf_def('sequential')
+        wf_spec = self.spec_module.instantiate(wf_def)
+        conductor = conducting.WorkflowConductor(wf_spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+
+        patch = {'state': {'sequence': [[1, {'id': 'task1', 'route': 0}]]}}
+
+        self.assertRaises(exc.WorkflowStatePatchError, conductor.apply_patch, patch)
@@ -25,7 +25,7 @@ from orquesta.utils import dictionary as dict_util
 
 class WorkflowConductorTest(test_base.WorkflowConductorTest):
 
-    def _prep_conductor(self, context=None, inputs=None, status=None):
+    def _prep_conductor(self, context=None, inputs=None, status=None, log_limit=None):
         wf_def = """
         version: 1.0
 
@@ -72,7 +72,8 @@ class WorkflowConductorTest(test_base.WorkflowConductorTest):
 
         kwargs = {
             'context': context if context is not None else None,
-            'inputs': inputs if inputs is not None else None
+            'inputs': inputs if inputs is not None else None,
+            'log_limit': log_limit
         }
 
         conductor = conducting.WorkflowConductor(spec, **kwargs)
@@ -312,6 +313,45 @@ class WorkflowConductorTest(test_base.WorkflowConductorTest):
         self.assertEqual(len(conductor.workflow_state.tasks), 5)
         self.assertEqual(len(conductor.workflow_state.sequence), 5)
 
+    def test_lazy_deserialization(self):
+        inputs = {'a': 123, 'b': True}
+        conductor = self._prep_conductor(inputs=inputs, status=statuses.RUNNING)
+
+        for i in range(1, 3):
+            status_changes = [statuses.RUNNING, statuses.SUCCEEDED]
+            self.forward_task_statuses(conductor, 'task' + str(i), status_changes)
+
+        data = conductor.serialize()
+
+        # Check the workflow status does not materialize the conductor.
+        conductor = conducting.WorkflowConductor.deserialize(data, lazy=True)
+        self.assertEqual(conductor.get_workflow_status(), statuses.RUNNING)
+
+        for name in ['spec', '_inputs', '_parent_ctx', '_workflow_state', '_log', '_errors']:
+            self.assertNotIn(name, conductor.__dict__)
+
+        # Check the serialized conductor is the same as the original.
+        self.assertDictEqual(conductor.serialize(), data)
+
+        # Check conducting from the lazily restored conductor.
+        eager_conductor = conducting.WorkflowConductor.deserialize(data)
+        lazy_conductor = conducting.WorkflowConductor.deserialize(data, lazy=True)
+
+        for c in [eager_conductor, lazy_conductor]:
+            self.forward_task_statuses(c, 'task3', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        self.assertNotIn('_inputs', lazy_conductor.__dict__)
+        self.assertDictEqual(lazy_conductor.serialize(), eager_conductor.serialize())
+
+        # Check the patch only includes the changes since the conductor is restored.
+        lazy_conductor = conducting.WorkflowConductor.deserialize(data, lazy=True)
+        self.forward_task_statuses(lazy_conductor, 'task3', [statuses.RUNNING])
+        patch = lazy_conductor.serialize_patch()
+        self.assertListEqual(patch['log'], [])
+        self.assertListEqual(patch['errors'], [])
+        self.assertNotIn('output', patch)
+        self.assertListEqual([e[1]['id'] for e in patch['state']['sequence']], ['task3'])
+
     def test_get_workflow_initial_context(self):
         conductor = self._prep_conductor()
         expected_init_ctx = {'a': None, 'b': False}
@@ -419,6 +459,31 @@ class WorkflowConductorTest(test_base.WorkflowConductorTest):
         self.assert_next_task(conductor, has_next_task=False)
         self.assert_next_task(conductor, has_next_task=False)
 
+    def test_get_next_tasks_does_not_modify_context(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs: [1, 2]
+
+        tasks:
+          task1:
+            action: core.noop
+            input:
+              xs: '{{ ctx().xs.append(99) }}'
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        # Expressions that modify the values in the context must not change the stored context.
+        for i in range(0, 2):
+            next_tasks = conductor.get_next_tasks()
+            self.assertListEqual([t['id'] for t in next_tasks], ['task1'])
+            self.assertListEqual(next_tasks[0]['ctx']['__state']['contexts'], [{'xs': [1, 2]}])
+            self.assertListEqual(conductor.workflow_state.contexts[0]['xs'], [1, 2])
+
     def test_get_next_tasks_when_this_task_paused(self):
         inputs = {'a': 123}
         expected_init_ctx = dict_util.merge_dicts(copy.deepcopy(inputs), {'b': False})
@@ -933,3 +998,108 @@ class WorkflowConductorTest(test_base.WorkflowConductorTest):
 
         self.assertListEqual(conductor.log, expected_log_entries)
         self.assertListEqual(conductor.errors, expected_errors)
+
+    def test_append_many_duplicate_log_entries(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING)
+
+        for i in range(0, 1000):
+            result = {'stdout': 'item %s' % (i % 10), 'data': {'i': i % 10}}
+            conductor.log_entry('error', 'Execution failed.', task_id='task1', result=result)
+
+        self.assertEqual(len(conductor.errors), 10)
+        self.assertListEqual(
+            [e['result']['data']['i'] for e in conductor.errors],
+            list(range(0, 10))
+        )
+
+        # Entries added outside of log_entry are also checked for duplicates.
+        conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+        entry = {'type': 'error', 'message': 'Execution failed.', 'task_id': 'task2'}
+        conductor.errors.append(entry)
+        conductor.log_entry('error', 'Execution failed.', task_id='task1', result=result)
+        conductor.log_entry('error', 'Execution failed.', task_id='task2')
+        self.assertEqual(len(conductor.errors), 11)
+
+    def test_append_duplicate_log_entries_with_limit(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING, log_limit=3)
+
+        conductor.log_entry('info', 'The workflow is running as expected.')
+        conductor.log_entry('info', 'The workflow is running as expected.')
+        conductor.log_entry('info', 'The workflow is running as expected.')
+
+        for i in range(1, 6):
+            conductor.log_entry('error', 'This is baloney.', task_id='task%s' % i)
+
+        conductor.log_entry('error', 'This is baloney.', task_id='task1')
+
+        expected_log_entries = [
+            {
+                'type': 'info',
+                'message': 'The workflow is running as expected.',
+                'count': 3
+            }
+        ]
+
+        expected_errors = [
+            {
+                'type': 'error',
+                'message': 'This is baloney.',
+                'task_id': 'task1',
+                'count': 2
+            },
+            {
+                'type': 'error',
+                'message': 'This is baloney.',
+                'task_id': 'task2'
+            },
+            {
+                'type': 'error',
+                'message': 'This is baloney.',
+                'task_id': 'task3'
+            },
+            {
+                'type': 'error',
+                'message': 'The log reached the limit of 3 entries.',
+                'count': 2
+            }
+        ]
+
+        self.assertListEqual(conductor.log, expected_log_entries)
+        self.assertListEqual(conductor.errors, expected_errors)
+
+        # Serialize and check the log limit is retained.
+        data = conductor.serialize()
+        self.assertEqual(data['log_limit'], 3)
+        conductor = conducting.WorkflowConductor.deserialize(data)
+        conductor.log_entry('info', 'The workflow is running as expected.')
+        self.assertEqual(conductor.log[0]['count'], 4)
+        self.assertEqual(len(conductor.log), 1)
+
+    def test_serialize_patch_with_duplicate_log_entries(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING, log_limit=10)
+        conductor.log_entry('error', 'This is baloney.', task_id='task1')
+        replica = conducting.WorkflowConductor.deserialize(conductor.serialize())
+        conductor.checkpoint()
+
+        conductor.log_entry('error', 'This is baloney.', task_id='task1')
+        conductor.log_entry('error', 'This is baloney.', task_id='task2')
+        conductor.log_entry('error', 'This is baloney.', task_id='task2')
+
+        patch = conductor.serialize_patch()
+
+        expected_entry = {
+            'type': 'error',
+            'message': 'This is baloney.',
+            'task_id': 'task1',
+            'count': 2
+        }
+
+        expected_updates = {'errors': [[0, expected_entry]]}
+
+        self.assertDictEqual(patch['updates'], expected_updates)
+        self.assertEqual(len(patch['errors']), 1)
+        self.assertEqual(patch['errors'][0]['count'], 2)
+
+        replica.apply_patch(patch)
+        self.assertDictEqual(replica.serialize(), conductor.serialize())
+        self.assertNotIn('updates', conductor.serialize_patch())
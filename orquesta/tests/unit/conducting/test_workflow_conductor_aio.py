@@ -0,0 +1,212 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import six
+import threading
+import unittest
+
+from concurrent import futures
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import exceptions as exc
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+
+try:
+    import asyncio
+
+    from orquesta import aio
+except ImportError:
+    asyncio = None
+    aio = None
+
+
+WF_DEF = """
+version: 1.0
+
+input:
+  - xs
+
+tasks:
+  task1:
+    action: core.noop
+    next:
+      - do: task2, task3
+  task2:
+    with: <% ctx(xs) %>
+    action: core.echo message=<% item() %>
+  task3:
+    action: core.echo message=<% ctx(xs).len() %>
+
+output:
+  - xs: <% ctx(xs) %>
+"""
+
+
+@unittest.skipIf(six.PY2, 'The asyncio driver requires Python 3.')
+class AsyncWorkflowConductorTest(unittest.TestCase):
+
+    def setUp(self):
+        super(AsyncWorkflowConductorTest, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.executor = futures.ThreadPoolExecutor(max_workers=8)
+        self.spec = native_specs.WorkflowSpec(WF_DEF)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.loop.close()
+        super(AsyncWorkflowConductorTest, self).tearDown()
+
+    def _get_conductor(self, inputs=None):
+        conductor = conducting.WorkflowConductor(self.spec, inputs=inputs or {'xs': [1, 2, 3]})
+
+        return aio.AsyncWorkflowConductor(conductor, executor=self.executor, loop=self.loop)
+
+    def _run_workflow(self, conductor):
+        # Drive the workflow to completion with callbacks. The events for the next tasks are
+        # queued without waiting for each update to complete before the next tasks are queried.
+        result = self.loop.create_future()
+
+        def _on_next_tasks(future):
+            next_tasks = future.result()
+
+            if not next_tasks:
+                conductor.get_workflow_status().add_done_callback(
+                    lambda f: result.set_result(f.result())
+                )
+
+                return
+
+            for task in next_tasks:
+                for action in task['actions']:
+                    ctx = {'item_id': action['item_id']} if 'item_id' in action else None
+
+                    for status in [statuses.RUNNING, statuses.SUCCEEDED]:
+                        event = events.ActionExecutionEvent(status, result=task['id'], context=ctx)
+                        conductor.update_task_state(task['id'], task['route'], event)
+
+            conductor.get_next_tasks().add_done_callback(_on_next_tasks)
+
+        conductor.request_workflow_status(statuses.RUNNING)
+        conductor.get_next_tasks().add_done_callback(_on_next_tasks)
+
+        return result
+
+    def test_bad_conductor(self):
+        self.assertRaises(ValueError, aio.AsyncWorkflowConductor, object())
+
+    def test_run_workflow(self):
+        conductor = self._get_conductor()
+        status = self.loop.run_until_complete(self._run_workflow(conductor))
+
+        self.assertEqual(status, statuses.SUCCEEDED)
+        output = self.loop.run_until_complete(conductor.get_workflow_output())
+        self.assertDictEqual(output, {'xs': [1, 2, 3]})
+
+    def test_run_concurrent_workflows(self):
+        inputs = [{'xs': list(range(0, i % 4 + 1))} for i in range(0, 200)]
+        conductors = [self._get_conductor(inputs=i) for i in inputs]
+        results = [self._run_workflow(c) for c in conductors]
+        self.assertListEqual(
+            self.loop.run_until_complete(asyncio.gather(*results)),
+            [statuses.SUCCEEDED] * len(conductors)
+        )
+
+        for i, conductor in enumerate(conductors):
+            self.assertDictEqual(conductor.conductor.get_workflow_output(), inputs[i])
+
+    def test_calls_are_serialized_per_workflow(self):
+        conductor = self._get_conductor()
+        running = []
+        overlaps = []
+        lock = threading.Lock()
+        get_workflow_status = conductor.conductor.get_workflow_status
+
+        def _get_workflow_status():
+            # Record if the call overlaps with a call from another thread.
+            thread_id = threading.current_thread().ident
+
+            with lock:
+                overlaps.append(len([t for t in running if t != thread_id]))
+                running.append(thread_id)
+
+            try:
+                return get_workflow_status()
+            finally:
+                with lock:
+                    running.remove(thread_id)
+
+        conductor.conductor.get_workflow_status = _get_workflow_status
+        calls = [conductor.get_workflow_status() for i in range(0, 50)]
+
+        # Ensure a cancelled call does not break the order of the calls that follow.
+        calls[10].cancel()
+
+        calls.append(conductor.request_workflow_status(statuses.RUNNING))
+        calls.append(conductor.get_workflow_status())
+
+        self.loop.run_until_complete(asyncio.wait([c for c in calls if not c.cancelled()]))
+
+        self.assertListEqual(overlaps, [0] * len(overlaps))
+        self.assertEqual(calls[-1].result(), statuses.RUNNING)
+
+    def test_error_is_raised_from_future(self):
+        conductor = self._get_conductor()
+        event = events.ActionExecutionEvent(statuses.RUNNING)
+        future = conductor.update_task_state('task4', 0, event)
+
+        self.assertRaises(exc.InvalidTask, self.loop.run_until_complete, future)
+
+        # Ensure the calls that follow the failed call are still run.
+        self.loop.run_until_complete(conductor.request_workflow_status(statuses.RUNNING))
+        next_tasks = self.loop.run_until_complete(conductor.get_next_tasks())
+        self.assertListEqual([t['id'] for t in next_tasks], ['task1'])
+
+    def test_error_from_executor_is_raised_from_future(self):
+        conductor = self._get_conductor()
+
+        class _Executor(futures.ThreadPoolExecutor):
+
+            def submit(self, fn, *args, **kwargs):
+                if fn.func == conductor.conductor.get_workflow_output:
+                    raise RuntimeError('cannot schedule new futures after shutdown')
+
+                return super(_Executor, self).submit(fn, *args, **kwargs)
+
+        conductor.executor = _Executor(max_workers=1)
+
+        # The failed call is queued after the first call and the last call is queued after
+        # the failed call. A timeout is used so the test fails instead of hanging.
+        calls = [
+            conductor.request_workflow_status(statuses.RUNNING),
+            conductor.get_workflow_output(),
+            conductor.get_workflow_status()
+        ]
+
+        self.loop.run_until_complete(asyncio.wait_for(calls[0], 5))
+        self.assertRaises(
+            RuntimeError,
+            self.loop.run_until_complete,
+            asyncio.wait_for(calls[1], 5)
+        )
+
+        status = self.loop.run_until_complete(asyncio.wait_for(calls[2], 5))
+        self.assertEqual(status, statuses.RUNNING)
+
+        # Ensure the calls that follow the failed calls are still run.
+        next_tasks = self.loop.run_until_complete(conductor.get_next_tasks())
+        self.assertListEqual([t['id'] for t in next_tasks], ['task1'])
+
+        conductor.executor.shutdown()
@@ -291,3 +291,52 @@ class WorkflowConductorContextTest(test_base.WorkflowConductorTest):
         self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
         self.assertListEqual(conductor.errors, expected_errors)
         self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+    def test_ctx_merge_nested_dict(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - config:
+              a: 1
+              b:
+                c: 2
+
+        output:
+          - config: <% ctx().config %>
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - publish:
+                  - config:
+                      b:
+                        d: 3
+                do: task2
+          task2:
+            action: core.echo
+            input:
+              message: <% ctx().config.b.c %>-<% ctx().config.b.d %>
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        # Check the nested dict is merged when rendering the next task.
+        task = conductor.get_next_tasks()[0]
+        self.assertEqual(task['actions'][0]['input']['message'], '2-3')
+
+        self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING, statuses.SUCCEEDED])
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+        expected_output = {'config': {'a': 1, 'b': {'c': 2, 'd': 3}}}
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+        # Check the initial context is not modified by the merge.
+        expected_init_ctx = {'config': {'a': 1, 'b': {'c': 2}}}
+        self.assertDictEqual(conductor.get_workflow_initial_context(), expected_init_ctx)
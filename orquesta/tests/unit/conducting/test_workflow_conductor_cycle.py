@@ -83,3 +83,404 @@ class WorkflowConductorExtendedTest(test_base.WorkflowConductorTest):
         expected_term_ctx = {'loop': False}
         self.assertDictEqual(conductor.get_workflow_terminal_context(), expected_term_ctx)
         self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+    def test_cycle_with_context_compaction(self):
+        wf_def = """
+        version: 1.0
+
+        description: A workflow with cycle that publishes to the context on each loop.
+
+        input:
+          - count: 0
+
+        vars:
+          - data:
+              keys: {}
+
+        output:
+          - count: <% ctx(count) %>
+          - data: <% ctx(data) %>
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() and ctx(count) mod 4 = 3 %>
+                publish:
+                  - data:
+                      keys: null
+                do: task2
+              - when: <% succeeded() and ctx(count) mod 4 != 3 %>
+                publish:
+                  - data:
+                      keys: <% dict(concat('k', str(ctx(count))) => ctx(count)) %>
+                do: task2
+          task2:
+            action: core.noop
+            next:
+              - when: <% succeeded() and ctx(count) < 20 %>
+                publish:
+                  - count: <% ctx(count) + 1 %>
+                do: task1
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # The first conductor keeps all the contexts and the second conductor compacts
+        # the contexts. The changes of the second conductor are replicated by patches.
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        compact_conductor = conducting.WorkflowConductor(spec, context_limit=4)
+        compact_conductor.request_workflow_status(statuses.RUNNING)
+        replica = conducting.WorkflowConductor.deserialize(compact_conductor.serialize())
+        compact_conductor.checkpoint()
+
+        for task_name in ['init'] + ['task1', 'task2'] * 21:
+            for c in [conductor, compact_conductor]:
+                self.forward_task_statuses(c, task_name, [statuses.RUNNING, statuses.SUCCEEDED])
+
+            replica.apply_patch(compact_conductor.serialize_patch())
+
+            expected_next_tasks = [
+                (t['id'], t['route'], conductor.get_task_initial_context(t['id'], t['route']))
+                for t in conductor.get_next_tasks()
+            ]
+
+            for c in [compact_conductor, replica]:
+                actual_next_tasks = [
+                    (t['id'], t['route'], c.get_task_initial_context(t['id'], t['route']))
+                    for t in c.get_next_tasks()
+                ]
+
+                self.assertListEqual(actual_next_tasks, expected_next_tasks)
+
+                # Ensure the number of contexts is bounded.
+                self.assertLess(len(c.workflow_state.contexts), 16)
+
+        self.assertDictEqual(replica.serialize(), compact_conductor.serialize())
+        self.assertEqual(len(conductor.workflow_state.contexts), 42)
+
+        for c in [compact_conductor, replica]:
+            self.assertEqual(c.get_workflow_status(), statuses.SUCCEEDED)
+            self.assertDictEqual(c.get_workflow_terminal_context(),
+                                 conductor.get_workflow_terminal_context())
+            self.assertDictEqual(c.get_workflow_output(), conductor.get_workflow_output())
+
+        expected_output = {'count': 20, 'data': {'keys': {'k20': 20}}}
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+    def test_cycle_with_context_compaction_after_deserialization(self):
+        wf_def = """
+        version: 1.0
+
+        description: A workflow with cycle that publishes to the context on each loop.
+
+        input:
+          - count: 0
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() and ctx(count) < 20 %>
+                publish:
+                  - count: <% ctx(count) + 1 %>
+                do: task1
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # The first conductor is used throughout and the second conductor is restored from
+        # the serialized data on each update. Both conductors must compact at the same time.
+        conductor = conducting.WorkflowConductor(spec, context_limit=4)
+        conductor.request_workflow_status(statuses.RUNNING)
+        restored = conducting.WorkflowConductor.deserialize(conductor.serialize())
+
+        for i, task_name in enumerate(['init'] + ['task1'] * 21):
+            for c in [conductor, restored]:
+                self.forward_task_statuses(c, task_name, [statuses.RUNNING, statuses.SUCCEEDED])
+
+            self.assertEqual(
+                len(restored.workflow_state.contexts),
+                len(conductor.workflow_state.contexts)
+            )
+
+            self.assertDictEqual(restored.serialize(), conductor.serialize())
+            restored = conducting.WorkflowConductor.deserialize(
+                restored.serialize(),
+                lazy=(i % 2 == 1)
+            )
+
+        self.assertGreater(conductor.serialize()['context_gc_size'], 4)
+
+        for c in [conductor, restored]:
+            self.assertEqual(c.get_workflow_status(), statuses.SUCCEEDED)
+            self.assertDictEqual(c.get_workflow_terminal_context(), {'count': 20})
+
+    def test_cycle_with_sequence_compaction(self):
+        wf_def = """
+        version: 1.0
+
+        description: A workflow with cycle that is repeated a number of times.
+
+        input:
+          - count: 0
+
+        output:
+          - count: <% ctx(count) %>
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() %>
+                do: task2
+          task2:
+            action: core.noop
+            next:
+              - when: <% succeeded() and task_status(task1) = 'succeeded' and ctx(count) < 20 %>
+                publish:
+                  - count: <% ctx(count) + 1 %>
+                do: task1
+              - when: <% succeeded() and ctx(count) >= 20 %>
+                do: task3
+          task3:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # The first conductor keeps all the task state entries and the second conductor
+        # keeps the last two entries for each task. The changes of the second conductor
+        # are replicated by patches.
+        archived = []
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        compact_conductor = conducting.WorkflowConductor(
+            spec,
+            sequence_retention=2,
+            sequence_archive=archived.extend
+        )
+
+        compact_conductor.request_workflow_status(statuses.RUNNING)
+        replica = conducting.WorkflowConductor.deserialize(compact_conductor.serialize())
+        compact_conductor.checkpoint()
+
+        def assert_task_status_index(c):
+            # The task state entries queried by status must match the compacted sequence.
+            for task_statuses in [[statuses.RUNNING], statuses.COMPLETED_STATUSES]:
+                expected_task_state_entries = [
+                    t for t in c.workflow_state.sequence if t.get('status') in task_statuses
+                ]
+
+                self.assertListEqual(
+                    c.workflow_state.get_tasks_by_status(task_statuses),
+                    expected_task_state_entries
+                )
+
+                self.assertListEqual(
+                    replica.workflow_state.get_tasks_by_status(task_statuses),
+                    expected_task_state_entries
+                )
+
+            self.assertEqual(
+                replica.workflow_state.has_active_tasks,
+                c.workflow_state.has_active_tasks
+            )
+
+        for task_name in ['init'] + ['task1', 'task2'] * 21 + ['task3']:
+            for status in [statuses.RUNNING, statuses.SUCCEEDED]:
+                for c in [conductor, compact_conductor]:
+                    self.forward_task_statuses(c, task_name, [status])
+
+                replica.apply_patch(compact_conductor.serialize_patch())
+                assert_task_status_index(compact_conductor)
+
+            expected_next_tasks = [
+                (t['id'], t['route'], conductor.get_task_initial_context(t['id'], t['route']))
+                for t in conductor.get_next_tasks()
+            ]
+
+            for c in [compact_conductor, replica]:
+                actual_next_tasks = [
+                    (t['id'], t['route'], c.get_task_initial_context(t['id'], t['route']))
+                    for t in c.get_next_tasks()
+                ]
+
+                self.assertListEqual(actual_next_tasks, expected_next_tasks)
+                self.assertLess(len(c.workflow_state.sequence), 16)
+
+                # Ensure the back references are remapped to the entries of the previous task.
+                for task_state_entry in c.workflow_state.sequence:
+                    for backref, idx in task_state_entry['prev'].items():
+                        if idx is not None:
+                            prev_task_id = backref.split('__')[0]
+                            self.assertEqual(c.workflow_state.sequence[idx]['id'], prev_task_id)
+
+        self.assertDictEqual(replica.serialize(), compact_conductor.serialize())
+        self.assertEqual(len(conductor.workflow_state.sequence), 44)
+        self.assertEqual(len(compact_conductor.workflow_state.sequence) + len(archived), 44)
+
+        for c in [compact_conductor, replica]:
+            self.assertEqual(c.get_workflow_status(), statuses.SUCCEEDED)
+            self.assertDictEqual(c.get_workflow_terminal_context(),
+                                 conductor.get_workflow_terminal_context())
+            self.assertDictEqual(c.get_workflow_output(), {'count': 20})
+
+            for task_id in ['init', 'task1', 'task2', 'task3']:
+                expected = conductor.get_task_state_entry(task_id, 0)
+                actual = c.get_task_state_entry(task_id, 0)
+                self.assertEqual(actual['status'], expected['status'])
+                self.assertDictEqual(actual['next'], expected['next'])
+
+    def test_split_task_retriggered_from_cycle(self):
+        wf_def = """
+        version: 1.0
+
+        description: A workflow with cycle that triggers a split task on each loop.
+
+        input:
+          - count: 0
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: poll, notify
+          poll:
+            action: core.noop
+            next:
+              - when: <% succeeded() and ctx(count) < 2 %>
+                publish:
+                  - count: <% ctx(count) + 1 %>
+                do: poll, notify
+          notify:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        expected_next_tasks = [
+            [('notify', 1), ('poll', 0)],
+            [('notify', 2), ('poll', 0)],
+            [('notify', 3), ('poll', 0)],
+            []
+        ]
+
+        self.forward_task_statuses(conductor, 'init', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        for expected in expected_next_tasks:
+            next_tasks = conductor.get_next_tasks()
+            self.assertListEqual(sorted((t['id'], t['route']) for t in next_tasks), expected)
+
+            for t in next_tasks:
+                self.forward_task_statuses(
+                    conductor,
+                    t['id'],
+                    [statuses.RUNNING, statuses.SUCCEEDED],
+                    route=t['route']
+                )
+
+        # Each run of the split task has its own route and task state entry.
+        expected_routes = [[], ['init__t0'], ['poll__t0'], ['poll__t0']]
+        self.assertListEqual(conductor.workflow_state.routes, expected_routes)
+
+        expected_sequence = [
+            ('init', 0), ('notify', 1), ('poll', 0),
+            ('notify', 2), ('poll', 0), ('notify', 3), ('poll', 0)
+        ]
+
+        actual_sequence = [(t['id'], t['route']) for t in conductor.workflow_state.sequence]
+        self.assertListEqual(sorted(actual_sequence), sorted(expected_sequence))
+
+        for task_state_entry in conductor.workflow_state.sequence:
+            self.assertEqual(task_state_entry['status'], statuses.SUCCEEDED)
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+
+    def test_cycle_with_sequence_compaction_after_deserialization(self):
+        wf_def = """
+        version: 1.0
+
+        description: A workflow with cycle that is repeated a number of times.
+
+        input:
+          - count: 0
+
+        tasks:
+          init:
+            action: core.noop
+            next:
+              - do: task1
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() and ctx(count) < 20 %>
+                publish:
+                  - count: <% ctx(count) + 1 %>
+                do: task1
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        # The first conductor is used throughout and the second conductor is restored from
+        # the serialized data on each update. Both conductors must compact at the same time.
+        archived = []
+        restored_archived = []
+        conductor = conducting.WorkflowConductor(
+            spec,
+            sequence_retention=2,
+            sequence_archive=archived.extend
+        )
+
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        restored = conducting.WorkflowConductor.deserialize(
+            conductor.serialize(),
+            sequence_archive=restored_archived.extend
+        )
+
+        for i, task_name in enumerate(['init'] + ['task1'] * 21):
+            for c in [conductor, restored]:
+                self.forward_task_statuses(c, task_name, [statuses.RUNNING, statuses.SUCCEEDED])
+
+            self.assertEqual(
+                len(restored.workflow_state.sequence),
+                len(conductor.workflow_state.sequence)
+            )
+
+            self.assertDictEqual(restored.serialize(), conductor.serialize())
+
+            restored = conducting.WorkflowConductor.deserialize(
+                restored.serialize(),
+                lazy=(i % 2 == 1),
+                sequence_archive=restored_archived.extend
+            )
+
+        self.assertGreater(conductor.serialize()['sequence_gc_size'], 2)
+        self.assertListEqual(restored_archived, archived)
+
+        for c in [conductor, restored]:
+            self.assertEqual(c.get_workflow_status(), statuses.SUCCEEDED)
+            self.assertDictEqual(c.get_workflow_terminal_context(), {'count': 20})
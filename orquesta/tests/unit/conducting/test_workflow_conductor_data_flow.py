@@ -14,15 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 from orquesta import conducting
 from orquesta.specs import native as native_specs
 from orquesta import statuses
 from orquesta.tests.unit import base as test_base
+from orquesta import values
 
 
 class WorkflowConductorDataFlowTest(test_base.WorkflowConductorTest):
 
-    def _prep_conductor(self, context=None, inputs=None, status=None):
+    def _prep_conductor(self, context=None, inputs=None, status=None, value_store=None):
         wf_def = """
         version: 1.0
 
@@ -64,7 +67,8 @@ class WorkflowConductorDataFlowTest(test_base.WorkflowConductorTest):
 
         kwargs = {
             'context': context if context is not None else None,
-            'inputs': inputs if inputs is not None else None
+            'inputs': inputs if inputs is not None else None,
+            'value_store': value_store
         }
 
         conductor = conducting.WorkflowConductor(spec, **kwargs)
@@ -109,3 +113,76 @@ class WorkflowConductorDataFlowTest(test_base.WorkflowConductorTest):
 
     def test_data_flow_unicode(self):
         self.assert_data_flow('光合作用')
+
+    def test_data_flow_with_value_store(self):
+        value_store = values.SQLiteValueStore(':memory:', threshold=64)
+        inputs = {'a1': ['x' * 16] * 8}
+        expected_output = {'a5': inputs['a1'], 'b5': inputs['a1']}
+        conductor = self._prep_conductor(inputs=inputs, status=statuses.RUNNING,
+                                         value_store=value_store)
+
+        # Ensure the large values in the context are replaced with references.
+        ref = value_store.put(inputs['a1'])
+        init_ctx = conductor.get_workflow_initial_context()
+        self.assertEqual(init_ctx['a1'], ref)
+        self.assertEqual(init_ctx['b2'], ref)
+
+        for i in range(1, len(conductor.spec.tasks) + 1):
+            task_name = 'task' + str(i)
+
+            # Ensure the value store is not included in the context of the task.
+            task = conductor.get_task(task_name, 0)
+            self.assertNotIn('__value_store', task['ctx'])
+            self.assertIsInstance(task['ctx']['__state'], dict)
+
+            next_tasks = conductor.get_next_tasks()
+            self.assertListEqual([t['id'] for t in next_tasks], [task_name])
+            self.assertNotIn('__value_store', next_tasks[0]['ctx'])
+
+            self.forward_task_statuses(conductor, task_name, [statuses.RUNNING, statuses.SUCCEEDED])
+
+            # Ensure the references are resolved after the conductor is restored.
+            conductor = conducting.WorkflowConductor.deserialize(
+                conductor.serialize(),
+                value_store=value_store
+            )
+
+        for ctx in conductor.workflow_state.contexts[1:]:
+            self.assertTrue(all(values.is_ref(v) for v in ctx.values()))
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor.get_workflow_output(), expected_output)
+
+    def test_data_flow_with_value_store_and_unserializable_result(self):
+        wf_def = """
+        version: 1.0
+
+        output:
+          - x: <% ctx().x %>
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - when: <% succeeded() %>
+                publish: x=<% result() %>
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        value_store = values.SQLiteValueStore(':memory:', threshold=64)
+        conductor = conducting.WorkflowConductor(spec, value_store=value_store)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        # Ensure the large value that cannot be serialized by the store is kept inline.
+        result = [datetime.date(2019, 1, 1)] * 100
+
+        self.forward_task_statuses(
+            conductor,
+            'task1',
+            [statuses.RUNNING, statuses.SUCCEEDED],
+            results=[None, result]
+        )
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertListEqual(conductor.workflow_state.contexts[-1]['x'], result)
+        self.assertListEqual(conductor.get_workflow_output()['x'], result)
@@ -0,0 +1,153 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta import conducting
+from orquesta import instrumentation
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowConductorInstrumentationTest(test_base.WorkflowConductorTest):
+
+    wf_def = """
+    version: 1.0
+
+    input:
+      - x
+
+    output:
+      - y: <% ctx(y) %>
+
+    tasks:
+      task1:
+        action: core.noop
+        next:
+          - when: <% succeeded() %>
+            publish: y=<% ctx(x) %>
+            do: task2
+      task2:
+        action: core.noop
+        next:
+          - when: <% succeeded() %>
+            do: task3
+      task3:
+        action: core.noop
+    """
+
+    def _run_workflow(self, conductor):
+        for task_name in ['task1', 'task2', 'task3']:
+            next_tasks = conductor.get_next_tasks()
+            self.assertListEqual([t['id'] for t in next_tasks], [task_name])
+            self.forward_task_statuses(conductor, task_name, [statuses.RUNNING, statuses.SUCCEEDED])
+
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor.get_workflow_output(), {'y': 123})
+
+    def assert_phase_counts(self, timings, expected_counts):
+        self.assertDictEqual({k: v['count'] for k, v in timings.items()}, expected_counts)
+
+        for timing in timings.values():
+            self.assertGreaterEqual(timing['time'], 0)
+            self.assertLessEqual(timing['min'], timing['max'])
+            self.assertLessEqual(timing['max'], timing['time'])
+
+    def test_default_instrument(self):
+        spec = native_specs.WorkflowSpec(self.wf_def)
+        conductor = conducting.WorkflowConductor(spec, inputs={'x': 123})
+        self.assertIs(conductor._instrument, instrumentation.NULL_INSTRUMENT)
+
+        instrument = instrumentation.NULL_INSTRUMENT
+        measurement = instrument.measure(instrumentation.GET_TASK, 'task1', 0)
+        self.assertIs(instrument.measure(instrumentation.SERIALIZE), measurement)
+
+        conductor = conducting.WorkflowConductor.deserialize(conductor.serialize())
+        self.assertIs(conductor._instrument, instrumentation.NULL_INSTRUMENT)
+
+    def test_phase_timings(self):
+        timer = instrumentation.PhaseTimer()
+        spec = native_specs.WorkflowSpec(self.wf_def)
+        conductor = conducting.WorkflowConductor(spec, inputs={'x': 123}, instrument=timer)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        self._run_workflow(conductor)
+
+        expected_phase_counts = {
+            instrumentation.COMPOSE: 1,
+            instrumentation.RENDER_WORKFLOW_INPUT: 1,
+            instrumentation.GET_TASK: 3,
+            instrumentation.PROCESS_TASK_EVENT: 6,
+            instrumentation.EVALUATE_TRANSITION: 2,
+            instrumentation.FINALIZE_CONTEXT: 2,
+            instrumentation.PROCESS_WORKFLOW_EVENT: 6,
+            instrumentation.RENDER_WORKFLOW_OUTPUT: 1
+        }
+
+        self.assert_phase_counts(timer.get_phase_stats(), expected_phase_counts)
+
+        expected_task_phase_counts = {
+            'task1': {
+                instrumentation.GET_TASK: 1,
+                instrumentation.PROCESS_TASK_EVENT: 2,
+                instrumentation.EVALUATE_TRANSITION: 1,
+                instrumentation.FINALIZE_CONTEXT: 1,
+                instrumentation.PROCESS_WORKFLOW_EVENT: 2
+            },
+            'task2': {
+                instrumentation.GET_TASK: 1,
+                instrumentation.PROCESS_TASK_EVENT: 2,
+                instrumentation.EVALUATE_TRANSITION: 1,
+                instrumentation.FINALIZE_CONTEXT: 1,
+                instrumentation.PROCESS_WORKFLOW_EVENT: 2
+            },
+            'task3': {
+                instrumentation.GET_TASK: 1,
+                instrumentation.PROCESS_TASK_EVENT: 2,
+                instrumentation.PROCESS_WORKFLOW_EVENT: 2
+            }
+        }
+
+        for task_id, expected_counts in expected_task_phase_counts.items():
+            self.assert_phase_counts(timer.get_task_stats(task_id, 0), expected_counts)
+
+        stats = timer.get_stats()
+        self.assertListEqual(sorted(stats['tasks'].keys()), ['task1__r0', 'task2__r0', 'task3__r0'])
+        self.assertListEqual(
+            sorted(stats['phases'].keys()),
+            sorted(p for p in instrumentation.PHASES if p not in ['serialize', 'deserialize'])
+        )
+
+        timer.reset()
+        self.assertDictEqual(timer.get_stats(), {'phases': {}, 'tasks': {}})
+
+    def test_serialization_timings(self):
+        timer = instrumentation.PhaseTimer()
+        spec = native_specs.WorkflowSpec(self.wf_def)
+        conductor = conducting.WorkflowConductor(spec, inputs={'x': 123}, instrument=timer)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        data = conductor.serialize()
+        conductor = conducting.WorkflowConductor.deserialize(data, instrument=timer)
+        self.assertIs(conductor._instrument, timer)
+
+        conductor = conducting.WorkflowConductor.deserialize(data, lazy=True, instrument=timer)
+        self.assertIs(conductor._instrument, timer)
+
+        phase_stats = timer.get_phase_stats()
+        self.assertEqual(phase_stats[instrumentation.SERIALIZE]['count'], 1)
+        self.assertEqual(phase_stats[instrumentation.DESERIALIZE]['count'], 2)
+
+        # The lazily restored conductor is measured as the workflow continues.
+        self._run_workflow(conductor)
+        self.assertEqual(timer.get_phase_stats()[instrumentation.GET_TASK]['count'], 3)
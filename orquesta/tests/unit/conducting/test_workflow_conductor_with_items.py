@@ -12,8 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+
 from orquesta import conducting
+from orquesta import events
+from orquesta import results
 from orquesta.specs import native as native_specs
+from orquesta.specs.native.v1 import models as native_models
 from orquesta import statuses
 from orquesta.tests.unit import base as test_base
 
@@ -563,6 +568,137 @@ class WorkflowConductorWithItemsTest(test_base.WorkflowConductorWithItemsTest):
         # Assert the workflow succeeded.
         self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
 
+    def test_items_window_rendering(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - xs
+
+        tasks:
+          task1:
+            with:
+              items: <% ctx(xs) %>
+              concurrency: 3
+            action: core.echo message=<% item() %>
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        xs = ['x%s' % i for i in range(0, 100)]
+        conductor = conducting.WorkflowConductor(spec, inputs={'xs': xs})
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        render_item = native_models.TaskSpec.render_item
+
+        # Ensure only the actions for the items that can be run are rendered.
+        with mock.patch.object(
+                native_models.TaskSpec, 'render_item',
+                autospec=True, side_effect=render_item) as mocked:
+            next_tasks = conductor.get_next_tasks()
+            self.assertEqual(mocked.call_count, 3)
+
+        self.assertEqual(len(next_tasks), 1)
+        self.assertEqual(next_tasks[0]['items_count'], 100)
+        self.assertListEqual([a['item_id'] for a in next_tasks[0]['actions']], [0, 1, 2])
+        self.assertDictEqual(next_tasks[0]['actions'][2]['input'], {'message': 'x2'})
+
+        # Run the items out of order and ensure the window moves along.
+        for item_id in [1, 0]:
+            ac_ex_event = events.ActionExecutionEvent(
+                statuses.RUNNING,
+                context={'item_id': item_id}
+            )
+
+            conductor.update_task_state('task1', 0, ac_ex_event)
+
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([a['item_id'] for a in next_tasks[0]['actions']], [2])
+
+        for item_id in [1, 2]:
+            for status in [statuses.RUNNING, statuses.SUCCEEDED]:
+                ac_ex_event = events.ActionExecutionEvent(
+                    status,
+                    result=item_id,
+                    context={'item_id': item_id}
+                )
+
+                conductor.update_task_state('task1', 0, ac_ex_event)
+
+        next_tasks = conductor.get_next_tasks()
+        self.assertListEqual([a['item_id'] for a in next_tasks[0]['actions']], [3, 4])
+
+        # Ensure all the actions are rendered if the task is requested directly.
+        task = conductor.get_task('task1', 0)
+        self.assertEqual(len(task['actions']), 100)
+        self.assertEqual(task['items_count'], 100)
+
+    def test_items_results_in_result_store(self):
+        wf_def = """
+        version: 1.0
+
+        vars:
+          - xs:
+              - fee
+              - fi
+              - fo
+              - fum
+
+        tasks:
+          task1:
+            with: <% ctx(xs) %>
+            action: core.echo message=<% item() %>
+            next:
+              - publish:
+                  - items: <% result() %>
+
+        output:
+          - items: <% ctx(items) %>
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(spec.inspect(), {})
+
+        store = results.MemoryResultStore()
+        conductor = conducting.WorkflowConductor(spec, result_store=store)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        next_tasks = conductor.get_next_tasks()
+        self.assertEqual(len(next_tasks[0]['actions']), 4)
+
+        for action in next_tasks[0]['actions']:
+            ctx = {'item_id': action['item_id']}
+            ac_ex_event = events.ActionExecutionEvent(statuses.RUNNING, context=ctx)
+            conductor.update_task_state('task1', 0, ac_ex_event)
+
+        for action in next_tasks[0]['actions'][:3]:
+            ctx = {'item_id': action['item_id']}
+            result = action['input']['message']
+            ac_ex_event = events.ActionExecutionEvent(statuses.SUCCEEDED, result, context=ctx)
+            conductor.update_task_state('task1', 0, ac_ex_event)
+
+        # Ensure the staged task only keeps the references to the results.
+        staged_task = conductor.workflow_state.get_staged_task('task1', 0)
+        self.assertEqual(len(store), 3)
+        self.assertNotIn('result', staged_task['items'][0])
+        self.assertEqual(store.get(staged_task['items'][0]['result_ref']), 'fee')
+
+        # Ensure the result store is used after the conductor is restored.
+        conductor = conducting.WorkflowConductor.deserialize(
+            conductor.serialize(),
+            result_store=store
+        )
+
+        ctx = {'item_id': 3}
+        ac_ex_event = events.ActionExecutionEvent(statuses.SUCCEEDED, 'fum', context=ctx)
+        conductor.update_task_state('task1', 0, ac_ex_event)
+
+        # Ensure the results are published and removed from the result store.
+        self.assertEqual(conductor.get_workflow_status(), statuses.SUCCEEDED)
+        self.assertDictEqual(conductor.get_workflow_output(), {'items': ['fee', 'fi', 'fo', 'fum']})
+        self.assertEqual(len(store), 0)
+
     def test_fail_one_and_only_item(self):
         wf_def = """
         version: 1.0
@@ -0,0 +1,265 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent import futures
+
+from orquesta import runner
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+def noop():
+    return None
+
+
+def echo(message=None):
+    return message
+
+
+def add(x, y):
+    return x + y
+
+
+def fail(message=None):
+    raise Exception(message)
+
+
+ACTIONS = {
+    'core.noop': noop,
+    'core.echo': echo,
+    'math.add': add,
+    'core.fail': fail
+}
+
+
+class WorkflowRunnerTest(test_base.WorkflowConductorTest):
+
+    @classmethod
+    def setUpClass(cls):
+        super(WorkflowRunnerTest, cls).setUpClass()
+        cls.thread_pool = futures.ThreadPoolExecutor(max_workers=4)
+        cls.process_pool = futures.ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.thread_pool.shutdown()
+        cls.process_pool.shutdown()
+        super(WorkflowRunnerTest, cls).tearDownClass()
+
+    def assert_run(self, wf_def, executor, inputs=None, expected_workflow_status=None,
+                   expected_output=None, expected_actions=None):
+        wf_spec = native_specs.WorkflowSpec(wf_def)
+        self.assertDictEqual(wf_spec.inspect(), {})
+
+        wf_runner = runner.WorkflowRunner(wf_spec, ACTIONS, executor=executor, inputs=inputs)
+        status = wf_runner.run()
+
+        self.assertEqual(status, expected_workflow_status or statuses.SUCCEEDED)
+
+        if expected_output is not None:
+            self.assertDictEqual(wf_runner.conductor.get_workflow_output(), expected_output)
+
+        stats = wf_runner.get_stats()
+
+        if expected_actions is not None:
+            self.assertEqual(stats['actions'], expected_actions)
+
+        self.assertGreater(stats['elapsed'], 0)
+        self.assertGreaterEqual(stats['elapsed'], stats['conductor_time'])
+        self.assertGreater(stats['calls']['get_next_tasks']['count'], 0)
+        self.assertGreater(stats['calls']['update_task_state']['count'], 0)
+
+        self.assertAlmostEqual(
+            sum(call_stats['time'] for call_stats in stats['calls'].values()),
+            stats['conductor_time']
+        )
+
+        return wf_runner
+
+    def test_sequential(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - x
+          - y
+
+        vars:
+          - total: 0
+
+        output:
+          - total: <% ctx(total) %>
+
+        tasks:
+          init:
+            next:
+              - do: task1
+          task1:
+            action: math.add x=<% ctx(x) %> y=<% ctx(y) %>
+            next:
+              - when: <% succeeded() %>
+                publish: total=<% result() %>
+                do: task2
+          task2:
+            action: math.add
+            input:
+              x: <% ctx(total) %>
+              y: <% ctx(total) %>
+            next:
+              - when: <% succeeded() %>
+                publish: total=<% result() %>
+        """
+
+        for executor in [None, self.thread_pool, self.process_pool]:
+            self.assert_run(
+                wf_def,
+                executor,
+                inputs={'x': 1, 'y': 2},
+                expected_output={'total': 6},
+                expected_actions=2
+            )
+
+    def test_split_and_join(self):
+        wf_def = """
+        version: 1.0
+
+        output:
+          - messages: <% list(ctx(m1), ctx(m2), ctx(m3)) %>
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - do: task2, task3, task4
+          task2:
+            action: core.echo message="foo"
+            next:
+              - publish: m1=<% result() %>
+                do: task5
+          task3:
+            action: core.echo message="bar"
+            next:
+              - publish: m2=<% result() %>
+                do: task5
+          task4:
+            action: core.echo message="fu"
+            next:
+              - publish: m3=<% result() %>
+                do: task5
+          task5:
+            join: all
+            action: core.noop
+        """
+
+        for executor in [None, self.thread_pool, self.process_pool]:
+            wf_runner = self.assert_run(
+                wf_def,
+                executor,
+                expected_output={'messages': ['foo', 'bar', 'fu']},
+                expected_actions=5
+            )
+
+            self.assertEqual(wf_runner.get_stats()['tasks'], 5)
+
+    def test_with_items(self):
+        wf_def = """
+        version: 1.0
+
+        input:
+          - xs
+
+        output:
+          - items: <% ctx(items) %>
+
+        tasks:
+          task1:
+            with:
+              items: <% ctx(xs) %>
+              concurrency: 2
+            action: core.echo message=<% item() %>
+            next:
+              - publish: items=<% result() %>
+        """
+
+        xs = ['fee', 'fi', 'fo', 'fum']
+
+        for executor in [None, self.thread_pool, self.process_pool]:
+            self.assert_run(
+                wf_def,
+                executor,
+                inputs={'xs': xs},
+                expected_output={'items': xs},
+                expected_actions=len(xs)
+            )
+
+    def test_with_empty_items(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            with: <% list() %>
+            action: core.echo message=<% item() %>
+            next:
+              - do: task2
+          task2:
+            action: core.noop
+        """
+
+        self.assert_run(wf_def, self.thread_pool, expected_actions=1)
+
+    def test_action_failed(self):
+        wf_def = """
+        version: 1.0
+
+        output:
+          - error: <% ctx(error) %>
+
+        tasks:
+          task1:
+            action: core.fail message="boom"
+            next:
+              - when: <% failed() %>
+                publish: error=<% result().error %>
+                do: fail
+        """
+
+        for executor in [None, self.thread_pool, self.process_pool]:
+            self.assert_run(
+                wf_def,
+                executor,
+                expected_workflow_status=statuses.FAILED,
+                expected_output={'error': 'Exception: boom'},
+                expected_actions=1
+            )
+
+    def test_action_not_found(self):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.foobar
+        """
+
+        wf_runner = self.assert_run(
+            wf_def,
+            self.thread_pool,
+            expected_workflow_status=statuses.FAILED,
+            expected_actions=0
+        )
+
+        task_state_entry = wf_runner.conductor.get_task_state_entry('task1', 0)
+        self.assertEqual(task_state_entry['status'], statuses.FAILED)
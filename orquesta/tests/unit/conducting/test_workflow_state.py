@@ -0,0 +1,344 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+import mock
+
+from concurrent import futures
+
+from orquesta import conducting
+from orquesta import exceptions as exc
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+from orquesta.tests.unit import base as test_base
+
+
+class WorkflowStateTest(test_base.WorkflowConductorTest):
+
+    def _prep_conductor(self, status=None):
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - do: task2, task3
+          task2:
+            action: core.noop
+          task3:
+            action: core.noop
+        """
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+
+        if status:
+            conductor.request_workflow_status(status)
+
+        return conductor
+
+    def test_get_tasks_by_status(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+        self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING])
+        self.forward_task_statuses(conductor, 'task3', [statuses.RUNNING])
+
+        wf_state = conductor.workflow_state
+
+        actual = [t['id'] for t in wf_state.get_tasks_by_status([statuses.RUNNING])]
+        self.assertListEqual(actual, ['task2', 'task3'])
+
+        actual = [t['id'] for t in wf_state.get_tasks_by_status([statuses.SUCCEEDED])]
+        self.assertListEqual(actual, ['task1'])
+
+        self.assertTrue(wf_state.has_active_tasks)
+        self.assertFalse(wf_state.has_paused_tasks)
+
+        self.forward_task_statuses(conductor, 'task2', [statuses.SUCCEEDED])
+        self.forward_task_statuses(conductor, 'task3', [statuses.PAUSED])
+
+        actual = [t['id'] for t in wf_state.get_tasks_by_status([statuses.SUCCEEDED])]
+        self.assertListEqual(actual, ['task1', 'task2'])
+
+        self.assertFalse(wf_state.has_active_tasks)
+        self.assertTrue(wf_state.has_paused_tasks)
+        self.assertEqual(conductor.get_workflow_status(), statuses.PAUSED)
+
+    def test_get_tasks_by_status_after_deserialization(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+        self.forward_task_statuses(conductor, 'task2', [statuses.RUNNING])
+        self.forward_task_statuses(conductor, 'task3', [statuses.RUNNING, statuses.CANCELING])
+
+        wf_state = conducting.WorkflowState.deserialize(conductor.workflow_state.serialize())
+
+        actual = [t['id'] for t in wf_state.get_tasks_by_status(statuses.ACTIVE_STATUSES)]
+        self.assertListEqual(actual, ['task2', 'task3'])
+
+        self.assertTrue(wf_state.has_active_tasks)
+        self.assertTrue(wf_state.has_canceling_tasks)
+        self.assertFalse(wf_state.has_canceled_tasks)
+        self.assertFalse(wf_state.has_pausing_tasks)
+
+    def test_update_task_status_not_indexed(self):
+        wf_state = conducting.WorkflowState()
+        task_state_entry = {'id': 'task1', 'route': 0, 'status': statuses.RUNNING}
+        wf_state.add_task_state_entry(task_state_entry)
+
+        # Ensure an entry that is not the entry in the index is not updated.
+        copied_task_state_entry = copy.deepcopy(task_state_entry)
+        other_task_state_entry = {'id': 'task2', 'route': 0}
+
+        for entry in [copied_task_state_entry, other_task_state_entry]:
+            self.assertRaises(
+                exc.InvalidTaskStateEntry,
+                wf_state.update_task_status,
+                entry,
+                statuses.SUCCEEDED
+            )
+
+        self.assertNotIn('status', other_task_state_entry)
+        self.assertEqual(copied_task_state_entry['status'], statuses.RUNNING)
+        self.assertListEqual(wf_state.get_tasks_by_status([statuses.SUCCEEDED]), [])
+
+        wf_state.update_task_status(task_state_entry, statuses.SUCCEEDED)
+        self.assertListEqual(wf_state.get_tasks_by_status([statuses.RUNNING]), [])
+        self.assertListEqual(
+            wf_state.get_tasks_by_status([statuses.SUCCEEDED]),
+            [task_state_entry]
+        )
+
+    def test_staged_tasks(self):
+        wf_state = conducting.WorkflowState()
+        wf_state.add_staged_task('task1', 0)
+        wf_state.add_staged_task('task2', 0, ready=False)
+        wf_state.add_staged_task('task3', 1)
+
+        self.assertEqual(wf_state.get_staged_task('task2', 0)['id'], 'task2')
+        self.assertIsNone(wf_state.get_staged_task('task2', 1))
+        self.assertListEqual([t['id'] for t in wf_state.get_staged_tasks()], ['task1', 'task3'])
+        self.assertTrue(wf_state.has_staged_tasks)
+
+        wf_state.set_staged_task_ready('task2', 0)
+        expected = ['task1', 'task2', 'task3']
+        self.assertListEqual([t['id'] for t in wf_state.get_staged_tasks()], expected)
+        self.assertTrue(wf_state.get_staged_task('task2', 0)['ready'])
+
+        wf_state.remove_staged_task('task1', 0)
+        wf_state.remove_staged_task('task3', 1)
+        self.assertListEqual([t['id'] for t in wf_state.staged], ['task2'])
+
+        wf_state.set_staged_task_ready('task2', 0, ready=False)
+        self.assertListEqual(wf_state.get_staged_tasks(), [])
+        self.assertFalse(wf_state.has_staged_tasks)
+
+    def test_staged_tasks_serialization(self):
+        wf_state = conducting.WorkflowState()
+        wf_state.add_staged_task('task1', 0, ready=False)
+        wf_state.add_staged_task('task2', 0)
+
+        data = wf_state.serialize()
+        self.assertListEqual([t['id'] for t in data['staged']], ['task1', 'task2'])
+
+        wf_state = conducting.WorkflowState.deserialize(data)
+        self.assertListEqual(wf_state.serialize()['staged'], data['staged'])
+        self.assertListEqual([t['id'] for t in wf_state.get_staged_tasks()], ['task2'])
+        self.assertEqual(wf_state.get_staged_task('task1', 0), data['staged'][0])
+
+    def test_workflow_state_view(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING])
+
+        wf_state = conductor.workflow_state
+        view = conducting.WorkflowStateView(wf_state)
+
+        self.assertIs(view['sequence'], wf_state.sequence)
+        self.assertIs(view['tasks'], wf_state.tasks)
+        self.assertEqual(view['status'], statuses.RUNNING)
+        self.assertRaises(KeyError, view.__getitem__, 'foobar')
+        self.assertIs(copy.deepcopy(view), view)
+        self.assertDictEqual(dict(view), view.serialize())
+
+        # The view reads through to the latest workflow state.
+        self.forward_task_statuses(conductor, 'task1', [statuses.SUCCEEDED])
+        self.assertEqual(view['sequence'][0]['status'], statuses.SUCCEEDED)
+        self.assertDictEqual(view.serialize(), wf_state.serialize())
+
+    def test_task_context_has_workflow_state_snapshot(self):
+        conductor = self._prep_conductor(status=statuses.RUNNING)
+        task = conductor.get_task('task1', 0)
+        next_task = conductor.get_next_tasks()[0]
+
+        for wf_state in [task['ctx']['__state'], next_task['ctx']['__state']]:
+            self.assertIsInstance(wf_state, dict)
+            self.assertDictEqual(wf_state, conductor.workflow_state.serialize())
+            json.dumps(wf_state)
+
+        # The snapshot does not change as the later events are applied.
+        expected_wf_state = copy.deepcopy(task['ctx']['__state'])
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+        self.assertDictEqual(task['ctx']['__state'], expected_wf_state)
+        self.assertDictEqual(next_task['ctx']['__state'], expected_wf_state)
+        self.assertNotEqual(conductor.workflow_state.serialize(), expected_wf_state)
+
+    def test_next_tasks_share_workflow_state_snapshot(self):
+        task_names = ['task%s' % i for i in range(2, 32)]
+
+        wf_def = """
+        version: 1.0
+
+        tasks:
+          task1:
+            action: core.noop
+            next:
+              - do: %s
+        """ % ', '.join(task_names)
+
+        for task_name in task_names:
+            wf_def += """
+          %s:
+            action: core.noop
+            """ % task_name
+
+        spec = native_specs.WorkflowSpec(wf_def)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        self.forward_task_statuses(conductor, 'task1', [statuses.RUNNING, statuses.SUCCEEDED])
+
+        executor = futures.ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(executor.shutdown)
+
+        # The workflow state is serialized once for the batch instead of once for each task.
+        for kwargs in [{}, {'executor': executor}]:
+            with mock.patch.object(
+                    conducting.WorkflowState,
+                    'serialize',
+                    autospec=True,
+                    side_effect=conducting.WorkflowState.serialize) as serialize:
+                next_tasks = conductor.get_next_tasks(**kwargs)
+
+            self.assertEqual(len(next_tasks), 30)
+            self.assertEqual(serialize.call_count, 1)
+
+            for next_task in next_tasks:
+                self.assertIs(next_task['ctx']['__state'], next_tasks[0]['ctx']['__state'])
+
+            self.assertDictEqual(
+                next_tasks[0]['ctx']['__state'],
+                conductor.workflow_state.serialize()
+            )
+
+    def test_routes(self):
+        wf_state = conducting.WorkflowState()
+
+        self.assertEqual(wf_state.add_route([]), 0)
+        self.assertEqual(wf_state.add_route(['t2__t0']), 1)
+        self.assertEqual(wf_state.add_route(['t3__t0']), 2)
+        self.assertEqual(wf_state.add_route(['t2__t0', 't5__t0']), 3)
+        self.assertEqual(wf_state.add_route(['t3__t0', 't5__t0']), 4)
+
+        # Identical routes are added again as new routes.
+        self.assertEqual(wf_state.add_route(['t2__t0']), 5)
+        self.assertEqual(len(wf_state.routes), 6)
+
+        expected_parents = [None, 0, 0, 1, 2, 1]
+
+        self.assertListEqual([wf_state.get_parent_route(i) for i in range(0, 6)], expected_parents)
+        self.assertIsNone(wf_state.get_parent_route(6))
+
+        # Ensure the route index is rebuilt on deserialization.
+        wf_state = conducting.WorkflowState.deserialize(wf_state.serialize())
+
+        self.assertListEqual([wf_state.get_parent_route(i) for i in range(0, 6)], expected_parents)
+        self.assertEqual(wf_state.add_route(['t2__t0', 't6__t0']), 6)
+        self.assertEqual(wf_state.get_parent_route(6), 5)
+
+        # Ensure the route index is updated when a patch is applied.
+        replica = conducting.WorkflowState.deserialize(wf_state.serialize())
+        wf_state.checkpoint()
+        wf_state.add_route(['t3__t0', 't6__t0'])
+        replica.apply_patch(wf_state.serialize_patch())
+
+        self.assertListEqual(replica.routes, wf_state.routes)
+        self.assertEqual(replica.get_parent_route(7), 2)
+
+    def test_staged_task_items_status(self):
+        wf_state = conducting.WorkflowState()
+        wf_state.add_staged_task('task1', 0)
+        wf_state.set_staged_task_items('task1', 0, 3)
+
+        expected = {statuses.UNSET: 3}
+        actual = wf_state.get_staged_task_items_status('task1', 0)
+        self.assertDictEqual(dict(actual), expected)
+
+        wf_state.update_staged_task_item('task1', 0, 0, statuses.RUNNING)
+        wf_state.update_staged_task_item('task1', 0, 1, statuses.RUNNING)
+        wf_state.update_staged_task_item('task1', 0, 1, statuses.SUCCEEDED, result='foobar')
+
+        expected_items = [
+            {'status': statuses.RUNNING, 'result': None},
+            {'status': statuses.SUCCEEDED, 'result': 'foobar'},
+            {'status': statuses.UNSET}
+        ]
+
+        self.assertListEqual(wf_state.get_staged_task('task1', 0)['items'], expected_items)
+
+        expected = {statuses.UNSET: 1, statuses.RUNNING: 1, statuses.SUCCEEDED: 1}
+        actual = {k: v for k, v in wf_state.get_staged_task_items_status('task1', 0).items() if v}
+        self.assertDictEqual(actual, expected)
+
+        # Ensure the counts are rebuilt on deserialization.
+        wf_state = conducting.WorkflowState.deserialize(wf_state.serialize())
+        actual = wf_state.get_staged_task_items_status('task1', 0)
+        self.assertDictEqual(dict(actual), expected)
+
+        # Ensure the counts are rebuilt when a patch is applied.
+        replica = conducting.WorkflowState.deserialize(wf_state.serialize())
+        wf_state.update_staged_task_item('task1', 0, 2, statuses.RUNNING)
+        replica.apply_patch(wf_state.serialize_patch())
+        expected = {statuses.RUNNING: 2, statuses.SUCCEEDED: 1}
+        actual = {k: v for k, v in replica.get_staged_task_items_status('task1', 0).items() if v}
+        self.assertDictEqual(actual, expected)
+
+        # Ensure the staged task is not removed while there are active items.
+        wf_state.remove_staged_task('task1', 0)
+        self.assertIsNotNone(wf_state.get_staged_task('task1', 0))
+
+        wf_state.update_staged_task_item('task1', 0, 0, statuses.SUCCEEDED)
+        wf_state.update_staged_task_item('task1', 0, 2, statuses.SUCCEEDED)
+        wf_state.remove_staged_task('task1', 0)
+        self.assertIsNone(wf_state.get_staged_task('task1', 0))
+        self.assertDictEqual(dict(wf_state.get_staged_task_items_status('task1', 0)), {})
+
+    def test_staged_task_items_for_task_not_staged(self):
+        wf_state = conducting.WorkflowState()
+
+        self.assertRaises(
+            exc.InvalidTaskStateEntry,
+            wf_state.set_staged_task_items,
+            'task1',
+            0,
+            3
+        )
+
+        self.assertRaises(
+            exc.InvalidTaskStateEntry,
+            wf_state.update_staged_task_item,
+            'task1',
+            0,
+            0,
+            statuses.RUNNING
+        )
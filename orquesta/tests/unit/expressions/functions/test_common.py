@@ -16,6 +16,7 @@ import unittest
 
 from orquesta import exceptions as exc
 from orquesta.expressions.functions import common as funcs
+from orquesta import values
 
 
 class CommonFunctionTest(unittest.TestCase):
@@ -151,3 +152,33 @@ class CommonFunctionTest(unittest.TestCase):
             data,
             '__state'
         )
+
+    def test_ctx_resolve_value_refs(self):
+        value_store = values.SQLiteValueStore(':memory:', threshold=10)
+        xs = ['foobar'] * 10
+        ref = value_store.put(xs)
+
+        data = {
+            '__vars': {
+                'a': 123,
+                'e': {'foobar': 'fubar', 'xs': ref},
+                'f': ref,
+                '__value_store': value_store
+            }
+        }
+
+        self.assertEqual(funcs.ctx_(data, 'a'), 123)
+        self.assertDictEqual(funcs.ctx_(data, 'e'), {'foobar': 'fubar', 'xs': xs})
+        self.assertListEqual(funcs.ctx_(data, 'f'), xs)
+
+        expected_data = {
+            'a': 123,
+            'e': {'foobar': 'fubar', 'xs': xs},
+            'f': xs
+        }
+
+        self.assertDictEqual(funcs.ctx_(data), expected_data)
+
+        # Ensure the references are returned as is if there is no value store.
+        del data['__vars']['__value_store']
+        self.assertEqual(funcs.ctx_(data, 'f'), ref)
@@ -15,6 +15,7 @@
 import copy
 import unittest
 
+from orquesta import conducting
 from orquesta import constants
 from orquesta import exceptions as exc
 from orquesta.expressions.functions import workflow as funcs
@@ -315,6 +316,54 @@ class WorkflowFunctionTest(unittest.TestCase):
         self.assertEqual(funcs.task_status_(current_ctx, 't5'), statuses.FAILED)
         self.assertEqual(funcs.task_status_(current_ctx, 't6'), statuses.FAILED)
 
+    def test_task_status_of_tasks_along_split_using_route_index(self):
+        task_pointers = {
+            't1__r0': 0,
+            't2__r0': 1,
+            't3__r0': 2,
+            't4__r1': 3,
+            't4__r2': 4
+        }
+
+        task_flow_entries = [
+            {'id': 't1', 'route': 0, 'status': statuses.SUCCEEDED},
+            {'id': 't2', 'route': 0, 'status': statuses.SUCCEEDED},
+            {'id': 't3', 'route': 0, 'status': statuses.FAILED},
+            {'id': 't4', 'route': 1, 'status': statuses.SUCCEEDED},
+            {'id': 't4', 'route': 2, 'status': statuses.FAILED}
+        ]
+
+        routes = [
+            [],
+            ['t2__t0'],
+            ['t3__t0']
+        ]
+
+        wf_state = conducting.WorkflowState.deserialize(
+            {
+                'tasks': task_pointers,
+                'sequence': task_flow_entries,
+                'routes': routes
+            }
+        )
+
+        context = {'__state': conducting.WorkflowStateView(wf_state)}
+
+        # Check the task statuses along route 1.
+        current_ctx = copy.deepcopy(context)
+        current_ctx['__current_task'] = {'id': 't4', 'route': 1}
+        self.assertEqual(funcs.task_status_(current_ctx, 't1'), statuses.SUCCEEDED)
+        self.assertEqual(funcs.task_status_(current_ctx, 't3'), statuses.FAILED)
+        self.assertEqual(funcs.task_status_(current_ctx, 't4'), statuses.SUCCEEDED)
+        self.assertEqual(funcs.task_status_(current_ctx, 't5'), statuses.UNSET)
+
+        # Check the task statuses along route 2.
+        current_ctx = copy.deepcopy(context)
+        current_ctx['__current_task'] = {'id': 't4', 'route': 2}
+        self.assertEqual(funcs.task_status_(current_ctx, 't2'), statuses.SUCCEEDED)
+        self.assertEqual(funcs.task_status_(current_ctx, 't4'), statuses.FAILED)
+        self.assertEqual(funcs.task_status_(current_ctx, 't5'), statuses.UNSET)
+
     def test_task_status_of_tasks_along_splits(self):
         task_pointers = {
             't1__r0': 0,
@@ -0,0 +1,107 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from orquesta.expressions import yql as yaql_expr
+from orquesta.tests.unit import base as test_base
+
+
+class YAQLExpressionCacheTest(test_base.ExpressionEvaluatorTest):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.language = 'yaql'
+        super(YAQLExpressionCacheTest, cls).setUpClass()
+
+    def setUp(self):
+        super(YAQLExpressionCacheTest, self).setUp()
+        yaql_expr.get_expression_cache().clear()
+
+    def tearDown(self):
+        yaql_expr.get_expression_cache().size = yaql_expr.DEFAULT_EXPRESSION_CACHE_SIZE
+        yaql_expr.get_expression_cache().clear()
+        super(YAQLExpressionCacheTest, self).tearDown()
+
+    def test_evaluate_and_validate_share_cache(self):
+        cache = yaql_expr.get_expression_cache()
+
+        self.assertListEqual([], self.evaluator.validate('<% ctx(foo) %>'))
+        self.assertIn('ctx(foo)', cache)
+
+        parsed = cache.get('ctx(foo)')
+        self.assertIs(self.evaluator.parse('ctx(foo)'), parsed)
+
+        self.assertEqual(self.evaluator.evaluate('<% ctx(foo) %>', {'foo': 'bar'}), 'bar')
+        self.assertEqual(self.evaluator.evaluate('<% ctx(foo) %>', {'foo': 'fu'}), 'fu')
+        self.assertEqual(len(cache), 1)
+
+        expected_stats = {
+            'size': 1,
+            'limit': yaql_expr.DEFAULT_EXPRESSION_CACHE_SIZE,
+            'hits': 4,
+            'misses': 1,
+            'evictions': 0,
+            'hit_rate': 0.8
+        }
+
+        self.assertDictEqual(cache.get_stats(), expected_stats)
+
+    def test_parse_error_not_cached(self):
+        cache = yaql_expr.get_expression_cache()
+
+        expr = '<% <% ctx().foo %> %>'
+        self.assertEqual(len(self.evaluator.validate(expr)), 1)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get_stats()['misses'], 1)
+
+    def test_cache_eviction(self):
+        cache = yaql_expr.get_expression_cache()
+        cache.size = 2
+
+        parsed = [self.evaluator.parse('ctx(x%s)' % i) for i in range(0, 3)]
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('ctx(x0)', cache)
+
+        # The least recently used expression is evicted.
+        self.assertIsNot(self.evaluator.parse('ctx(x0)'), parsed[0])
+        self.assertIs(self.evaluator.parse('ctx(x0)'), cache.get('ctx(x0)'))
+        self.assertNotIn('ctx(x1)', cache)
+
+        # The cached expressions are evaluated with different contexts.
+        self.assertEqual(self.evaluator.evaluate('<% ctx(x2) %>', {'x2': 1}), 1)
+        self.assertEqual(self.evaluator.evaluate('<% ctx(x2) %>', {'x2': 2}), 2)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['limit'], 2)
+        self.assertEqual(stats['misses'], 4)
+        self.assertEqual(stats['evictions'], 2)
+
+    def test_cache_disabled(self):
+        cache = yaql_expr.get_expression_cache()
+        cache.size = 0
+
+        self.assertEqual(self.evaluator.evaluate('<% ctx(foo) %>', {'foo': 'bar'}), 'bar')
+        self.assertEqual(self.evaluator.evaluate('<% ctx(foo) %>', {'foo': 'bar'}), 'bar')
+        self.assertEqual(len(cache), 0)
+
+        expected_stats = {
+            'size': 0,
+            'limit': 0,
+            'hits': 0,
+            'misses': 2,
+            'evictions': 2,
+            'hit_rate': 0.0
+        }
+
+        self.assertDictEqual(cache.get_stats(), expected_stats)
@@ -0,0 +1,94 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+
+from orquesta import graphing
+from orquesta.graphs import compact
+from orquesta.tests.unit.graphing import test_workflow_graph
+
+
+class CompactWorkflowGraphTest(test_workflow_graph.WorkflowGraphTest):
+    graph_cls = compact.CompactWorkflowGraph
+
+    def _add_duplicate_edges(self, wf_graph, source, destination):
+        wf_graph._add_edge(source, destination)
+        wf_graph._add_edge(source, destination)
+
+    def test_get_graph_backend(self):
+        self.assertEqual(graphing.get_graph_backend(), graphing.WorkflowGraph)
+        self.assertEqual(graphing.get_graph_backend('networkx'), graphing.WorkflowGraph)
+        self.assertEqual(graphing.get_graph_backend('compact'), compact.CompactWorkflowGraph)
+
+    def test_serialize_same_as_networkx(self):
+        nx_graph = graphing.WorkflowGraph()
+        self._add_tasks(nx_graph)
+        self._add_transitions(nx_graph)
+        self._add_barriers(nx_graph)
+        nx_graph.add_transition('task1', 'task2', attr1='fubar')
+        nx_graph.add_transition('task6', 'task1')
+
+        wf_graph = self._prep_graph()
+        wf_graph.add_transition('task1', 'task2', attr1='fubar')
+        wf_graph.add_transition('task6', 'task1')
+
+        self.assert_graph_equal(wf_graph, nx_graph.serialize())
+        self.assertListEqual(wf_graph.get_cycles(), nx_graph.get_cycles())
+
+        for i in range(1, 10):
+            task_id = 'task%s' % i
+
+            self.assertListEqual(
+                wf_graph.get_next_transitions(task_id),
+                nx_graph.get_next_transitions(task_id)
+            )
+
+            self.assertListEqual(
+                sorted(wf_graph.get_prev_transitions(task_id)),
+                sorted(nx_graph.get_prev_transitions(task_id))
+            )
+
+    def test_deserialize_from_networkx(self):
+        nx_graph = graphing.WorkflowGraph()
+        self._add_tasks(nx_graph)
+        self._add_transitions(nx_graph)
+        self._add_barriers(nx_graph)
+
+        wf_graph = self.graph_cls.deserialize(nx_graph.serialize())
+
+        self.assert_graph_equal(wf_graph, nx_graph.serialize())
+        self.assertTrue(wf_graph.has_barrier('task5'))
+        self.assertListEqual(wf_graph.roots, nx_graph.roots)
+        self.assertListEqual(wf_graph.leaves, nx_graph.leaves)
+
+        # Ensure the graph can be extended after deserialization.
+        wf_graph.add_transition('task9', 'task10')
+        self.assertTrue(wf_graph.has_task('task10'))
+        self.assertEqual(len(wf_graph.get_prev_transitions('task10')), 1)
+
+    def test_networkx_not_imported(self):
+        self.assertNotIsInstance(self._prep_graph(), graphing.WorkflowGraph)
+
+        script = (
+            'import sys; '
+            'from orquesta import graphing; '
+            'wf_graph = graphing.get_graph_backend("compact")(); '
+            'wf_graph.add_transition("task1", "task2"); '
+            'wf_graph.add_transition("task2", "task1"); '
+            'wf_graph.get_cycles(); '
+            'sys.exit(1 if "networkx" in sys.modules else 0)'
+        )
+
+        self.assertEqual(subprocess.call([sys.executable, '-c', script]), 0)
@@ -116,6 +116,7 @@ EXPECTED_WF_GRAPH = {
 
 
 class WorkflowGraphTest(test_base.WorkflowGraphTest):
+    graph_cls = graphing.WorkflowGraph
 
     def _add_tasks(self, wf_graph):
         for i in range(1, 10):
@@ -136,8 +137,12 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
     def _add_barriers(self, wf_graph):
         wf_graph.update_task('task5', barrier='*')
 
+    def _add_duplicate_edges(self, wf_graph, source, destination):
+        wf_graph._graph.add_edge(source, destination)
+        wf_graph._graph.add_edge(source, destination)
+
     def _prep_graph(self):
-        wf_graph = graphing.WorkflowGraph()
+        wf_graph = self.graph_cls()
 
         self._add_tasks(wf_graph)
         self._add_transitions(wf_graph)
@@ -170,7 +175,7 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
         self.assertListEqual(wf_graph.roots, expected_roots)
 
     def test_skip_add_tasks(self):
-        wf_graph = graphing.WorkflowGraph()
+        wf_graph = self.graph_cls()
 
         self._add_transitions(wf_graph)
         self._add_barriers(wf_graph)
@@ -282,6 +287,21 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
         expected = ('task2', 'task3', 0, {})
         self.assertEqual(wf_graph.get_transition('task2', 'task3'), expected)
 
+    def test_get_transition_by_key(self):
+        wf_graph = self._prep_graph()
+        wf_graph.add_transition('task1', 'task2', attr1='fubar')
+
+        expected = ('task1', 'task2', 1, {'attr1': 'fubar'})
+        self.assertEqual(wf_graph.get_transition('task1', 'task2', key=1), expected)
+
+        self.assertRaises(
+            exc.InvalidTaskTransition,
+            wf_graph.get_transition,
+            'task1',
+            'task2',
+            key=2
+        )
+
     def test_get_nonexistent_transition(self):
         wf_graph = self._prep_graph()
 
@@ -301,12 +321,11 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
         )
 
     def test_get_ambiguous_transition(self):
-        wf_graph = graphing.WorkflowGraph()
+        wf_graph = self.graph_cls()
 
         self._add_tasks(wf_graph)
 
-        wf_graph._graph.add_edge('task1', 'task2')
-        wf_graph._graph.add_edge('task1', 'task2')
+        self._add_duplicate_edges(wf_graph, 'task1', 'task2')
 
         self.assertRaises(
             exc.AmbiguousTaskTransition,
@@ -330,6 +349,40 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
             sorted(expected_transitions)
         )
 
+    def test_get_next_transitions_after_changes(self):
+        wf_graph = self._prep_graph()
+
+        # Lookup the transitions first so they are indexed.
+        self.assertEqual(len(wf_graph.get_next_transitions('task1')), 4)
+        self.assertEqual(len(wf_graph.get_prev_transitions('task3')), 1)
+
+        wf_graph.add_transition('task1', 'task3')
+        wf_graph.update_transition('task1', 'task2', 0, attr1='fubar')
+
+        expected_transitions = [
+            ('task1', 'task2', 0, {'attr1': 'fubar'}),
+            ('task1', 'task3', 0, {}),
+            ('task1', 'task4', 0, {}),
+            ('task1', 'task7', 0, {}),
+            ('task1', 'task9', 0, {})
+        ]
+
+        self.assertListEqual(wf_graph.get_next_transitions('task1'), expected_transitions)
+
+        expected_transitions = [
+            ('task1', 'task3', 0, {}),
+            ('task2', 'task3', 0, {})
+        ]
+
+        self.assertListEqual(
+            sorted(wf_graph.get_prev_transitions('task3')),
+            expected_transitions
+        )
+
+        # The returned list can be changed without affecting the index.
+        wf_graph.get_next_transitions('task1').pop()
+        self.assertEqual(len(wf_graph.get_next_transitions('task1')), 5)
+
     def test_get_prev_transitions(self):
         wf_graph = self._prep_graph()
 
@@ -361,3 +414,55 @@ class WorkflowGraphTest(test_base.WorkflowGraphTest):
             len(wf_graph.get_prev_transitions('task9')) > 1 and
             not wf_graph.has_barrier('task9')
         )
+
+    def test_cycles(self):
+        wf_graph = self._prep_graph()
+
+        self.assertListEqual(wf_graph.get_cycles(), [])
+        self.assertListEqual(wf_graph.in_cycle('task2'), [])
+
+        # Adding transitions resets the cycles identified previously.
+        wf_graph.add_transition('task3', 'task2')
+        wf_graph.add_transition('task6', 'task6')
+
+        expected_cycles = [
+            {
+                'tasks': ['task2', 'task3'],
+                'route': [('task2', 'task3', 0), ('task3', 'task2', 0)]
+            },
+            {
+                'tasks': ['task6'],
+                'route': [('task6', 'task6', 0)]
+            }
+        ]
+
+        self.assertListEqual(wf_graph.get_cycles(), expected_cycles)
+        self.assertListEqual(wf_graph.in_cycle('task2'), [['task2', 'task3']])
+        self.assertListEqual(wf_graph.in_cycle('task3'), [['task2', 'task3']])
+        self.assertListEqual(wf_graph.in_cycle('task6'), [['task6']])
+        self.assertListEqual(wf_graph.in_cycle('task1'), [])
+
+        self.assertFalse(wf_graph.is_cycle_closed(expected_cycles[0]))
+        self.assertTrue(wf_graph.is_cycle_closed(expected_cycles[1]))
+        self.assertTrue(wf_graph.is_cycle_closed({'tasks': ['task6', 'task9']}))
+
+        # Check the cycles are identified after deserialization.
+        wf_graph = self.graph_cls.deserialize(wf_graph.serialize())
+        self.assertListEqual(wf_graph.get_cycles(), expected_cycles)
+
+    def test_overlapping_cycles(self):
+        wf_graph = self.graph_cls()
+
+        # Each retry loop shares the task1 and adds another cycle to the graph.
+        for i in range(2, 30):
+            wf_graph.add_transition('task1', 'task%s' % i)
+            wf_graph.add_transition('task%s' % i, 'task1')
+
+        wf_graph.add_transition('task1', 'task30')
+
+        cycles = wf_graph.get_cycles()
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(len(cycles[0]['tasks']), 29)
+        self.assertFalse(wf_graph.is_cycle_closed(cycles[0]))
+        self.assertTrue(wf_graph.in_cycle('task29'))
+        self.assertFalse(wf_graph.in_cycle('task30'))
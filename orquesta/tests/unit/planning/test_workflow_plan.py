@@ -0,0 +1,197 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest
+
+from orquesta import conducting
+from orquesta import planning
+from orquesta.specs import native as native_specs
+from orquesta import statuses
+
+
+WF_DEF = """
+version: 1.0
+
+tasks:
+  task1:
+    action: core.noop
+    next:
+      - do: task2, task3
+  task2:
+    action: core.noop
+    next:
+      - do: task4
+  task3:
+    action: core.noop
+    next:
+      - do: task4
+  task4:
+    join: all
+    action: core.noop
+    next:
+      - when: <% ctx().retry %>
+        do: task5
+  task5:
+    action: core.noop
+    next:
+      - do: task6
+  task6:
+    action: core.noop
+    next:
+      - do: task5
+"""
+
+
+class WorkflowPlanTest(unittest.TestCase):
+
+    def setUp(self):
+        super(WorkflowPlanTest, self).setUp()
+        planning.get_plan_cache().clear()
+
+    def tearDown(self):
+        planning.get_plan_cache().size = planning.DEFAULT_PLAN_CACHE_SIZE
+        planning.get_plan_cache().clear()
+        super(WorkflowPlanTest, self).tearDown()
+
+    def test_plan_lookups(self):
+        spec = native_specs.WorkflowSpec(WF_DEF)
+        conductor = conducting.WorkflowConductor(spec)
+        plan = conductor.plan
+        graph = conductor.graph
+
+        self.assertIs(graph, plan.graph)
+        self.assertTrue(plan.has_task('task1'))
+        self.assertFalse(plan.has_task('task7'))
+
+        for task_id in ['task1', 'task2', 'task3', 'task4', 'task5', 'task6']:
+            self.assertListEqual(
+                plan.get_next_transitions(task_id),
+                graph.get_next_transitions(task_id)
+            )
+
+            self.assertListEqual(
+                plan.get_prev_transitions(task_id),
+                graph.get_prev_transitions(task_id)
+            )
+
+            self.assertEqual(plan.get_barrier(task_id), graph.get_barrier(task_id))
+            self.assertEqual(plan.has_barrier(task_id), graph.has_barrier(task_id))
+            self.assertEqual(plan.is_split_task(task_id), spec.tasks.is_split_task(task_id))
+            self.assertEqual(plan.in_cycle(task_id), len(graph.in_cycle(task_id)) > 0)
+
+        self.assertTrue(plan.has_barrier('task4'))
+        self.assertFalse(plan.in_cycle('task4'))
+        self.assertTrue(plan.in_cycle('task5'))
+
+    def test_plan_shared_by_conductors(self):
+        cache = planning.get_plan_cache()
+        spec = native_specs.WorkflowSpec(WF_DEF)
+        conductor1 = conducting.WorkflowConductor(spec)
+        conductor1.request_workflow_status(statuses.RUNNING)
+
+        expected_stats = {
+            'size': 1,
+            'limit': 128,
+            'hits': 0,
+            'misses': 1,
+            'evictions': 0,
+            'hit_rate': 0.0
+        }
+        self.assertDictEqual(cache.get_stats(), expected_stats)
+
+        # A new conductor for the same workflow definition shares the plan.
+        conductor2 = conducting.WorkflowConductor(native_specs.WorkflowSpec(WF_DEF))
+        self.assertIs(conductor2.plan, conductor1.plan)
+        self.assertIs(conductor2.graph, conductor1.graph)
+
+        # A deserialized conductor for the same workflow definition shares the plan.
+        conductor3 = conducting.WorkflowConductor.deserialize(conductor1.serialize())
+        self.assertIs(conductor3.plan, conductor1.plan)
+        self.assertIs(conductor3.graph, conductor1.graph)
+
+        expected_stats = {
+            'size': 1,
+            'limit': 128,
+            'hits': 2,
+            'misses': 1,
+            'evictions': 0,
+            'hit_rate': 2.0 / 3
+        }
+        self.assertDictEqual(cache.get_stats(), expected_stats)
+
+    def test_plan_not_shared_for_different_graph(self):
+        spec = native_specs.WorkflowSpec(WF_DEF)
+        conductor1 = conducting.WorkflowConductor(spec)
+        conductor1.request_workflow_status(statuses.RUNNING)
+
+        data = conductor1.serialize()
+        data['graph']['nodes'][3]['barrier'] = 1
+
+        conductor2 = conducting.WorkflowConductor.deserialize(data)
+        self.assertIsNot(conductor2.plan, conductor1.plan)
+        self.assertEqual(conductor2.plan.get_barrier('task4'), 1)
+
+    def test_plan_cache_eviction(self):
+        cache = planning.get_plan_cache()
+        cache.size = 2
+
+        specs = [
+            native_specs.WorkflowSpec(WF_DEF.replace('core.noop', 'core.echo%s' % i))
+            for i in range(0, 3)
+        ]
+
+        plans = [conducting.WorkflowConductor(spec).plan for spec in specs]
+        self.assertEqual(len(cache), 2)
+
+        # The least recently used plan is evicted.
+        self.assertIsNot(conducting.WorkflowConductor(specs[0]).plan, plans[0])
+        self.assertIs(conducting.WorkflowConductor(specs[2]).plan, plans[2])
+
+        expected_stats = {
+            'size': 2,
+            'limit': 2,
+            'hits': 1,
+            'misses': 4,
+            'evictions': 2,
+            'hit_rate': 0.2
+        }
+        self.assertDictEqual(cache.get_stats(), expected_stats)
+
+    def test_plan_split_task_error(self):
+        spec = native_specs.WorkflowSpec(WF_DEF)
+        graph = conducting.WorkflowConductor(spec).graph
+
+        # The error from the spec is raised instead of ignored when the plan is compiled.
+        with mock.patch.object(
+                type(spec.tasks),
+                'is_split_task',
+                mock.MagicMock(side_effect=KeyError('foobar'))):
+            self.assertRaises(KeyError, planning.WorkflowPlan, spec, graph)
+
+    def test_plan_lookup_on_deserialize(self):
+        spec = native_specs.WorkflowSpec(WF_DEF)
+        conductor = conducting.WorkflowConductor(spec)
+        conductor.request_workflow_status(statuses.RUNNING)
+        data = conductor.serialize()
+
+        # The cached plan is looked up with the serialized spec instead of serializing the
+        # spec that is deserialized.
+        with mock.patch.object(
+                native_specs.WorkflowSpec,
+                'serialize',
+                mock.MagicMock(return_value={})):
+            restored = conducting.WorkflowConductor.deserialize(data)
+
+        self.assertIs(restored.plan, conductor.plan)
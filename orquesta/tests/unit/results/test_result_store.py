@@ -0,0 +1,93 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import shutil
+import tempfile
+import unittest
+
+from orquesta import exceptions as exc
+from orquesta import results
+
+
+class MemoryResultStoreTest(unittest.TestCase):
+
+    def _get_result_store(self):
+        return results.MemoryResultStore()
+
+    def test_put_get_delete(self):
+        store = self._get_result_store()
+        value = {'foo': 'bar', 'items': [1, 2, 3]}
+
+        ref = store.put(value)
+        self.assertEqual(len(store), 1)
+        self.assertDictEqual(store.get(ref), value)
+
+        # Ensure the stored result is not affected by changes to the value.
+        value['foo'] = 'fubar'
+        self.assertEqual(store.get(ref)['foo'], 'bar')
+
+        store.delete(ref)
+        self.assertEqual(len(store), 0)
+        self.assertRaises(exc.ResultNotFound, store.get, ref)
+
+        # Ensure deleting a result that does not exist is not an error.
+        store.delete(ref)
+
+    def test_unique_refs(self):
+        store = self._get_result_store()
+        refs = [store.put('foobar') for i in range(0, 10)]
+
+        self.assertEqual(len(set(refs)), 10)
+        self.assertEqual(len(store), 10)
+
+    def test_item_results(self):
+        store = self._get_result_store()
+
+        items = [
+            {'status': 'succeeded', 'result_ref': store.put({'foo': 'bar'})},
+            {'status': 'succeeded', 'result': 'fubar'},
+            {'status': 'failed', 'result': None}
+        ]
+
+        item_results = results.ItemResults(items, store)
+
+        self.assertIs(copy.deepcopy(item_results), item_results)
+        self.assertListEqual(item_results.get_refs(), [items[0]['result_ref']])
+        self.assertListEqual(item_results.resolve(), [{'foo': 'bar'}, 'fubar', None])
+        self.assertListEqual(results.resolve(item_results), [{'foo': 'bar'}, 'fubar', None])
+        self.assertEqual(results.resolve('foobar'), 'foobar')
+
+        # Ensure the results are only retrieved from the store once.
+        store.delete(items[0]['result_ref'])
+        self.assertListEqual(item_results.resolve(), [{'foo': 'bar'}, 'fubar', None])
+
+
+class FileSystemResultStoreTest(MemoryResultStoreTest):
+
+    def setUp(self):
+        super(FileSystemResultStoreTest, self).setUp()
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        super(FileSystemResultStoreTest, self).tearDown()
+
+    def _get_result_store(self):
+        return results.FileSystemResultStore(self.path)
+
+    def test_results_shared_by_stores(self):
+        ref = self._get_result_store().put([1, 2, 3])
+
+        self.assertListEqual(self._get_result_store().get(ref), [1, 2, 3])
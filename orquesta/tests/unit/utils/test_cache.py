@@ -0,0 +1,69 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from orquesta.utils import cache as cache_util
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_get_and_put(self):
+        cache = cache_util.LRUCache(2)
+
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+
+        # The least recently used entry is evicted.
+        cache.put('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+        expected_stats = {
+            'size': 2,
+            'limit': 2,
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1,
+            'hit_rate': 0.5
+        }
+
+        self.assertDictEqual(cache.get_stats(), expected_stats)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get_stats()['hits'], 0)
+
+    def test_get_with_match(self):
+        cache = cache_util.LRUCache(2)
+        cache.put('a', 1)
+
+        self.assertEqual(cache.get('a', match=lambda v: v == 1), 1)
+
+        # The entry that does not match is removed.
+        self.assertIsNone(cache.get('a', match=lambda v: v == 2))
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.get_stats()['misses'], 1)
+
+    def test_cache_disabled(self):
+        cache = cache_util.LRUCache(0)
+        cache.put('a', 1)
+
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
@@ -65,3 +65,128 @@ class ContextUtilTest(unittest.TestCase):
         self.assertRaises(TypeError, ctx_util.set_current_task, 'foobar', task)
 
         self.assertRaises(TypeError, ctx_util.set_current_task, dict(), 'foobar')
+
+    def test_set_current_task_layered_context(self):
+        layer = {'var1': 'foobar', 'var2': {'x': 1}}
+        task = {'id': 't1', 'route': 0}
+
+        context = ctx_util.set_current_task(ctx_util.LayeredContext([layer]), task)
+        expected_context = {'__current_task': task, 'var1': 'foobar', 'var2': {'x': 1}}
+
+        self.assertDictEqual(context.to_dict(), expected_context)
+        self.assertDictEqual(layer, {'var1': 'foobar', 'var2': {'x': 1}})
+
+
+class LayeredContextTest(unittest.TestCase):
+
+    def test_read_thru_layers(self):
+        layers = [
+            {'a': 1, 'b': {'x': 1, 'y': {'z': 1}}, 'c': [1]},
+            {'b': {'y': {'w': 2}}, 'd': 2},
+            {'a': 3}
+        ]
+
+        ctx = ctx_util.LayeredContext(layers)
+
+        expected = {'a': 3, 'b': {'x': 1, 'y': {'z': 1, 'w': 2}}, 'c': [1], 'd': 2}
+
+        self.assertDictEqual(ctx.to_dict(), expected)
+        self.assertListEqual(list(ctx.keys()), ['a', 'b', 'c', 'd'])
+        self.assertEqual(len(ctx), 4)
+        self.assertIn('d', ctx)
+        self.assertNotIn('e', ctx)
+        self.assertRaises(KeyError, ctx.__getitem__, 'e')
+
+        # Mutable values are copied from the layers when read.
+        self.assertIsNot(ctx['c'], layers[0]['c'])
+        self.assertIs(ctx['c'], ctx['c'])
+
+        # The layers are not modified by merging.
+        self.assertDictEqual(layers[0]['b'], {'x': 1, 'y': {'z': 1}})
+
+    def test_non_dict_value_overwrites_dict(self):
+        ctx = ctx_util.LayeredContext([{'a': {'x': 1}}, {'a': 'foobar'}, {'b': 1}])
+        self.assertEqual(ctx['a'], 'foobar')
+
+        ctx = ctx_util.LayeredContext([{'a': {'x': 1}}, {'a': 'foobar'}, {'a': {'y': 2}}])
+        self.assertDictEqual(ctx['a'], {'y': 2})
+
+    def test_group_layers(self):
+        layers = [
+            {'a': {'x': 1}, 'b': 1},
+            {'a': {'y': 2}},
+            {'a': 'foobar'},
+            {'a': {'z': 3}, 'c': {'x': {'y': 1}}},
+            {'c': {'x': 'foobar'}},
+            {'c': {'x': {'z': 2}}},
+            {'a': None}
+        ]
+
+        # The layer that replaces a value with a dict starts a new group which
+        # is merged back once the dict is replaced with a value that is not a dict.
+        self.assertListEqual(ctx_util.group_layers(layers[0:4]), [[0, 1, 2], [3]])
+        self.assertListEqual(ctx_util.group_layers(layers[0:6]), [[0, 1, 2], [3, 4], [5]])
+        self.assertListEqual(ctx_util.group_layers(layers), [[0, 1, 2], [3, 4], [5, 6]])
+
+        # Ensure the merged layers yield the same context over other layers.
+        base_layer = {'a': {'w': 0}, 'c': {'x': {'w': 0}}}
+
+        for i in range(1, len(layers) + 1):
+            merged_layers = [
+                ctx_util.merge_layers([layers[j] for j in group])
+                for group in ctx_util.group_layers(layers[0:i])
+            ]
+
+            self.assertDictEqual(
+                ctx_util.LayeredContext([base_layer] + merged_layers).to_dict(),
+                ctx_util.LayeredContext([base_layer] + layers[0:i]).to_dict()
+            )
+
+    def test_copy_on_read(self):
+        layers = [{'a': 1, 'b': {'x': [1, 2]}, 'c': [1, 2]}, {'b': {'y': {'z': 1}}}]
+        expected_layers = copy.deepcopy(layers)
+        ctx = ctx_util.LayeredContext(layers)
+
+        # Modifying the values read from the context does not change the layers.
+        ctx['b']['x'].append(3)
+        ctx['b']['y']['z'] = 2
+        ctx['c'].append(3)
+
+        self.assertDictEqual(ctx.to_dict(), {'a': 1, 'b': {'x': [1, 2, 3], 'y': {'z': 2}},
+                                             'c': [1, 2, 3]})
+
+        self.assertListEqual(layers, expected_layers)
+
+        # The copies of the context and other contexts over the same layers are not changed.
+        ctx_copy = copy.deepcopy(ctx)
+        ctx_copy['c'].append(4)
+        self.assertListEqual(ctx['c'], [1, 2, 3])
+
+        task = {'id': 't1', 'route': 0}
+        task_ctx = ctx_util.set_current_task(ctx_util.LayeredContext(layers), task)
+        task_ctx['c'].append(5)
+
+        item_ctx = ctx_util.set_current_item(task_ctx, 'foobar')
+        item_ctx['b']['x'].append(6)
+
+        expected_ctx = {'a': 1, 'b': {'x': [1, 2], 'y': {'z': 1}}, 'c': [1, 2]}
+        self.assertDictEqual(ctx_util.LayeredContext(layers).to_dict(), expected_ctx)
+        self.assertListEqual(task_ctx['b']['x'], [1, 2])
+        self.assertListEqual(layers, expected_layers)
+
+    def test_copy_on_write(self):
+        layer = {'a': 1, 'b': 2}
+        ctx = ctx_util.LayeredContext([layer])
+
+        ctx_copy = copy.deepcopy(ctx)
+        ctx_copy['a'] = 3
+        ctx_copy['c'] = 4
+        del ctx_copy['b']
+
+        self.assertDictEqual(ctx_copy.to_dict(), {'a': 3, 'c': 4})
+        self.assertDictEqual(ctx.to_dict(), {'a': 1, 'b': 2})
+        self.assertDictEqual(layer, {'a': 1, 'b': 2})
+
+        ctx_copy['b'] = 5
+        self.assertListEqual(list(ctx_copy.keys()), ['a', 'b', 'c'])
+        self.assertRaises(KeyError, ctx.__delitem__, 'c')
@@ -210,3 +210,28 @@ class DictUtilsTest(unittest.TestCase):
             'foobar',
             raise_key_error=True
         )
+
+    def test_dict_fingerprint(self):
+        left = {'a': 1, 'b': {'c': [1, 2], 'd': 'foobar'}}
+        right = {'b': {'d': 'foobar', 'c': [1, 2]}, 'a': 1}
+
+        self.assertEqual(
+            dict_util.get_dict_fingerprint(left),
+            dict_util.get_dict_fingerprint(right)
+        )
+
+        right['b']['c'].append(3)
+
+        self.assertNotEqual(
+            dict_util.get_dict_fingerprint(left),
+            dict_util.get_dict_fingerprint(right)
+        )
+
+        right = {'a': 1, 'b': {'c': [1, 2], 'd': 'foobar'}, 'count': 2}
+
+        self.assertEqual(
+            dict_util.get_dict_fingerprint(left),
+            dict_util.get_dict_fingerprint(right, exclude=['count'])
+        )
+
+        self.assertIsNone(dict_util.get_dict_fingerprint({'a': {(1, 2): 'foobar'}}))
@@ -0,0 +1,62 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from orquesta.utils import files as file_util
+
+
+class FileUtilTest(unittest.TestCase):
+
+    def setUp(self):
+        super(FileUtilTest, self).setUp()
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        super(FileUtilTest, self).tearDown()
+
+    def test_write_read_remove(self):
+        file_path = os.path.join(self.path, 'a', 'b', 'foobar')
+
+        file_util.write(file_path, 'foobar')
+        self.assertEqual(file_util.read(file_path), 'foobar')
+
+        file_util.write(file_path, 'fubar')
+        self.assertEqual(file_util.read(file_path), 'fubar')
+        self.assertListEqual(os.listdir(os.path.dirname(file_path)), ['foobar'])
+
+        file_util.remove(file_path)
+        self.assertIsNone(file_util.read(file_path))
+
+        # Ensure removing a file that does not exist is ignored.
+        file_util.remove(file_path)
+
+    def test_write_failed(self):
+        file_path = os.path.join(self.path, 'foobar')
+
+        with mock.patch('os.rename', mock.MagicMock(side_effect=OSError('foobar'))):
+            self.assertRaises(OSError, file_util.write, file_path, 'foobar')
+
+        # Ensure the temporary file is removed and the file is not written.
+        self.assertListEqual(os.listdir(self.path), [])
+        self.assertIsNone(file_util.read(file_path))
+
+    def test_make_dirs_exists(self):
+        file_util.make_dirs(self.path)
+        self.assertTrue(os.path.isdir(self.path))
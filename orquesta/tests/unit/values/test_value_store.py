@@ -0,0 +1,111 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+from orquesta import exceptions as exc
+from orquesta import values
+
+
+class FileSystemValueStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        super(FileSystemValueStoreTest, self).setUp()
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        super(FileSystemValueStoreTest, self).tearDown()
+
+    def _get_value_store(self, threshold=values.DEFAULT_SIZE_THRESHOLD):
+        return values.FileSystemValueStore(os.path.join(self.path, 'values'), threshold=threshold)
+
+    def test_put_get(self):
+        value_store = self._get_value_store()
+        value = {'foo': 'bar', 'items': [1, 2, 3]}
+
+        ref = value_store.put(value)
+        self.assertTrue(values.is_ref(ref))
+        self.assertDictEqual(value_store.get(ref), value)
+
+        # Ensure the reference is derived from the content.
+        self.assertEqual(value_store.put({'items': [1, 2, 3], 'foo': 'bar'}), ref)
+        self.assertNotEqual(value_store.put({'foo': 'bar'}), ref)
+
+        # Ensure the values are shared by stores at the same location.
+        self.assertDictEqual(self._get_value_store().get(ref), value)
+
+    def test_get_not_found(self):
+        value_store = self._get_value_store()
+        ref = values.REF_PREFIX + '0' * 64
+
+        self.assertRaises(exc.ValueNotFound, value_store.get, ref)
+        self.assertRaises(ValueError, value_store.get, 'foobar')
+
+    def test_copy(self):
+        value_store = self._get_value_store()
+
+        self.assertIs(copy.copy(value_store), value_store)
+        self.assertIs(copy.deepcopy(value_store), value_store)
+
+    def test_externalize_and_resolve(self):
+        value_store = self._get_value_store(threshold=32)
+        xs = ['x%s' % i for i in range(0, 10)]
+        s = 'foobar' * 10
+
+        value = {
+            'a': 123,
+            'b': 'foobar',
+            'c': {'xs': xs, 'd': {'s': s}, 'e': [1, 2]},
+            'xs': xs,
+            's': s
+        }
+
+        externalized = values.externalize(value, value_store)
+
+        self.assertEqual(externalized['a'], 123)
+        self.assertEqual(externalized['b'], 'foobar')
+        self.assertTrue(values.is_ref(externalized['xs']))
+        self.assertTrue(values.is_ref(externalized['s']))
+        self.assertTrue(values.is_ref(externalized['c']['xs']))
+        self.assertTrue(values.is_ref(externalized['c']['d']['s']))
+        self.assertListEqual(externalized['c']['e'], [1, 2])
+        self.assertEqual(externalized['xs'], externalized['c']['xs'])
+
+        # Ensure the given value is not modified.
+        self.assertListEqual(value['xs'], xs)
+        self.assertListEqual(value['c']['xs'], xs)
+
+        self.assertDictEqual(values.resolve(externalized, value_store), value)
+        self.assertListEqual(values.resolve(externalized['xs'], value_store), xs)
+
+        # Ensure the value is returned as is if nothing is replaced.
+        small_value = {'a': 123, 'c': {'e': [1, 2]}}
+        self.assertIs(values.externalize(small_value, value_store), small_value)
+        self.assertIs(values.resolve(small_value, value_store), small_value)
+        self.assertIs(values.externalize(value, None), value)
+
+        # Ensure the value is returned as is if it cannot be serialized.
+        unserializable_value = {'xs': [object()] * 100}
+        self.assertIs(values.externalize(unserializable_value, value_store), unserializable_value)
+
+
+class SQLiteValueStoreTest(FileSystemValueStoreTest):
+
+    def _get_value_store(self, threshold=values.DEFAULT_SIZE_THRESHOLD):
+        return values.SQLiteValueStore(os.path.join(self.path, 'values.db'), threshold=threshold)
@@ -0,0 +1,85 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import logging
+import threading
+
+
+LOG = logging.getLogger(__name__)
+
+
+class LRUCache(object):
+    # A thread safe cache that keeps up to the given number of entries and evicts the least
+    # recently used entry when the cache is full. A size of zero disables the cache.
+
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, match=None):
+        # If a match function is given, the entry that does not match is removed and
+        # counted as a miss.
+        with self._lock:
+            value = self._entries.pop(key, None)
+
+            if value is not None and match is not None and not match(value):
+                value = None
+
+            if value is None:
+                self.misses += 1
+                return None
+
+            self._entries[key] = value
+            self.hits += 1
+
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+
+            while len(self._entries) > max(self.size, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            'size': len(self._entries),
+            'limit': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0
+        }
@@ -12,15 +12,205 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import copy
 import logging
 
+import six
+
 
 LOG = logging.getLogger(__name__)
 
+_IMMUTABLE_TYPES = six.string_types + six.integer_types + (float, bool, type(None))
+
+
+def _merge_values(values):
+    # Merge the list of values in order with the same semantic as dict_util.merge_dicts
+    # but without modifying any of the values. New dicts are only created where nested
+    # dicts are merged and everything else is referenced.
+    merged = {}
+
+    for value in values:
+        for k, v in six.iteritems(value):
+            if k in merged and isinstance(merged[k], dict) and isinstance(v, dict):
+                merged[k] = _merge_values([merged[k], v])
+            else:
+                merged[k] = v
+
+    return merged
+
+
+def _replaces_value_with_dict(left, right):
+    # Returns True if overlaying the right value on the left value replaces
+    # a value that is not a dict with a dict at any of the nested keys.
+    for k, v in six.iteritems(right):
+        if k not in left or not isinstance(v, dict):
+            continue
+
+        if not isinstance(left[k], dict) or _replaces_value_with_dict(left[k], v):
+            return True
+
+    return False
+
+
+def group_layers(layers):
+    # Group the consecutive layers that can be merged into a single layer without changing
+    # the context when the merged layer is overlaid on any other layers. A layer that replaces
+    # a value with a dict starts a new group. Otherwise, the dict in the merged layer would be
+    # merged with the dict of the same key from the layers underneath. The new group is merged
+    # back into the previous group once the dict is replaced again with a value that is not a
+    # dict. The groups are returned as lists of positions of the layers.
+    groups = []
+
+    for idx, layer in enumerate(layers):
+        if groups and not _replaces_value_with_dict(groups[-1][1], layer):
+            groups[-1] = (groups[-1][0] + [idx], _merge_values([groups[-1][1], layer]))
+        else:
+            groups.append(([idx], layer))
+
+        while len(groups) > 1 and not _replaces_value_with_dict(groups[-2][1], groups[-1][1]):
+            positions, merged = groups.pop()
+            groups[-1] = (groups[-1][0] + positions, _merge_values([groups[-1][1], merged]))
+
+    return [positions for positions, merged in groups]
+
+
+def merge_layers(layers):
+    return _merge_values(layers)
+
+
+class LayeredContext(collections.MutableMapping):
+    # A copy-on-read context that overlays a list of context layers without copying them.
+    # The layers are read in order where later layers take precedence and nested dicts are
+    # merged like dict_util.merge_dicts. The layers are shared and never modified. A mutable
+    # value is copied to an overlay that is private to this instance when it is first read
+    # so the value can be modified, such as by an expression, without changing the layers.
+    # Changes to the context are also written to the overlay. Copies of the context share
+    # the layers and the merged values that are resolved so far.
+
+    def __init__(self, layers=None):
+        self._layers = [layer for layer in (layers or []) if layer]
+        self._merged = {}
+        self._keys = None
+        self._overlay = {}
+        self._deleted = set()
+
+    def _get_layered_keys(self):
+        if self._keys is None:
+            keys = collections.OrderedDict()
+
+            for layer in self._layers:
+                for k in layer:
+                    keys[k] = True
+
+            self._keys = keys
+
+        return self._keys
+
+    def _get_layered_value(self, key):
+        if key in self._merged:
+            return self._merged[key]
+
+        values = [layer[key] for layer in self._layers if key in layer]
+
+        if not values:
+            raise KeyError(key)
+
+        # Identify the values from the top layer down that will be merged.
+        dict_values = []
+
+        for value in reversed(values):
+            if not isinstance(value, dict):
+                break
+
+            dict_values.insert(0, value)
+
+        if len(dict_values) > 1:
+            value = _merge_values(dict_values)
+        else:
+            value = values[-1]
+
+        self._merged[key] = value
+
+        return value
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            return self._overlay[key]
+
+        if key in self._deleted:
+            raise KeyError(key)
+
+        value = self._get_layered_value(key)
+
+        if not isinstance(value, _IMMUTABLE_TYPES):
+            value = copy.deepcopy(value)
+            self._overlay[key] = value
+
+        return value
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+
+        self._overlay.pop(key, None)
+        self._deleted.add(key)
+
+    def __contains__(self, key):
+        if key in self._overlay:
+            return True
+
+        if key in self._deleted:
+            return False
+
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self):
+        layered_keys = self._get_layered_keys()
+
+        for k in layered_keys:
+            if k in self._overlay or k not in self._deleted:
+                yield k
+
+        for k in self._overlay:
+            if k not in layered_keys:
+                yield k
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def _clone(self, overlay):
+        instance = self.__class__.__new__(self.__class__)
+        instance._layers = self._layers
+        instance._merged = self._merged
+        instance._keys = self._get_layered_keys()
+        instance._overlay = overlay
+        instance._deleted = set(self._deleted)
+
+        return instance
+
+    def copy(self):
+        return self._clone(dict(self._overlay))
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self._clone(copy.deepcopy(self._overlay, memo))
+
+    def to_dict(self):
+        return {k: self[k] for k in self}
+
 
 def set_current_task(context, task):
-    if context and not isinstance(context, dict):
+    if context and not isinstance(context, collections.Mapping):
         raise TypeError('The context is not type of dict.')
 
     if not task:
@@ -29,7 +219,7 @@ def set_current_task(context, task):
     if not isinstance(task, dict):
         raise TypeError('The task is not type of dict.')
 
-    ctx = copy.deepcopy(context) if context else dict()
+    ctx = copy.deepcopy(context) if context is not None else dict()
 
     ctx['__current_task'] = {
         'id': task.get('id'),
@@ -43,10 +233,10 @@ def set_current_task(context, task):
 
 
 def set_current_item(context, item):
-    if context and not isinstance(context, dict):
+    if context and not isinstance(context, collections.Mapping):
         raise TypeError('The context is not type of dict.')
 
-    ctx = copy.deepcopy(context) if context else dict()
+    ctx = copy.deepcopy(context) if context is not None else dict()
     ctx['__current_item'] = item
 
     return ctx
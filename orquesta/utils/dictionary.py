@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import six
 
 
@@ -80,3 +82,18 @@ def set_dict_value(obj, path, value, raise_key_error=False, insert_null=True):
                 item[key] = {}
 
             item = item[key]
+
+
+def get_dict_fingerprint(obj, exclude=None):
+    # Returns a digest of the dict that is the same for dicts with the same content. The digest
+    # is not guaranteed to be unique so callers should still compare the dicts on a match.
+    # Return None if the dict contains values that cannot be serialized.
+    exclude = exclude or []
+    obj = {k: v for k, v in six.iteritems(obj) if k not in exclude}
+
+    try:
+        data = json.dumps(obj, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.md5(data.encode('utf-8')).hexdigest()
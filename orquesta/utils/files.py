@@ -0,0 +1,67 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import tempfile
+
+
+LOG = logging.getLogger(__name__)
+
+
+def make_dirs(path):
+    # The directory may be created concurrently by another process or thread.
+    if not os.path.isdir(path):
+        try:
+            os.makedirs(path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+
+
+def write(file_path, data):
+    # Write to a temporary file in the same directory first and then rename the file so
+    # a partially written file is never read. The temporary file has a unique name so
+    # the same file can be written concurrently by more than one process or thread.
+    make_dirs(os.path.dirname(file_path))
+
+    fd, tmp_file_path = tempfile.mkstemp(
+        prefix=os.path.basename(file_path) + '.',
+        suffix='.tmp',
+        dir=os.path.dirname(file_path)
+    )
+
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+
+        os.rename(tmp_file_path, file_path)
+    except Exception:
+        os.remove(tmp_file_path)
+        raise
+
+
+def read(file_path):
+    try:
+        with open(file_path, 'r') as f:
+            return f.read()
+    except (IOError, OSError):
+        return None
+
+
+def remove(file_path):
+    try:
+        os.remove(file_path)
+    except (IOError, OSError):
+        pass
@@ -0,0 +1,191 @@
+# Copyright 2019 Extreme Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import abc
+import hashlib
+import json
+import logging
+import os
+import six
+import sqlite3
+import threading
+
+from orquesta import exceptions as exc
+from orquesta.utils import files as file_util
+
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_SIZE_THRESHOLD = 64 * 1024
+
+REF_PREFIX = 'orquesta://values/sha256/'
+
+
+def is_ref(value):
+    return isinstance(value, six.string_types) and value.startswith(REF_PREFIX)
+
+
+def dump(value):
+    return json.dumps(value, sort_keys=True)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class ValueStore(object):
+    # A content addressed store for large values in the workflow contexts. A value that is
+    # larger than the size threshold is kept in the store and replaced in the context by a
+    # reference that is derived from the content. The same value is only stored once.
+
+    def __init__(self, threshold=DEFAULT_SIZE_THRESHOLD):
+        self.threshold = threshold
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def put(self, value):
+        data = dump(value)
+        ref = REF_PREFIX + hashlib.sha256(data.encode('utf-8')).hexdigest()
+        self._put(ref[len(REF_PREFIX):], data)
+
+        return ref
+
+    def get(self, ref):
+        if not is_ref(ref):
+            raise ValueError('The value "%s" is not a reference.' % ref)
+
+        data = self._get(ref[len(REF_PREFIX):])
+
+        if data is None:
+            raise exc.ValueNotFound(ref)
+
+        return json.loads(data)
+
+    @abc.abstractmethod
+    def _put(self, digest, data):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _get(self, digest):
+        raise NotImplementedError()
+
+
+class FileSystemValueStore(ValueStore):
+
+    def __init__(self, path, threshold=DEFAULT_SIZE_THRESHOLD):
+        super(FileSystemValueStore, self).__init__(threshold=threshold)
+        self.path = path
+
+    def _get_file_path(self, digest):
+        # Spread the files into subdirectories so a directory does not get too large.
+        return os.path.join(self.path, digest[:2], digest)
+
+    def _put(self, digest, data):
+        file_path = self._get_file_path(digest)
+
+        # The value is not written again since the file name is derived from the content.
+        if not os.path.exists(file_path):
+            file_util.write(file_path, data)
+
+    def _get(self, digest):
+        return file_util.read(self._get_file_path(digest))
+
+
+class SQLiteValueStore(ValueStore):
+
+    def __init__(self, path, threshold=DEFAULT_SIZE_THRESHOLD):
+        super(SQLiteValueStore, self).__init__(threshold=threshold)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS orquesta_values '
+                '(digest TEXT PRIMARY KEY, data TEXT NOT NULL)'
+            )
+
+            self._conn.commit()
+
+    def _put(self, digest, data):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO orquesta_values (digest, data) VALUES (?, ?)',
+                (digest, data)
+            )
+
+            self._conn.commit()
+
+    def _get(self, digest):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM orquesta_values WHERE digest = ?',
+                (digest,)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def externalize(value, store):
+    # Replace the values that are larger than the threshold of the store with references.
+    # The dicts are not replaced but traversed since the dicts in the contexts are merged
+    # with the dicts of the same key from the other contexts. The given value is not
+    # modified and a new dict is returned only if any value is replaced.
+    if store is None or is_ref(value):
+        return value
+
+    if isinstance(value, dict):
+        externalized = {k: externalize(v, store) for k, v in six.iteritems(value)}
+
+        if any(externalized[k] is not v for k, v in six.iteritems(value)):
+            return externalized
+
+        return value
+
+    if not isinstance(value, (list, six.string_types)):
+        return value
+
+    # The value is kept inline if it cannot be serialized by the store.
+    try:
+        data = dump(value)
+    except (TypeError, ValueError):
+        return value
+
+    if len(data) > store.threshold:
+        return store.put(value)
+
+    return value
+
+
+def resolve(value, store):
+    # Replace the references in the value with the values from the store. The given
+    # value is not modified and a new dict is returned only if any value is resolved.
+    if store is None:
+        return value
+
+    if is_ref(value):
+        return store.get(value)
+
+    if isinstance(value, dict):
+        resolved = {k: resolve(v, store) for k, v in six.iteritems(value)}
+
+        if any(resolved[k] is not v for k, v in six.iteritems(value)):
+            return resolved
+
+    return value
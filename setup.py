@@ -70,6 +70,10 @@ setup(
             'mistral = orquesta.composers.mistral:WorkflowComposer',
             'mock = orquesta.composers.mock:WorkflowComposer'
         ],
+        'orquesta.graphs': [
+            'networkx = orquesta.graphing:WorkflowGraph',
+            'compact = orquesta.graphs.compact:CompactWorkflowGraph'
+        ],
         'orquesta.expressions.evaluators': [
             'yaql = orquesta.expressions.yql:YAQLEvaluator',
             'jinja = orquesta.expressions.jinja:JinjaEvaluator'